@@ -0,0 +1,5 @@
+from markdown_pro.cli import main
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
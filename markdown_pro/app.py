@@ -1,8 +1,26 @@
-from markdown_pro.gui.main_window import MainWindow
+import sys
+from typing import Optional, Sequence
 
 
-def main() -> None:
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = sys.argv[1:] if argv is None else list(argv)
+
+    profile = None
+    if "--startup-profile" in args:
+        from markdown_pro.utils.startup_profile import StartupProfile
+
+        profile = StartupProfile()
+        profile.start()
+
+    # import aqui (e não no topo) para o profile enxergar a cadeia da GUI
+    from markdown_pro.gui.main_window import MainWindow
+
+    if profile:
+        profile.mark("import da GUI")
     app = MainWindow()
+    if profile:
+        profile.mark("MainWindow()")
+        profile.watch_first_paint(app.root)
     app.run()
 
 
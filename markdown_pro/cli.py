@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Atenção: nada de tkinter, markdown, Pygments ou WeasyPrint aqui no topo.
+# Cada subcomando importa só o que precisa, para o modo em lote subir rápido.
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        # sem subcomando: abre o editor
+        from markdown_pro.app import main as gui_main
+
+        gui_main(["--startup-profile"] if args.startup_profile else [])
+        return 0
+
+    start = time.perf_counter()
+    code = args.func(args)
+    if args.timing:
+        print(f"[tempo] {args.command}: {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+    return code
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m markdown_pro", description="Markdown Pro Editor")
+    parser.add_argument("--timing", action="store_true", help="mostra o tempo do comando em stderr")
+    parser.add_argument(
+        "--startup-profile", action="store_true", help="GUI: tempos de import e da primeira pintura"
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("render", help="converte Markdown em HTML")
+    p.add_argument("inputs", nargs="*", help="arquivos ou globs (vazio ou '-' lê Markdown do stdin)")
+    p.add_argument("--files-from", metavar="ARQ", help="lista de caminhos, um por linha ('-' = stdin)")
+    p.add_argument("-o", "--output-dir", type=Path, help="diretório de saída dos .html")
+    p.add_argument("--body", action="store_true", help="só o corpo HTML, sem <html>/<head>")
+    p.add_argument("--code-classes", action="store_true", help="código com classes CSS do Pygments (HTML menor)")
+    p.set_defaults(func=_cmd_render)
+
+    p = sub.add_parser("export", help="exporta uma árvore de .md para HTML/PDF")
+    p.add_argument("src", type=Path)
+    p.add_argument("out", type=Path)
+    p.add_argument("--format", default="html,pdf", help="html, pdf ou html,pdf (padrão)")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--force", action="store_true", help="ignora o manifesto e refaz tudo")
+    p.add_argument("--code-classes", action="store_true", help="código com classes CSS do Pygments (HTML menor)")
+    p.add_argument("--json", action="store_true", help="relatório final em JSON")
+    p.set_defaults(func=_cmd_export)
+
+    p = sub.add_parser("stats", help="estatísticas rápidas (linhas, palavras, títulos...)")
+    p.add_argument("inputs", nargs="*", help="arquivos ou globs (vazio ou '-' = stdin)")
+    p.add_argument("--files-from", metavar="ARQ", help="lista de caminhos, um por linha ('-' = stdin)")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=_cmd_stats)
+
+    p = sub.add_parser("search", help="busca nos .md de uma pasta (índice em ~/.markdown-pro/index)")
+    p.add_argument("root", type=Path)
+    p.add_argument("query")
+    p.add_argument("--limit", type=int, default=50)
+    p.add_argument("--workers", type=int, default=None)
+    p.set_defaults(func=_cmd_search)
+    return parser
+
+
+# ---------- render ----------
+def _cmd_render(args: argparse.Namespace) -> int:
+    from markdown_pro.core.markdown_processor import MarkdownProcessor
+
+    processor = MarkdownProcessor(code_css_classes=args.code_classes)
+    if _reads_stdin(args):
+        result = processor.render(sys.stdin.read())
+        sys.stdout.write(result.html_body if args.body else result.html_full)
+        return 0
+
+    inputs = list(_iter_inputs(args.inputs, args.files_from))
+    if not inputs:
+        print("erro: nenhum arquivo encontrado", file=sys.stderr)
+        return 1
+
+    to_stdout = args.output_dir is None and len(inputs) == 1
+    targets = {}
+    for path, root in inputs:
+        if args.output_dir is None:
+            target = path.with_suffix(".html")
+        else:
+            # mesma árvore da entrada (relativa à raiz do glob), como no export
+            target = args.output_dir / path.relative_to(root).with_suffix(".html")
+        if targets.get(target, path) != path and not to_stdout:
+            print(f"erro: {targets[target]} e {path} gravariam o mesmo {target}", file=sys.stderr)
+            return 1
+        targets[target] = path
+
+    status = 0
+    for target, path in targets.items():
+        try:
+            result = processor.render(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError) as ex:
+            print(f"erro: {path}: {ex}", file=sys.stderr)
+            status = 1
+            continue
+        html = result.html_body if args.body else result.html_full
+        if to_stdout:
+            sys.stdout.write(html)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(html, encoding="utf-8")
+    return status
+
+
+# ---------- export ----------
+def _cmd_export(args: argparse.Namespace) -> int:
+    from markdown_pro.export.batch import BatchExporter, summarize
+
+    formats = [f.strip() for f in args.format.split(",") if f.strip()]
+    try:
+        exporter = BatchExporter(
+            args.src,
+            args.out,
+            formats=formats,
+            workers=args.workers,
+            force=args.force,
+            code_css_classes=args.code_classes,
+        )
+    except ValueError as ex:
+        print(f"erro: {ex}", file=sys.stderr)
+        return 2
+
+    reports = []
+    for report in exporter.iter_export():
+        reports.append(report)
+        if args.json:
+            continue
+        if report.error:
+            print(f"ERRO  {report.source}: {report.error}")
+        elif report.skipped:
+            print(f"igual {report.source}")
+        else:
+            print(f"ok    {report.source}  {report.seconds * 1000:.0f} ms  {report.peak_rss_kb / 1024:.1f} MiB")
+
+    summary = summarize(reports)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print(
+            f"{summary['exported']} exportado(s), {summary['skipped']} sem mudança, "
+            f"{summary['failed']} com erro em {summary['seconds']:.2f} s"
+        )
+    return 1 if summary["failed"] else 0
+
+
+# ---------- stats ----------
+def _cmd_stats(args: argparse.Namespace) -> int:
+    rows = []
+    if _reads_stdin(args):
+        paths = []
+        rows.append(dict(file="-", **text_stats(sys.stdin.read())))
+    else:
+        paths = list(_iter_paths(args.inputs, args.files_from))
+        if not paths:
+            print("erro: nenhum arquivo encontrado", file=sys.stderr)
+            return 1
+    status = 0
+    for path in paths:
+        try:
+            rows.append(dict(file=str(path), **text_stats(path.read_text(encoding="utf-8"))))
+        except (OSError, UnicodeDecodeError) as ex:
+            print(f"erro: {path}: {ex}", file=sys.stderr)
+            status = 1
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        for row in rows:
+            print(
+                f"{row['file']}: {row['lines']} linhas, {row['words']} palavras, "
+                f"{row['chars']} caracteres, {row['headings']} títulos, {row['code_blocks']} blocos de código"
+            )
+    return status
+
+
+def text_stats(text: str) -> dict:
+    headings = 0
+    fences = 0
+    in_fence = False
+    for line in text.splitlines():
+        if line.startswith("```") or line.startswith("~~~"):
+            in_fence = not in_fence
+            fences += 1
+        elif not in_fence and line.startswith("#"):
+            headings += 1
+    return {
+        "lines": text.count("\n") + (1 if text and not text.endswith("\n") else 0),
+        "words": len(text.split()),
+        "chars": len(text),
+        "headings": headings,
+        "code_blocks": fences // 2,
+    }
+
+
+# ---------- search ----------
+def _cmd_search(args: argparse.Namespace) -> int:
+    from markdown_pro.core.workspace_index import WorkspaceIndex
+
+    index = WorkspaceIndex(args.root, workers=args.workers)
+    stats = index.update()
+    if args.timing:
+        print(
+            f"[índice] {stats.indexed} atualizados, {stats.unchanged} sem mudança, "
+            f"{stats.removed} removidos em {stats.seconds * 1000:.0f} ms",
+            file=sys.stderr,
+        )
+    hits = index.search(args.query, limit=args.limit)
+    for hit in hits:
+        print(f"{hit.path}:{hit.line}: {hit.text}")
+    return 0 if hits else 1
+
+
+# ---------- entrada ----------
+def _reads_stdin(args: argparse.Namespace) -> bool:
+    # só sem entradas ou com '-' sozinho; glob sem resultado não cai no stdin
+    return not args.files_from and (not args.inputs or args.inputs == ["-"])
+
+
+def _iter_paths(inputs: List[str], files_from: Optional[str]) -> Iterator[Path]:
+    """Expande globs e lê listas de arquivos; '-' sozinho significa stdin (conteúdo)."""
+    for path, _root in _iter_inputs(inputs, files_from):
+        yield path
+
+
+def _iter_inputs(inputs: List[str], files_from: Optional[str]) -> Iterator[Tuple[Path, Path]]:
+    # (arquivo, raiz): a raiz é a parte fixa do glob, ou o próprio diretório
+    for item in inputs:
+        if item == "-":
+            continue
+        if glob.has_magic(item):
+            root = _glob_root(item)
+            for match in sorted(glob.glob(item, recursive=True)):
+                yield Path(match), root
+        else:
+            yield Path(item), Path(item).parent
+
+    if files_from:
+        stream = sys.stdin if files_from == "-" else open(files_from, encoding="utf-8")
+        try:
+            for line in stream:
+                line = line.strip()
+                if line:
+                    yield Path(line), Path(line).parent
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def _glob_root(pattern: str) -> Path:
+    fixed = []
+    for part in Path(pattern).parts[:-1]:
+        if glob.has_magic(part):
+            break
+        fixed.append(part)
+    return Path(*fixed) if fixed else Path(".")
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from markdown_pro.core.text_buffer import BufferEdit
+from markdown_pro.utils.paths import buffers_dir
+
+
+# snapshots comprimidos em memória; o que passar disso vai para o disco
+DEFAULT_STORE_BYTES = 64 * 1024 * 1024
+# zlib rápido: suspender uma aba acontece na troca, na thread da GUI
+COMPRESS_LEVEL = 1
+
+_SUFFIX = ".buf"
+
+
+@dataclass
+class StoredBuffer:
+    """Texto base + edições (comprimidos) e metadados de uma aba suspensa."""
+
+    meta: Dict[str, Any]
+    size: int
+    # None: está em `spill_path`
+    data: Optional[bytes] = None
+    spill_path: Optional[Path] = None
+
+
+class BufferStore:
+    """
+    Buffers de abas inativas: um texto base e as edições feitas depois dele
+    (o suficiente para refazer o conteúdo e o undo), comprimidos com zlib.
+    A soma dos comprimidos em memória fica abaixo de `max_bytes`; os menos
+    usados passam para arquivos em ~/.markdown-pro/buffers (nomes com o pid,
+    apagados ao sair ou na próxima abertura se o processo morreu).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_STORE_BYTES, directory: Optional[Path] = None) -> None:
+        self.max_bytes = max_bytes
+        self._directory = directory
+        self._entries: "OrderedDict[str, StoredBuffer]" = OrderedDict()
+        self.used = 0
+        self.spilled = 0
+        _remove_orphans(self._dir())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _dir(self) -> Path:
+        return self._directory or buffers_dir()
+
+    def put(self, key: str, base: str, edits: List[BufferEdit], meta: Dict[str, Any]) -> StoredBuffer:
+        self.discard(key)
+        payload = json.dumps(
+            {"base": base, "edits": [[e.revision, e.start, e.end, e.text] for e in edits]},
+            ensure_ascii=False,
+        ).encode("utf-8", "surrogatepass")
+        data = zlib.compress(payload, COMPRESS_LEVEL)
+        entry = StoredBuffer(meta=meta, size=len(data), data=data)
+        self._entries[key] = entry
+        self.used += entry.size
+        self._spill_over_budget()
+        return entry
+
+    def meta(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        return entry.meta if entry is not None else None
+
+    def take(self, key: str) -> Tuple[str, List[BufferEdit], Dict[str, Any]]:
+        """Tira o buffer do store: (base, edições, metadados). KeyError se não existe."""
+        entry = self._entries.pop(key)
+        if entry.data is not None:
+            data = entry.data
+            self.used -= entry.size
+        else:
+            data = entry.spill_path.read_bytes()
+            _unlink(entry.spill_path)
+            self.spilled -= 1
+        payload = json.loads(zlib.decompress(data).decode("utf-8", "surrogatepass"))
+        edits = [BufferEdit(r, s, e, t) for r, s, e, t in payload["edits"]]
+        return payload["base"], edits, entry.meta
+
+    def discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.data is not None:
+            self.used -= entry.size
+        else:
+            _unlink(entry.spill_path)
+            self.spilled -= 1
+
+    def close(self) -> None:
+        for key in list(self._entries):
+            self.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "bytes": self.used, "spilled": self.spilled}
+
+    def _spill_over_budget(self) -> None:
+        # do menos recente para o mais recente (o recém-guardado por último)
+        for key, entry in self._entries.items():
+            if self.used <= self.max_bytes:
+                return
+            if entry.data is None:
+                continue
+            path = self._dir() / f"{os.getpid()}-{key}{_SUFFIX}"
+            try:
+                path.write_bytes(entry.data)
+            except OSError:
+                # sem disco: fica em memória mesmo
+                return
+            entry.spill_path = path
+            entry.data = None
+            self.used -= entry.size
+            self.spilled += 1
+
+
+def _remove_orphans(directory: Path) -> None:
+    # arquivos de processos que não existem mais (o journal cuida do que não foi salvo)
+    for file in directory.glob(f"*{_SUFFIX}"):
+        pid = file.name.split("-", 1)[0]
+        if pid.isdigit() and int(pid) != os.getpid() and not _pid_alive(int(pid)):
+            _unlink(file)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _unlink(path: Optional[Path]) -> None:
+    if path is None:
+        return
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import types
+from typing import Any, Callable, Dict, List
+
+from markdown.extensions import codehilite
+from markdown.extensions.codehilite import CodeHilite, CodeHiliteExtension, HiliteTreeprocessor
+from markdown.extensions.fenced_code import FencedBlockPreprocessor, FencedCodeExtension
+from pygments.formatters import HtmlFormatter
+
+from markdown_pro.utils.byte_lru import ByteLRU
+
+
+# limite do cache de blocos de código já realçados (soma do HTML guardado)
+DEFAULT_CODE_CACHE_BYTES = 16 * 1024 * 1024
+
+_cache = ByteLRU(DEFAULT_CODE_CACHE_BYTES, len)
+_lock = threading.Lock()
+
+
+class CachedCodeHilite(CodeHilite):
+    """
+    CodeHilite com cache do HTML: a chave é o hash de tudo o que o bloco
+    recebeu (código, linguagem, formatter, opções de estilo); numa falta,
+    quem realça é o próprio CodeHilite.
+    """
+
+    def hilite(self, shebang: bool = True) -> str:
+        if not (codehilite.pygments and self.use_pygments):
+            return super().hilite(shebang)
+
+        key = hashlib.blake2b(
+            repr((shebang, sorted(vars(self).items()))).encode("utf-8", "surrogatepass"),
+            digest_size=16,
+        ).digest()
+        with _lock:
+            cached = _cache.get(key)
+        if cached is not None:
+            return cached
+
+        html = super().hilite(shebang)
+        with _lock:
+            _cache.put(key, html)
+        return html
+
+
+def _with_cached_hilite(run: Callable) -> Callable:
+    # o mesmo código do processador do Python-Markdown, com `CodeHilite`
+    # resolvido para CachedCodeHilite: só nas nossas extensões, sem mexer
+    # nos módulos da biblioteca (que outros usuários do markdown enxergam)
+    namespace = dict(run.__globals__, CodeHilite=CachedCodeHilite)
+    return types.FunctionType(run.__code__, namespace, run.__name__, run.__defaults__, run.__closure__)
+
+
+class CachedHiliteTreeprocessor(HiliteTreeprocessor):
+    run = _with_cached_hilite(HiliteTreeprocessor.run)
+
+
+class CachedFencedBlockPreprocessor(FencedBlockPreprocessor):
+    run = _with_cached_hilite(FencedBlockPreprocessor.run)
+
+
+class CachedCodeHiliteExtension(CodeHiliteExtension):
+    """`codehilite` (blocos indentados) com o cache."""
+
+    def extendMarkdown(self, md) -> None:
+        super().extendMarkdown(md)
+        hiliter = CachedHiliteTreeprocessor(md)
+        hiliter.config = self.getConfigs()
+        md.treeprocessors.register(hiliter, "hilite", 30)
+
+
+class CachedFencedCodeExtension(FencedCodeExtension):
+    """`fenced_code` com o cache; registrada depois do `extra`, troca o processador dele."""
+
+    def extendMarkdown(self, md) -> None:
+        super().extendMarkdown(md)
+        md.preprocessors.register(
+            CachedFencedBlockPreprocessor(md, self.getConfigs()), "fenced_code_block", 25
+        )
+
+
+def cached_extensions(names: List[str], configs: Dict[str, Dict[str, Any]]) -> List[Any]:
+    """
+    Troca `codehilite` e `fenced_code` (inclusive o de dentro do `extra`)
+    pelas versões com cache; as demais continuam pelo nome. As configurações
+    dessas duas saem de `configs`.
+    """
+    extensions: List[Any] = []
+    fenced = "extra" in names or "fenced_code" in names
+    for name in names:
+        if name == "codehilite":
+            extensions.append(CachedCodeHiliteExtension(**configs.pop("codehilite", {})))
+        elif name != "fenced_code":
+            extensions.append(name)
+    if fenced:
+        extensions.append(CachedFencedCodeExtension(**configs.pop("fenced_code", {})))
+    return extensions
+
+
+def pygments_css(style: str = "default", css_class: str = "codehilite") -> str:
+    """CSS das classes do Pygments (modo `noclasses=False`)."""
+    return HtmlFormatter(style=style).get_style_defs(f".{css_class}")
+
+
+def cache_stats() -> Dict[str, Any]:
+    with _lock:
+        return _cache.stats()
+
+
+def clear_cache() -> None:
+    with _lock:
+        _cache.clear()
+
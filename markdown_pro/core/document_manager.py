@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional, Tuple
 
+from markdown_pro.core.file_writer import Dispatch, FileWriter, SaveResult, content_digest, new_hasher
+from markdown_pro.core.journal import EditJournal, RecoveredDocument
+from markdown_pro.core.large_file import decode_text, iter_text_chunks
+from markdown_pro.core.text_buffer import BufferEdit, TextBuffer
+from markdown_pro.core.text_change import TextChange
+from markdown_pro.utils import trace
 from markdown_pro.utils.paths import recent_files_path
 from markdown_pro.utils.config_store import read_json, write_json
 
@@ -14,44 +21,175 @@ MAX_RECENTS = 10
 @dataclass
 class DocumentState:
     path: Optional[Path] = None
-    content: str = ""
+    buffer: TextBuffer = field(default_factory=TextBuffer)
     dirty: bool = False
+    # hash do arquivo em disco e a revisão do buffer que corresponde a ele
+    disk_digest: Optional[str] = None
+    saved_revision: int = 0
+
+    @property
+    def content(self) -> str:
+        return self.buffer.text()
+
+    @content.setter
+    def content(self, text: str) -> None:
+        self.buffer.set_text(text)
 
 
 class DocumentManager:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        dispatch: Optional[Dispatch] = None,
+        journal: Optional[EditJournal] = None,
+    ) -> None:
         self.state = DocumentState()
+        # gravações numa thread; `dispatch` leva os callbacks para a thread da GUI
+        self.writer = FileWriter(dispatch)
+        # autosave (opcional): edições não salvas vão para o journal
+        self.journal = journal
 
     # ---------- Document lifecycle ----------
     def new_document(self) -> None:
-        self.state = DocumentState(path=None, content="", dirty=False)
+        self._discard_journal()
+        self.state = DocumentState(path=None, dirty=False)
 
     def open_document(self, path: Path) -> str:
-        text = path.read_text(encoding="utf-8")
-        self.state = DocumentState(path=path, content=text, dirty=False)
+        with trace.span("open") as span:
+            data = path.read_bytes()
+            text = decode_text(data)
+            span.set(bytes=len(data))
+            self._discard_journal()
+            self.state = DocumentState(
+                path=path, buffer=TextBuffer(text), dirty=False, disk_digest=content_digest([data])
+            )
         self._add_recent(path)
         return text
 
-    def save(self, content: str) -> Path:
+    def open_chunked(self, path: Path, chunk_bytes: int) -> Iterator[Tuple[str, int, int]]:
+        """
+        Abre `path` em partes (arquivos grandes): cada parte entra no buffer e
+        é repassada como (texto, bytes lidos, total) para quem preenche o editor.
+        """
+        start = time.perf_counter()
+        hasher = new_hasher()
+        chunks = iter_text_chunks(path, chunk_bytes, hasher)
+        self._discard_journal()
+        state = self.state = DocumentState(path=path, dirty=False)
+        self._add_recent(path)
+        for chunk in chunks:
+            state.buffer.extend(chunk[0])
+            yield chunk
+        state.disk_digest = hasher.hexdigest()
+        state.saved_revision = state.buffer.revision
+        # do primeiro ao último pedaço, incluindo o tempo entre um passo e outro
+        trace.record("open_chunked", (time.perf_counter() - start) * 1000.0, chars=len(state.buffer))
+
+    def recover_document(self, recovered: RecoveredDocument) -> str:
+        """Carrega um documento recuperado do journal (fica sujo, com o mesmo journal)."""
+        self._discard_journal()
+        self.state = DocumentState(path=recovered.path, buffer=TextBuffer(recovered.text), dirty=True)
+        if self.journal is not None:
+            self.journal.start(self.state.buffer.snapshot(), recovered.path, None, recovered.journal_id)
+        return recovered.text
+
+    def save(
+        self,
+        content: Optional[str] = None,
+        on_done: Optional[Callable[[SaveResult], None]] = None,
+    ) -> Path:
+        """
+        Agenda a gravação e retorna na hora; `on_done` recebe o SaveResult.
+        Sem `content`, grava o buffer (mantido em dia por apply_change).
+        """
         if self.state.path is None:
             raise ValueError("Documento sem caminho. Use save_as().")
-        self.state.path.write_text(content, encoding="utf-8")
-        self.state.content = content
-        self.state.dirty = False
-        self._add_recent(self.state.path)
-        return self.state.path
+        return self._submit_save(self.state.path, content, on_done)
 
-    def save_as(self, path: Path, content: str) -> Path:
-        path.write_text(content, encoding="utf-8")
-        self.state.path = path
-        self.state.content = content
-        self.state.dirty = False
-        self._add_recent(path)
+    def save_as(
+        self,
+        path: Path,
+        content: Optional[str] = None,
+        on_done: Optional[Callable[[SaveResult], None]] = None,
+    ) -> Path:
+        return self._submit_save(path, content, on_done)
+
+    def _submit_save(self, path: Path, content: Optional[str], on_done) -> Path:
+        if content is not None:
+            self._sync(content)
+        state = self.state
+        buffer = state.buffer
+        revision = buffer.revision
+
+        def finished(result: SaveResult) -> None:
+            # só limpa o dirty se ninguém editou depois do snapshot gravado
+            if result.error is None and self.state is state:
+                state.path = path
+                state.disk_digest = result.digest
+                state.saved_revision = revision
+                if buffer.revision == revision:
+                    state.dirty = False
+                    self._discard_journal()
+                elif self.journal is not None:
+                    # a base do journal pode ser o arquivo que acabou de mudar
+                    self.journal.snapshot(buffer.snapshot())
+                self._add_recent(path)
+            if on_done is not None:
+                on_done(result)
+
+        self.writer.submit(path, buffer.snapshot(), finished)
         return path
 
     def set_dirty(self, dirty: bool) -> None:
         self.state.dirty = dirty
 
+    def mark_clean(self, digest: str) -> None:
+        """O buffer agora é igual ao arquivo em disco (ex.: recarregado após mudança externa)."""
+        self.state.disk_digest = digest
+        self.state.saved_revision = self.state.buffer.revision
+        self.state.dirty = False
+        self._discard_journal()
+
+    # ---------- Buffer ----------
+    def apply_change(self, change: TextChange, content: Optional[str] = None) -> None:
+        """
+        Espelha uma edição do editor no buffer. Se a edição não veio como
+        faixa (`change.text` None), usa `content` (o texto inteiro do editor).
+        """
+        buffer = self.state.buffer
+        before, before_revision = buffer.snapshot(), buffer.revision
+        if change.text is not None:
+            edit = buffer.replace_index(change.start, change.end, change.text)
+        elif content is not None:
+            buffer.set_text(content)
+            edit = None
+        else:
+            return
+        self._journal_edit(before, before_revision, edit)
+
+    # ---------- Journal ----------
+    def _journal_edit(self, before, before_revision: int, edit: Optional[BufferEdit]) -> None:
+        journal = self.journal
+        if journal is None:
+            return
+        state = self.state
+        if not journal.active:
+            # primeira edição desde abrir/salvar: se o buffer ainda era igual
+            # ao disco, a base é só uma referência ao arquivo
+            clean = state.disk_digest is not None and before_revision == state.saved_revision
+            journal.start(before, state.path, state.disk_digest if clean else None)
+        if edit is None:
+            journal.snapshot(state.buffer.snapshot())
+        else:
+            journal.record(edit, state.buffer.snapshot())
+
+    def _discard_journal(self) -> None:
+        if self.journal is not None:
+            self.journal.discard()
+
+    def _sync(self, content: str) -> None:
+        if content != self.state.content:
+            self.state.buffer.set_text(content)
+
     # ---------- Recents ----------
     def get_recents(self) -> list[str]:
         data = read_json(recent_files_path(), default={"recents": []})
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from markdown_pro.core.file_writer import Dispatch, content_digest
+
+
+# espera sem eventos antes de olhar o arquivo (geradores gravam em rajadas)
+DEBOUNCE_S = 0.3
+
+# (caminho, bytes novos, hash) — só quando o conteúdo difere do conhecido
+ChangeCallback = Callable[[Path, bytes, str], None]
+
+
+class FileWatcher:
+    """
+    Observa arquivos (via watchdog, opcional) e avisa quando o conteúdo
+    muda por fora. Rajadas de eventos viram uma notificação só, depois de
+    DEBOUNCE_S sem eventos. O hash do arquivo é comparado com o último
+    conhecido (`set_known`, chamado ao abrir/salvar), então as gravações
+    do próprio editor não contam como mudança externa.
+
+    Sem watchdog instalado, `start()` devolve False e nada é observado.
+    """
+
+    def __init__(self, on_change: ChangeCallback, dispatch: Optional[Dispatch] = None) -> None:
+        self.on_change = on_change
+        self.dispatch: Dispatch = dispatch or (lambda fn: fn())
+        self._observer = None
+        self._handler = None
+        self._lock = threading.Condition()
+        # arquivo -> hash conhecido (None: ainda não sabemos)
+        self._files: Dict[str, Optional[str]] = {}
+        # diretório -> (ObservedWatch, quantos arquivos observados nele)
+        self._dirs: Dict[str, list] = {}
+        # arquivo -> instante a partir do qual pode ser verificado
+        self._pending: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @property
+    def active(self) -> bool:
+        return self._observer is not None
+
+    def start(self) -> bool:
+        if self._observer is not None:
+            return True
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event) -> None:
+                if event.is_directory:
+                    return
+                # gravação atômica = "moved" do temporário para o destino
+                for path in (event.src_path, getattr(event, "dest_path", None)):
+                    if path:
+                        watcher._touch(str(path))
+
+        self._handler = _Handler()
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._observer.start()
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        if self._observer is None:
+            return
+        with self._lock:
+            self._stopped = True
+            self._lock.notify()
+        self._observer.stop()
+        self._observer = None
+
+    # ---------- arquivos observados ----------
+    def watch(self, path: Path, digest: Optional[str] = None) -> None:
+        if self._observer is None:
+            return
+        key = str(path.resolve())
+        with self._lock:
+            if key in self._files:
+                self._files[key] = digest or self._files[key]
+                return
+            self._files[key] = digest
+        directory = str(Path(key).parent)
+        entry = self._dirs.get(directory)
+        if entry is None:
+            try:
+                watch = self._observer.schedule(self._handler, directory, recursive=False)
+            except OSError:
+                return
+            self._dirs[directory] = [watch, 1]
+        else:
+            entry[1] += 1
+
+    def unwatch(self, path: Path) -> None:
+        if self._observer is None:
+            return
+        key = str(path.resolve())
+        with self._lock:
+            if key not in self._files:
+                return
+            del self._files[key]
+            self._pending.pop(key, None)
+        directory = str(Path(key).parent)
+        entry = self._dirs.get(directory)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] <= 0:
+                self._observer.unschedule(entry[0])
+                del self._dirs[directory]
+
+    def set_known(self, path: Path, digest: str) -> None:
+        """O conteúdo com este hash veio do próprio editor (aberto/salvo)."""
+        key = str(path.resolve())
+        with self._lock:
+            if key in self._files:
+                self._files[key] = digest
+
+    # ---------- threads do watchdog / verificação ----------
+    def _touch(self, path: str) -> None:
+        with self._lock:
+            if path not in self._files:
+                return
+            self._pending[path] = time.monotonic() + DEBOUNCE_S
+            self._lock.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._stopped:
+                    now = time.monotonic()
+                    due = [p for p, t in self._pending.items() if t <= now]
+                    if due:
+                        break
+                    timeout = min(self._pending.values()) - now if self._pending else None
+                    self._lock.wait(timeout)
+                if self._stopped:
+                    return
+                for path in due:
+                    del self._pending[path]
+            for path in due:
+                self._check(path)
+
+    def _check(self, path: str) -> None:
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            # removido/renomeado: nada para recarregar
+            return
+        digest = content_digest([data])
+        with self._lock:
+            if path not in self._files or self._files[path] == digest:
+                return
+            self._files[path] = digest
+        self.dispatch(lambda: self.on_change(Path(path), data, digest))
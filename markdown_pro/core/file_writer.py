@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from markdown_pro.core.rope import Rope
+from markdown_pro.utils import trace
+
+
+Dispatch = Callable[[Callable[[], None]], None]
+
+
+@dataclass
+class SaveResult:
+    path: Path
+    # False: o disco já tinha exatamente esse conteúdo, nada foi gravado
+    written: bool
+    digest: str
+    elapsed_ms: float
+    error: Optional[BaseException] = None
+
+
+class FileWriter:
+    """
+    Grava arquivos numa thread própria: arquivo temporário no mesmo
+    diretório + fsync + os.replace, então uma queda no meio nunca deixa o
+    arquivo truncado. Se o hash do conteúdo bate com o que está no disco,
+    não grava nada.
+
+    Callbacks (o `on_done` de cada gravação e os listeners) passam por
+    `dispatch`, que decide em qual thread rodam; o padrão é chamar direto,
+    na thread de gravação. A GUI usa uma fila lida pelo mainloop.
+    """
+
+    def __init__(self, dispatch: Optional[Dispatch] = None) -> None:
+        self.dispatch: Dispatch = dispatch or (lambda fn: fn())
+        self._queue: "queue.Queue[Tuple[Path, Union[str, Rope], Optional[Callable]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[SaveResult], None]] = []
+        self._pending = 0
+        self._cond = threading.Condition()
+        # path -> (tamanho, mtime_ns, hash) do que sabemos estar no disco;
+        # só a thread de gravação mexe aqui
+        self._known: Dict[Path, Tuple[int, int, str]] = {}
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return self._pending > 0
+
+    def add_listener(self, callback: Callable[[SaveResult], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[SaveResult], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def submit(
+        self,
+        path: Path,
+        content: Union[str, Rope],
+        on_done: Optional[Callable[[SaveResult], None]] = None,
+    ) -> None:
+        """Agenda a gravação; `content` pode ser um snapshot do Rope (imutável)."""
+        with self._cond:
+            self._pending += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="file-writer", daemon=True)
+            self._thread.start()
+        self._queue.put((path, content, on_done))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera as gravações pendentes terminarem. False se estourou o timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    # ---------- thread de gravação ----------
+    def _run(self) -> None:
+        while True:
+            path, content, on_done = self._queue.get()
+            with trace.span("save") as span:
+                result = self._save(path, content)
+                span.set(written=result.written)
+            callbacks = list(self._listeners)
+            if on_done is not None:
+                callbacks.insert(0, on_done)
+            for callback in callbacks:
+                self.dispatch(lambda cb=callback: cb(result))
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+
+    def _save(self, path: Path, content: Union[str, Rope]) -> SaveResult:
+        start = time.perf_counter()
+        try:
+            # duas passadas (hash, depois gravação) em vez de guardar os
+            # bytes do arquivo inteiro: o Rope é imutável, dá para reler
+            def blocks():
+                chunks = (content,) if isinstance(content, str) else content.chunks()
+                return (_encode(chunk) for chunk in chunks)
+
+            size = 0
+            h = new_hasher()
+            for block in blocks():
+                size += len(block)
+                h.update(block)
+            digest = h.hexdigest()
+            if self._matches_disk(path, size, digest):
+                return SaveResult(path, False, digest, _ms_since(start))
+            atomic_write(path, blocks())
+            st = path.stat()
+            self._known[path] = (st.st_size, st.st_mtime_ns, digest)
+            return SaveResult(path, True, digest, _ms_since(start))
+        except Exception as ex:
+            self._known.pop(path, None)
+            return SaveResult(path, False, "", _ms_since(start), error=ex)
+
+    def _matches_disk(self, path: Path, size: int, digest: str) -> bool:
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        if st.st_size != size:
+            return False
+        known = self._known.get(path)
+        if known is not None and known[:2] == (st.st_size, st.st_mtime_ns):
+            return known[2] == digest
+        # mesmo tamanho, mas não sabemos o que tem lá: lê e compara
+        on_disk = content_digest([path.read_bytes()])
+        self._known[path] = (st.st_size, st.st_mtime_ns, on_disk)
+        return on_disk == digest
+
+
+def _read_umask() -> int:
+    # só dá para ler trocando; lido uma vez, no import (antes das threads de gravação)
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _read_umask()
+
+
+def atomic_write(path: Path, data: Iterable[bytes]) -> None:
+    """Grava num temporário ao lado de `path`, faz fsync e troca com os.replace."""
+    directory = path.parent
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for block in data:
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            # mantém as permissões do arquivo original
+            mode = path.stat().st_mode & 0o7777
+        except FileNotFoundError:
+            # arquivo novo: o que o open() daria (o mkstemp cria com 0600)
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(directory)
+
+
+def _fsync_dir(directory: Path) -> None:
+    # garante que o rename chegou ao disco (não existe no Windows)
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _encode(text: str) -> bytes:
+    # mesmo resultado de Path.write_text (modo texto: "\n" vira os.linesep)
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
+
+
+def new_hasher():
+    """Hash usado para comparar conteúdo com o disco (gravação, journal)."""
+    return hashlib.blake2b(digest_size=16)
+
+
+def content_digest(blocks: Iterable[bytes]) -> str:
+    h = new_hasher()
+    for block in blocks:
+        h.update(block)
+    return h.hexdigest()
+
+
+def _ms_since(start: float) -> float:
+    return (time.perf_counter() - start) * 1000.0
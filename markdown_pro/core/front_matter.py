@@ -1,15 +1,29 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+import copy
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Optional, Tuple
 
-import yaml
+
+# linha de fechamento: "---" cercado só de espaços (não atravessa linhas)
+_CLOSE_RE = re.compile(r"^[^\S\n]*---[^\S\n]*$", re.M)
+# cabeçalhos YAML distintos guardados já interpretados
+_YAML_CACHE_SIZE = 128
 
 
 @dataclass
 class FrontMatterResult:
     metadata: Dict[str, Any]
-    content: str
+    # documento original e onde o corpo começa (0 = sem front matter)
+    text: str = field(repr=False, default="")
+    body_offset: int = 0
+
+    @cached_property
+    def content(self) -> str:
+        # sem front matter o corpo é o próprio texto: nenhuma cópia
+        return self.text[self.body_offset:] if self.body_offset else self.text
 
 
 def parse_front_matter(text: str) -> FrontMatterResult:
@@ -25,35 +39,63 @@ def parse_front_matter(text: str) -> FrontMatterResult:
     ---
 
     Conteúdo...
-    """
-    lines = text.splitlines()
-    if len(lines) < 3:
-        return FrontMatterResult(metadata={}, content=text)
-
-    if lines[0].strip() != "---":
-        return FrontMatterResult(metadata={}, content=text)
 
-    # encontra o segundo --- (fim)
-    end_idx = None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            end_idx = i
-            break
-
-    if end_idx is None:
-        return FrontMatterResult(metadata={}, content=text)
-
-    yaml_block = "\n".join(lines[1:end_idx]).strip()
-    rest = "\n".join(lines[end_idx + 1 :]).lstrip("\n")
+    Só as linhas do cabeçalho são lidas (por offset, sem dividir o documento);
+    o YAML interpretado fica em cache pelo conteúdo do bloco.
+    """
+    bounds = scan_front_matter(text)
+    if bounds is None:
+        return FrontMatterResult(metadata={}, text=text)
 
+    yaml_start, yaml_end, body_offset = bounds
+    yaml_block = text[yaml_start:yaml_end].strip()
     if not yaml_block:
-        return FrontMatterResult(metadata={}, content=rest)
+        return FrontMatterResult(metadata={}, text=text, body_offset=body_offset)
 
     try:
-        data = yaml.safe_load(yaml_block) or {}
-        if not isinstance(data, dict):
-            data = {"_front_matter": data}
-        return FrontMatterResult(metadata=data, content=rest)
+        data = _load_yaml(yaml_block)
     except Exception:
         # se YAML estiver quebrado, não destrói o documento
-        return FrontMatterResult(metadata={"_front_matter_error": True}, content=text)
+        return FrontMatterResult(metadata={"_front_matter_error": True}, text=text)
+    # cópia: quem recebe pode mexer sem estragar o cache
+    return FrontMatterResult(metadata=copy.deepcopy(data), text=text, body_offset=body_offset)
+
+
+def scan_front_matter(text: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Limites do front matter: (início do YAML, fim do YAML, início do corpo),
+    ou None. Mesma regra de antes: "---" na 1ª linha até o próximo "---",
+    com pelo menos uma linha depois dele; linhas em branco no começo do
+    corpo ficam de fora.
+    """
+    first_end = text.find("\n")
+    if first_end == -1 or text[:first_end].strip() != "---":
+        return None
+    yaml_start = first_end + 1
+    m = _CLOSE_RE.search(text, yaml_start)
+    if m is None:
+        return None
+    yaml_end = m.start()
+    body = m.end()
+    if body < len(text) and text[body] == "\n":
+        body += 1
+    elif m.start() == yaml_start:
+        # "---\n---" sem mais nada: só duas linhas, não é front matter
+        return None
+    if yaml_end == yaml_start and body >= len(text):
+        return None
+    while body < len(text) and text[body] in "\r\n":
+        body += 1
+    return yaml_start, yaml_end, body
+
+
+@lru_cache(maxsize=_YAML_CACHE_SIZE)
+def _load_yaml(block: str) -> Dict[str, Any]:
+    # import tardio: só documentos com front matter pagam o yaml
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    data = yaml.load(block, Loader=loader) or {}
+    if not isinstance(data, dict):
+        data = {"_front_matter": data}
+    return data
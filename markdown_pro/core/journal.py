@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from markdown_pro.core.file_writer import atomic_write, content_digest
+from markdown_pro.core.large_file import decode_text
+from markdown_pro.core.rope import Rope
+from markdown_pro.core.text_buffer import BufferEdit
+from markdown_pro.utils.paths import journal_dir
+
+
+# de quanto em quanto tempo as edições acumuladas vão para o disco
+FLUSH_INTERVAL_S = 0.5
+# compacta quando o log passa disso (ou de metade do documento, o que for maior)
+COMPACT_MIN_BYTES = 1024 * 1024
+
+_SUFFIX = ".journal"
+
+
+@dataclass
+class RecoveredDocument:
+    journal_id: str
+    path: Optional[Path]
+    text: str
+    modified: float
+
+
+class EditJournal:
+    """
+    Autosave por journal: um arquivo por documento em ~/.markdown-pro/journal
+    com uma linha JSON por registro. A primeira linha é a base, que pode ser
+    o próprio arquivo em disco (caminho + hash) ou o texto inteiro
+    (snapshot). Depois dela vêm as edições em offsets: {"r", "s", "e", "t"}.
+
+    `record()` só enfileira, em O(1), na thread da GUI. Uma thread grava os
+    registros em lote a cada FLUSH_INTERVAL_S, com fsync. A compactação
+    reescreve o arquivo com um snapshot novo (os.replace atômico).
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self._directory = directory
+        self.journal_id: Optional[str] = None
+        self._ops: List[Tuple] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # bytes de edição desde a última base (para decidir a compactação)
+        self._log_bytes = 0
+
+    @property
+    def active(self) -> bool:
+        return self.journal_id is not None
+
+    def _path(self, journal_id: str) -> Path:
+        return (self._directory or journal_dir()) / f"{journal_id}{_SUFFIX}"
+
+    # ---------- thread da GUI ----------
+    def start(
+        self,
+        base: Rope,
+        path: Optional[Path],
+        digest: Optional[str],
+        journal_id: Optional[str] = None,
+    ) -> None:
+        """
+        Abre um journal para o documento cujo conteúdo atual é `base`. Com
+        `digest` (hash do arquivo em disco), a base é só uma referência ao
+        arquivo; sem ele, o texto vai inteiro para o journal.
+        """
+        self.journal_id = journal_id or uuid.uuid4().hex
+        header = {"base": "file" if digest else "inline", "path": str(path) if path else None,
+                  "digest": digest, "pid": os.getpid()}
+        self._log_bytes = 0
+        self._push(("base", self.journal_id, header, None if digest else base))
+
+    def record(self, edit: BufferEdit, rope: Rope) -> None:
+        """Registra uma edição já aplicada; `rope` é o conteúdo depois dela."""
+        if self.journal_id is None:
+            return
+        self._push(("edit", {"r": edit.revision, "s": edit.start, "e": edit.end, "t": edit.text}))
+        self._log_bytes += len(edit.text) + 32
+        if self._log_bytes > max(COMPACT_MIN_BYTES, len(rope) // 2):
+            self.snapshot(rope)
+
+    def snapshot(self, rope: Rope) -> None:
+        """Compacta: o journal passa a ser só o texto atual."""
+        if self.journal_id is None:
+            return
+        self._log_bytes = 0
+        self._push(("snap", rope))
+
+    def discard(self) -> None:
+        """O documento está salvo (ou foi descartado): apaga o journal."""
+        if self.journal_id is None:
+            return
+        self.journal_id = None
+        self._push(("discard",))
+
+    def close(self) -> None:
+        """Grava o que estiver pendente e encerra a thread (mantém o arquivo)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _push(self, op: Tuple) -> None:
+        with self._cond:
+            self._ops.append(op)
+            self._cond.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+            self._thread.start()
+
+    # ---------- thread do journal ----------
+    def _run(self) -> None:
+        current: Optional[Tuple[Path, dict]] = None
+        while True:
+            with self._cond:
+                while not self._ops and not self._closed:
+                    self._cond.wait()
+                closed = self._closed
+            if not closed:
+                # junta o que chegar nesse intervalo num único write
+                time.sleep(FLUSH_INTERVAL_S)
+            with self._cond:
+                ops, self._ops = self._ops, []
+            try:
+                current = self._apply(ops, current)
+            except OSError:
+                # sem disco para o journal não é motivo para derrubar o editor
+                pass
+            if closed:
+                return
+
+    def _apply(self, ops: List[Tuple], current):
+        lines: List[str] = []
+
+        def flush() -> None:
+            if lines and current is not None:
+                with open(current[0], "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+            lines.clear()
+
+        for op in ops:
+            kind = op[0]
+            if kind == "edit":
+                lines.append(json.dumps(op[1], ensure_ascii=False) + "\n")
+            elif kind == "base":
+                flush()
+                _, journal_id, header, rope = op
+                current = (self._path(journal_id), header)
+                _write_base(current[0], header, rope)
+            elif kind == "snap" and current is not None:
+                flush()
+                header = dict(current[1], base="inline", digest=None)
+                current = (current[0], header)
+                _write_base(current[0], header, op[1])
+            elif kind == "discard":
+                lines.clear()
+                if current is not None:
+                    _unlink(current[0])
+                current = None
+        flush()
+        return current
+
+
+def _write_base(path: Path, header: dict, rope: Optional[Rope]) -> None:
+    first = json.dumps(header, ensure_ascii=False) + "\n"
+    blocks = [first.encode("utf-8")]
+    if rope is not None:
+        blocks.append((json.dumps({"text": rope.text()}, ensure_ascii=False) + "\n").encode("utf-8"))
+    atomic_write(path, blocks)
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# ---------- recuperação ----------
+def recover(directory: Optional[Path] = None) -> List[RecoveredDocument]:
+    """
+    Reconstrói os documentos com journal de sessões que não terminaram
+    (o processo dono não está mais vivo), do mais recente para o mais antigo.
+    Journals ilegíveis ou cuja base não confere mais são apagados.
+    """
+    directory = directory or journal_dir()
+    found: List[RecoveredDocument] = []
+    for file in directory.glob(f"*{_SUFFIX}"):
+        try:
+            doc = _replay(file)
+        except (OSError, ValueError, KeyError, TypeError):
+            doc = None
+        if doc is False:
+            continue
+        if doc is None:
+            _unlink(file)
+            continue
+        found.append(doc)
+    found.sort(key=lambda d: d.modified, reverse=True)
+    return found
+
+
+def remove(journal_id: str, directory: Optional[Path] = None) -> None:
+    _unlink((directory or journal_dir()) / f"{journal_id}{_SUFFIX}")
+
+
+def _replay(file: Path):
+    with open(file, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    header = json.loads(lines[0])
+    if _alive(header.get("pid")):
+        # journal de outra janela aberta: não é nosso
+        return False
+    path = Path(header["path"]) if header.get("path") else None
+
+    i = 1
+    if header["base"] == "file":
+        data = path.read_bytes()
+        if content_digest([data]) != header["digest"]:
+            return None
+        rope = Rope(decode_text(data))
+    else:
+        rope = Rope(json.loads(lines[1])["text"])
+        i = 2
+
+    edits = 0
+    for line in lines[i:]:
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            # última linha cortada no meio da gravação
+            break
+        rope = rope.replace(rec["s"], rec["e"], rec["t"])
+        edits += 1
+    if not edits and header["base"] == "file":
+        return None
+    return RecoveredDocument(file.stem, path, rope.text(), file.stat().st_mtime)
+
+
+def _alive(pid) -> bool:
+    if not isinstance(pid, int) or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import codecs
+import io
+import mmap
+from pathlib import Path
+from typing import Iterator, Tuple
+
+
+def decode_text(data: bytes) -> str:
+    """Decodifica UTF-8 normalizando quebras de linha, como Path.read_text()."""
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def iter_text_chunks(path: Path, chunk_bytes: int, hasher=None) -> Iterator[Tuple[str, int, int]]:
+    """
+    Lê um arquivo UTF-8 em partes via mmap, sem carregar os bytes inteiros.
+    Gera (texto, bytes lidos até aqui, tamanho total). A decodificação é
+    incremental (caracteres multibyte e "\\r\\n" podem cair na divisa entre
+    partes) e as quebras de linha são normalizadas como em read_text().
+    `hasher` (ex.: hashlib.blake2b) recebe os bytes brutos de cada parte.
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(), translate=True)
+    with open(path, "rb") as f:
+        total = f.seek(0, io.SEEK_END)
+        if total == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for pos in range(0, total, chunk_bytes):
+                end = min(pos + chunk_bytes, total)
+                data = mm[pos:end]
+                if hasher is not None:
+                    hasher.update(data)
+                text = decoder.decode(data, final=end == total)
+                if text:
+                    yield text, end, total
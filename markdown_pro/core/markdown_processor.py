@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+import hashlib
+import html as html_lib
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import markdown
+from markdown.extensions.toc import unique
 
-from markdown_pro.core.front_matter import parse_front_matter
-from markdown_pro.core.md_config import MARKDOWN_EXTENSIONS, MARKDOWN_EXTENSION_CONFIGS
+from markdown_pro.core.front_matter import FrontMatterResult, parse_front_matter
+from markdown_pro.core.md_blocks import (
+    ABBR_DEF_RE,
+    FENCE,
+    FOOTNOTE,
+    HTML,
+    RAW_HTML,
+    REFERENCE_DEF_RE,
+    TEXT,
+    split_blocks,
+)
+from markdown_pro.core.outline import Outline
+from markdown_pro.core import code_highlight
+from markdown_pro.core.md_config import MARKDOWN_EXTENSIONS, extension_configs
+from markdown_pro.utils.byte_lru import ByteLRU
 
 
 DEFAULT_CSS = """
@@ -23,6 +40,27 @@ blockquote { border-left: 4px solid #ddd; margin: 1em 0; padding: 0.2em 0.8em; c
 .admonition { border: 1px solid #ddd; border-left-width: 6px; border-radius: 8px; padding: 10px 12px; margin: 1em 0; }
 """
 
+# limite do cache de renderização (soma aproximada do HTML guardado)
+DEFAULT_RENDER_CACHE_BYTES = 32 * 1024 * 1024
+# limite do cache de fragmentos por bloco (modo incremental)
+DEFAULT_BLOCK_CACHE_BYTES = 32 * 1024 * 1024
+
+# recursos que dependem do documento inteiro: sem modo incremental
+_FULL_RENDER_MARKERS = ("///Footnotes Go Here///",)
+# prefixo das chaves de render_incremental no cache de resultados
+_INCREMENTAL_KEY = b"i:"
+# [TOC] sozinho num parágrafo vira o sumário do Outline; em qualquer outro
+# lugar o documento vai para a conversão inteira
+_TOC_MARKER = "[TOC]"
+
+_FOOTNOTE_DIV = '<div class="footnote">'
+_CODE_BLOCK_END = "</code></pre></div>"
+_FOOTNOTE_DEF_LINE_RE = re.compile(r"(?m)^ {0,3}\[\^([^\]]*)\]:")
+_FOOTNOTE_REF_ID_RE = re.compile(r'<sup id="fnref\d*:([^"]+)"')
+_HEADING_RE = re.compile(r'(<(h[1-6])\b[^>]*?\bid=")([^"]*)("[^>]*>)(.*?)(</\2>)', re.S)
+_ATTR_ID_RE = re.compile(r"\{:?[^}\n]*?#([^\s}]+)")
+
+
 @dataclass
 class RenderResult:
     html_full: str
@@ -31,33 +69,227 @@ class RenderResult:
 
 
 class MarkdownProcessor:
-    def __init__(self, css: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        css: Optional[str] = None,
+        cache_bytes: int = DEFAULT_RENDER_CACHE_BYTES,
+        block_cache_bytes: int = DEFAULT_BLOCK_CACHE_BYTES,
+        code_css_classes: bool = False,
+    ) -> None:
         self.css = css or DEFAULT_CSS
+        # código com classes do Pygments: o CSS do tema vai uma vez no <style>
+        self.code_css_classes = code_css_classes
+        if code_css_classes:
+            self.css += code_highlight.pygments_css()
+        self._md: Optional[markdown.Markdown] = None
+        self._block_md: Optional[markdown.Markdown] = None
+
+        # LRU por hash do conteúdo, limitado pelo tamanho do HTML guardado
+        self._results = ByteLRU(cache_bytes, lambda r: len(r.html_full) + len(r.html_body))
+        # fragmentos HTML por bloco: (html, Meta)
+        self._blocks = ByteLRU(block_cache_bytes, lambda v: len(v[0]))
+
+    @property
+    def cache_hits(self) -> int:
+        return self._results.hits
+
+    @property
+    def cache_misses(self) -> int:
+        return self._results.misses
 
     def render(self, text: str) -> RenderResult:
+        key = _content_key(text)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._render(text)
+        self._results.put(key, result)
+        return result
+
+    def render_incremental(self, text: str, toc: Optional[List[Dict[str, Any]]] = None) -> RenderResult:
+        """
+        Igual a render(), mas converte bloco a bloco (fences, parágrafos,
+        títulos, tabelas, admonitions, notas de rodapé) e reaproveita o HTML
+        dos blocos que não mudaram. Pensado para o preview ao vivo.
+
+        `toc` (Outline.toc_tokens() do editor) evita reanalisar o documento
+        quando há um [TOC]; sem ele, o Outline é montado aqui.
+        """
+        # chave própria: render() e a exportação nunca recebem o resultado
+        # montado por blocos
+        key = _INCREMENTAL_KEY + _content_key(text)
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        fm = parse_front_matter(text)
+        result = None
+        if not any(marker in fm.content for marker in _FULL_RENDER_MARKERS):
+            result = self._render_blocks(fm, toc)
+        if result is None:
+            # conversão inteira: fica no cache de render()
+            return self.render(text)
+        self._results.put(key, result)
+        return result
+
+    def cache_stats(self) -> Dict[str, Any]:
+        stats = self._results.stats()
+        stats["blocks"] = self._blocks.stats()
+        stats["code"] = code_highlight.cache_stats()
+        return stats
+
+    def clear_cache(self) -> None:
+        self._results.clear()
+        self._blocks.clear()
+
+    # ---------- internals ----------
+    def _engine(self) -> markdown.Markdown:
+        # carregar as extensões (codehilite/Pygments inclusos) é caro: uma vez só
+        if self._md is None:
+            self._md = _build_engine(MARKDOWN_EXTENSIONS, self.code_css_classes)
+        else:
+            self._md.reset()
+        return self._md
+
+    def _block_engine(self) -> markdown.Markdown:
+        # sem "meta": no meio do documento "Nota: ..." não é metadado
+        if self._block_md is None:
+            self._block_md = _build_engine(
+                [e for e in MARKDOWN_EXTENSIONS if e != "meta"], self.code_css_classes
+            )
+        else:
+            self._block_md.reset()
+        return self._block_md
+
+    def _render(self, text: str) -> RenderResult:
         fm = parse_front_matter(text)
-        md = markdown.Markdown(
-            extensions=MARKDOWN_EXTENSIONS,
-            extension_configs=MARKDOWN_EXTENSION_CONFIGS,
-            output_format="html5",
-        )
+        md = self._engine()
 
         html_body = md.convert(fm.content)
         # metadata da extensão "meta" vem em md.Meta (valores como lista de strings)
         meta_from_md = getattr(md, "Meta", {}) or {}
 
-        merged_meta: Dict[str, Any] = {}
-        merged_meta.update(fm.metadata)
-        # normaliza meta do markdown
-        for k, v in meta_from_md.items():
-            if isinstance(v, list) and len(v) == 1:
-                merged_meta[k] = v[0]
-            else:
-                merged_meta[k] = v
+        merged_meta = _merge_meta(fm.metadata, meta_from_md)
+        html_full = self._wrap_html(html_body, merged_meta)
+        return RenderResult(html_full=html_full, html_body=html_body, metadata=merged_meta)
+
+    def _render_blocks(
+        self, fm: FrontMatterResult, toc: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[RenderResult]:
+        blocks = split_blocks(fm.content)
+        if any(b.kind == RAW_HTML for b in blocks):
+            return None
+        toc_html = None
+        if _TOC_MARKER in fm.content:
+            markers = sum(1 for b in blocks if b.kind == TEXT and b.source.strip() == _TOC_MARKER)
+            if markers != fm.content.count(_TOC_MARKER):
+                return None
+            if toc is None:
+                toc = Outline(fm.content).toc_tokens()
+            toc_html = _toc_div(toc)
+
+        # contexto global: definições de links/abreviações, ids de notas e
+        # ids explícitos ({#id}) de títulos
+        context_lines: List[str] = []
+        has_abbr = False
+        footnote_ids: Dict[str, None] = {}
+        footnote_sources: List[str] = []
+        explicit_ids: Set[str] = set()
+        for block in blocks:
+            if block.kind == FOOTNOTE:
+                footnote_sources.append(block.source)
+                footnote_ids.update(dict.fromkeys(_FOOTNOTE_DEF_LINE_RE.findall(block.source)))
+                continue
+            if block.kind == FENCE:
+                continue
+            if "]:" in block.source:
+                for line in block.source.split("\n"):
+                    if REFERENCE_DEF_RE.match(line):
+                        context_lines.append(line)
+                    elif ABBR_DEF_RE.match(line):
+                        context_lines.append(line)
+                        has_abbr = True
+            if "{" in block.source:
+                explicit_ids.update(_ATTR_ID_RE.findall(block.source))
+
+        context = "\n".join(context_lines)
+        # definições "falsas" só para as referências [^id] resolverem com o
+        # mesmo número (ordem de definição) que teriam no documento inteiro
+        stubs = "\n".join(f"[^{fid}]: _" for fid in footnote_ids)
+
+        fragments: List[Tuple[str, Set[str]]] = []
+        meta_from_md: Dict[str, Any] = {}
+        for i, block in enumerate(blocks):
+            if block.kind == FOOTNOTE:
+                continue
+            if toc_html is not None and block.kind == TEXT and block.source.strip() == _TOC_MARKER:
+                fragments.append((toc_html, set()))
+                continue
+            src = block.source
+            if block.kind != FENCE:
+                if context and (has_abbr or "[" in src):
+                    src = f"{src}\n\n{context}"
+                if stubs and "[^" in src:
+                    src = f"{src}\n\n{stubs}"
+            # "meta" só olha o começo do documento
+            html, meta = self._convert_block(src, with_meta=(i == 0))
+            if i == 0:
+                meta_from_md = meta
+            if html and block.kind == HTML and "markdown=" not in block.source:
+                # HTML bruto sai do "stash" seguido de linha vazia
+                html += "\n"
+            if html:
+                own_ids = set(_ATTR_ID_RE.findall(block.source)) if "{" in block.source else set()
+                fragments.append((html, own_ids))
+
+        parts = _fix_heading_ids(fragments, explicit_ids)
+        ref_order = _fix_footnote_refs(parts)
+
+        if footnote_sources:
+            # a div de notas é gerada à parte, com as referências na mesma
+            # ordem/quantidade do documento (backrefs de duplicadas inclusos)
+            refs = " ".join(f"[^{fid}]" for fid in ref_order)
+            src = "\n\n".join([refs] + footnote_sources)
+            if context:
+                src = f"{src}\n\n{context}"
+            html, _meta = self._convert_block(src, with_meta=False, footnotes=True)
+            idx = html.find(_FOOTNOTE_DIV)
+            if idx != -1:
+                parts.append(html[idx:])
 
-        title = str(merged_meta.get("title") or "Documento")
+        html_body = "\n".join(parts).rstrip("\n")
+        merged_meta = _merge_meta(fm.metadata, meta_from_md)
+        html_full = self._wrap_html(html_body, merged_meta)
+        return RenderResult(html_full=html_full, html_body=html_body, metadata=merged_meta)
+
+    def _convert_block(
+        self, src: str, with_meta: bool, footnotes: bool = False
+    ) -> Tuple[str, Dict[str, Any]]:
+        key = _content_key(("m" if with_meta else "f" if footnotes else "b") + src)
+        cached = self._blocks.get(key)
+        if cached is not None:
+            return cached
+
+        md = self._engine() if with_meta else self._block_engine()
+        html = md.convert(src)
+        meta = dict(getattr(md, "Meta", {}) or {}) if with_meta else {}
+        if "[^" in src and not footnotes:
+            # a div de notas do bloco isolado é descartada (é montada à parte)
+            idx = html.rfind(_FOOTNOTE_DIV)
+            if idx != -1:
+                html = html[:idx].rstrip("\n")
+        if html.endswith(_CODE_BLOCK_END):
+            # no documento inteiro o bloco de código vem seguido de linha vazia
+            html += "\n"
+        value = (html, meta)
+        self._blocks.put(key, value)
+        return value
 
-        html_full = f"""<!doctype html>
+    def _wrap_html(self, html_body: str, metadata: Dict[str, Any]) -> str:
+        title = str(metadata.get("title") or "Documento")
+
+        return f"""<!doctype html>
 <html lang="pt-BR">
 <head>
   <meta charset="utf-8" />
@@ -70,7 +302,100 @@ class MarkdownProcessor:
 </body>
 </html>
 """
-        return RenderResult(html_full=html_full, html_body=html_body, metadata=merged_meta)
+
+
+def _build_engine(extensions: List[str], code_css_classes: bool = False) -> markdown.Markdown:
+    # blocos de código realçados ficam em cache entre conversões (só neste motor)
+    configs = extension_configs(code_css_classes)
+    return markdown.Markdown(
+        extensions=code_highlight.cached_extensions(extensions, configs),
+        extension_configs=configs,
+        output_format="html5",
+    )
+
+
+def _merge_meta(front_matter: Dict[str, Any], meta_from_md: Dict[str, Any]) -> Dict[str, Any]:
+    merged_meta: Dict[str, Any] = {}
+    merged_meta.update(front_matter)
+    # normaliza meta do markdown
+    for k, v in meta_from_md.items():
+        if isinstance(v, list) and len(v) == 1:
+            merged_meta[k] = v[0]
+        else:
+            merged_meta[k] = v
+    return merged_meta
+
+
+def _fix_heading_ids(fragments: List[Tuple[str, Set[str]]], explicit_ids: Set[str]) -> List[str]:
+    """Refaz a unicidade dos ids de título (toc) no documento todo."""
+    used = set(explicit_ids)
+    parts: List[str] = []
+    for html, own_ids in fragments:
+        if "<h" not in html:
+            parts.append(html)
+            continue
+
+        def fix(m: "re.Match[str]") -> str:
+            old = m.group(3)
+            if old in own_ids:
+                return m.group(0)
+            new = unique(old, used)
+            if new == old:
+                return m.group(0)
+            inner = m.group(5).replace(f'href="#{old}"', f'href="#{new}"')
+            return f"{m.group(1)}{new}{m.group(4)}{inner}{m.group(6)}"
+
+        parts.append(_HEADING_RE.sub(fix, html))
+    return parts
+
+
+def _toc_div(tokens: List[Dict[str, Any]]) -> str:
+    """O mesmo <div class="toc"> que a extensão toc gera (já "prettified")."""
+    return "\n".join(['<div class="toc">', *_toc_ul(tokens), "</div>"])
+
+
+def _toc_ul(tokens: List[Dict[str, Any]]) -> List[str]:
+    if not tokens:
+        return ["<ul></ul>"]
+    lines = ["<ul>"]
+    for token in tokens:
+        href = html_lib.escape(token["id"], quote=False).replace('"', "&quot;")
+        link = f'<li><a href="#{href}">{html_lib.escape(token["name"], quote=False)}</a>'
+        if token["children"]:
+            # a lista aninhada começa na mesma linha do <a>
+            nested = _toc_ul(token["children"])
+            lines.append(link + nested[0])
+            lines.extend(nested[1:])
+            lines.append("</li>")
+        else:
+            lines.append(link + "</li>")
+    lines.append("</ul>")
+    return lines
+
+
+def _fix_footnote_refs(parts: List[str]) -> List[str]:
+    """
+    Renumera ids de referências repetidas entre blocos (fnref:x, fnref2:x...)
+    e devolve a sequência de ids referenciados, na ordem do documento.
+    """
+    counts: Dict[str, int] = {}
+    order: List[str] = []
+
+    def fix(m: "re.Match[str]") -> str:
+        fid = m.group(1)
+        n = counts.get(fid, 0) + 1
+        counts[fid] = n
+        order.append(fid)
+        return f'<sup id="fnref{n if n > 1 else ""}:{fid}"'
+
+    for i, html in enumerate(parts):
+        if "fnref" in html:
+            parts[i] = _FOOTNOTE_REF_ID_RE.sub(fix, html)
+    return order
+
+
+def _content_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
 
 
 def _escape_html(s: str) -> str:
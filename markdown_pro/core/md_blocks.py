@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from markdown.util import BLOCK_LEVEL_ELEMENTS
+
+
+# tipos de bloco de topo
+FENCE = "fence"
+HEADING = "heading"
+FOOTNOTE = "footnote"
+HTML = "html"
+# HTML bruto que não dá para isolar num bloco (sem fechamento, colado num
+# parágrafo, texto depois da tag de fechamento...): só a conversão inteira
+RAW_HTML = "raw_html"
+TEXT = "text"
+
+_FENCE_OPEN_RE = re.compile(r"^(~{3,}|`{3,})")
+_HEADING_RE = re.compile(r"^#{1,6}")
+_FOOTNOTE_DEF_RE = re.compile(r"^ {0,3}\[\^([^\]]*)\]:")
+_LIST_ITEM_RE = re.compile(r"^ {0,3}(?:[*+-]|\d+\.)[ \t]+")
+_HTML_OPEN_RE = re.compile(r"^<([a-zA-Z][\w-]*)")
+_HTML_LINE_RE = re.compile(r"^ {0,3}<(?:[!?]|/?([a-zA-Z][\w-]*))")
+_BLOCK_TAGS = frozenset(BLOCK_LEVEL_ELEMENTS)
+_COMMENT_OPEN = "<!--"
+_COMMENT_CLOSE = "-->"
+
+# definições que valem para o documento inteiro (links de referência e abreviações)
+REFERENCE_DEF_RE = re.compile(r"^ {0,3}\[(?!\^)[^\]]+\]:[ \t]*\S")
+ABBR_DEF_RE = re.compile(r"^\*\[[^\]]+\]:")
+
+
+@dataclass(frozen=True)
+class Block:
+    kind: str
+    source: str
+
+
+def split_blocks(body: str) -> List[Block]:
+    """
+    Divide o corpo em blocos de topo que o Python-Markdown converte de forma
+    independente: blocos de código cercados, títulos ATX, definições de nota
+    de rodapé, HTML bruto e "o resto" (parágrafos, listas, tabelas, citações,
+    admonitions), incluindo as continuações indentadas após linhas em branco.
+    """
+    lines = body.split("\n")
+    n = len(lines)
+    blocks: List[Block] = []
+    cur: List[str] = []
+    cur_kind = TEXT
+
+    def flush() -> None:
+        nonlocal cur, cur_kind
+        while cur and not cur[-1].strip():
+            cur.pop()
+        if cur:
+            blocks.append(Block(cur_kind, "\n".join(cur)))
+        cur = []
+        cur_kind = TEXT
+
+    i = 0
+    while i < n:
+        line = lines[i]
+
+        m = _FENCE_OPEN_RE.match(line)
+        if m:
+            end = _find_fence_close(lines, i + 1, m.group(1))
+            if end is not None:
+                flush()
+                blocks.append(Block(FENCE, "\n".join(lines[i:end + 1])))
+                i = end + 1
+                continue
+
+        if _HEADING_RE.match(line):
+            flush()
+            blocks.append(Block(HEADING, line))
+            i += 1
+            continue
+
+        if _FOOTNOTE_DEF_RE.match(line):
+            flush()
+            cur_kind = FOOTNOTE
+
+        if not line.strip():
+            # linha em branco: o bloco continua se o que vem depois for
+            # continuação (indentação, próximo item de lista, citação...)
+            j = i
+            while j < n and not lines[j].strip():
+                j += 1
+            if j < n and cur and _continues(cur, cur_kind, lines, j):
+                cur.extend(lines[i:j])
+                i = j
+                continue
+            flush()
+            i = j
+            continue
+
+        m = _HTML_LINE_RE.match(line)
+        if m and (m.group(1) is None or m.group(1).lower() in _BLOCK_TAGS):
+            # HTML bruto pode conter linhas em branco: vai até a tag de
+            # fechamento que equilibra a de abertura (ou até o -->)
+            end = None
+            if not cur:
+                m = _HTML_OPEN_RE.match(line)
+                if m:
+                    end = _find_html_close(lines, i, m.group(1).lower())
+                elif line.startswith(_COMMENT_OPEN):
+                    end = _find_comment_close(lines, i)
+                if end is not None and end + 1 < n and lines[end + 1].strip():
+                    # texto colado depois do HTML: a separação muda na saída
+                    end = None
+            if end is None:
+                flush()
+                blocks.append(Block(RAW_HTML, line))
+                i += 1
+                continue
+            if end > i:
+                blocks.append(Block(HTML, "\n".join(lines[i:end + 1])))
+                i = end + 1
+                continue
+
+        cur.append(line)
+        i += 1
+
+    flush()
+    return blocks
+
+
+def _continues(cur: List[str], kind: str, lines: List[str], j: int) -> bool:
+    next_line = lines[j]
+    if next_line.startswith(("    ", "\t")):
+        return True
+    if kind == FOOTNOTE:
+        return False
+    # definições somem da saída: o que vem depois delas ainda é "irmão"
+    # do bloco anterior (ex.: uma lista continua depois de [ref]: url)
+    if REFERENCE_DEF_RE.match(next_line) or ABBR_DEF_RE.match(next_line):
+        return True
+    first = cur[0]
+    if _LIST_ITEM_RE.match(first) and _LIST_ITEM_RE.match(next_line):
+        return True
+    if first.startswith(">") and next_line.startswith(">"):
+        return True
+    # def_list: ":   definição" depois de linha em branco, ou um novo termo
+    # logo depois de uma lista de definições (vira a mesma <dl>)
+    if _is_definition(next_line):
+        return True
+    return (
+        j + 1 < len(lines)
+        and _is_definition(lines[j + 1])
+        and any(_is_definition(line) for line in cur)
+    )
+
+
+def _is_definition(line: str) -> bool:
+    return line.startswith(":") and len(line) > 1 and line[1] in " \t"
+
+
+def _find_fence_close(lines: List[str], start: int, fence: str):
+    for j in range(start, len(lines)):
+        line = lines[j]
+        if line.startswith(fence) and not line[len(fence):].strip(" "):
+            return j
+    return None
+
+
+def _find_html_close(lines: List[str], start: int, tag: str) -> Optional[int]:
+    # conta aberturas e fechamentos da mesma tag (<div> dentro de <div>);
+    # None se não fecha ou se sobra texto depois do fechamento
+    opening = re.compile(rf"<{re.escape(tag)}(?=[\s/>]|$)([^>]*)>?", re.IGNORECASE)
+    closing = re.compile(rf"</{re.escape(tag)}\s*>", re.IGNORECASE)
+    depth = 0
+    for j in range(start, len(lines)):
+        line = lines[j]
+        depth += sum(1 for m in opening.finditer(line) if not m.group(1).endswith("/"))
+        last = None
+        for last in closing.finditer(line):
+            depth -= 1
+        if depth <= 0:
+            if last is None or line[last.end():].strip():
+                return None
+            return j
+    return None
+
+
+def _find_comment_close(lines: List[str], start: int) -> Optional[int]:
+    # o comentário vai até o primeiro -->, mesmo com linhas em branco no meio
+    for j in range(start, len(lines)):
+        line = lines[j][len(_COMMENT_OPEN):] if j == start else lines[j]
+        end = line.find(_COMMENT_CLOSE)
+        if end != -1:
+            return None if line[end + len(_COMMENT_CLOSE):].strip() else j
+    return None
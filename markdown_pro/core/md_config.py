@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import copy
+from typing import Any, Dict
+
 MARKDOWN_EXTENSIONS = [
     "extra",
     "tables",
@@ -19,3 +22,14 @@ MARKDOWN_EXTENSION_CONFIGS = {
         "noclasses": True,  # inline styles (bom pro PDF/HTML standalone)
     },
 }
+
+
+def extension_configs(code_css_classes: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Configuração das extensões; com `code_css_classes` o código sai com
+    classes do Pygments (CSS uma vez só na página) em vez de estilos inline.
+    """
+    configs = copy.deepcopy(MARKDOWN_EXTENSION_CONFIGS)
+    if code_css_classes:
+        configs["codehilite"]["noclasses"] = False
+    return configs
@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import html
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+# tipo de cada linha
+TEXT = "text"
+HEADING = "heading"
+FENCE = "fence"  # linha de abertura/fechamento de ``` ou ~~~
+CODE = "code"  # dentro de um bloco cercado
+FRONT_MATTER = "front_matter"
+
+# mesmas regras de md_blocks / Python-Markdown
+_FENCE_OPEN_RE = re.compile(r"^(~{3,}|`{3,})")
+_HEADING_RE = re.compile(r"^(#{1,6})(.*?)#*$")
+_HEADING_ATTR_RE = re.compile(r"[ ]+\{:?([^}\n]*)\}[ ]*$")
+_ATTR_ID_RE = re.compile(r"\{:?[^}\n]*?#([^\s}]+)")
+_FRONT_TITLE_RE = re.compile(r"^title:[ \t]*(.*?)[ \t]*$")
+
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+[\"'][^)]*)?\)")
+_REF_DEF_RE = re.compile(r"^ {0,3}\[(?!\^)[^\]]+\]:[ \t]*<?([^\s>]+)")
+_AUTOLINK_RE = re.compile(r"<((?:https?|ftp|mailto):[^>\s]+)>")
+
+# marcação inline removida do título antes do slug (como o toc, que usa o texto)
+_CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1")
+_INLINE_STRIP = (
+    (re.compile(r"\[\^[^\]]*\]"), ""),
+    (re.compile(r"!\[[^\]]*\]\([^)]*\)"), ""),
+    (re.compile(r"\[([^\]]*)\](?:\([^)]*\)|\[[^\]]*\])"), r"\1"),
+    (re.compile(r"<[^>]+>"), ""),
+    (re.compile(r"\*+|(?<!\w)_+|_+(?!\w)"), ""),
+    (re.compile(r"\\(.)"), r"\1"),
+)
+_IDCOUNT_RE = re.compile(r"^(.*)_([0-9]+)$")
+
+
+@dataclass(frozen=True)
+class Heading:
+    line: int
+    level: int
+    title: str
+    slug: str
+
+
+@dataclass(frozen=True)
+class Link:
+    line: int
+    text: str
+    target: str
+
+
+class Outline:
+    """
+    Estrutura do documento (títulos com slug igual ao do `toc`, título do
+    front matter, blocos de código cercados e links), mantida por linha e
+    atualizada só no trecho editado: `replace_lines` reclassifica as linhas
+    novas e segue adiante enquanto o estado de bloco (dentro/fora de ```)
+    divergir do anterior. Os títulos (com os slugs) também são mantidos por
+    trecho; links e blocos cercados são refeitos sob demanda. `version` só
+    muda quando títulos, links, cercas ou o front matter mudam de fato, não
+    quando apenas andam de linha.
+    """
+
+    def __init__(self, text: str = "") -> None:
+        self.version = 0
+        self.set_text(text)
+
+    def set_text(self, text: str) -> None:
+        self._lines: List[str] = text.split("\n")
+        n = len(self._lines)
+        self._kinds: List[str] = [TEXT] * n
+        # cerca aberta ao final de cada linha ("" = fora de bloco)
+        self._fence_after: List[Optional[str]] = [None] * n
+        # (título, links, ids {#id}) das linhas de texto/título
+        self._parsed: List[Optional[tuple]] = [None] * n
+        self._front_end = _front_matter_end(self._lines)
+        self._classify(1, n, [])
+        # títulos em ordem: linha, (nível, título, id explícito, slug base,
+        # família) e o slug final; `_reserved` conta os ids explícitos
+        self._head_lines: List[int] = []
+        self._head_data: List[tuple] = []
+        self._head_slugs: List[str] = []
+        self._reserved: Dict[str, int] = {}
+        self._headings: Optional[List[Heading]] = None
+        self._update_headings(0, 0, 1, n, [])
+        self._touch()
+
+    @property
+    def line_count(self) -> int:
+        return len(self._lines)
+
+    def kind(self, line: int) -> str:
+        return self._kinds[line - 1]
+
+    def text(self, lo: int, hi: int) -> str:
+        """Texto das linhas lo..hi (inclusive)."""
+        return "\n".join(self._lines[lo - 1:hi])
+
+    # ---------- edição ----------
+    def replace_lines(self, start: int, end: int, new_lines: List[str]) -> Tuple[int, int]:
+        """
+        As linhas [start, end] (numeração antiga) viraram `new_lines`.
+        Devolve o intervalo de linhas (numeração nova) cujo tipo pode ter
+        mudado, incluindo o que a propagação de ``` alcançou.
+        """
+        n_new = len(new_lines)
+        delta = n_new - (end - start + 1)
+        removed = list(zip(self._kinds[start - 1:end], self._parsed[start - 1:end]))
+        self._lines[start - 1:end] = new_lines
+        self._kinds[start - 1:end] = [TEXT] * n_new
+        self._fence_after[start - 1:end] = [None] * n_new
+        self._parsed[start - 1:end] = [None] * n_new
+        lo, hi = start, start + n_new - 1
+
+        old_front = self._front_end
+        front = self._front_end = self._front_after_edit(start, end, n_new)
+        # o --- de fechamento no trecho editado também conta como mudança
+        moved = old_front is not None and start <= old_front <= end
+        if old_front is not None and old_front > end:
+            old_front += delta
+        if moved or front != old_front:
+            # tudo que era (ou passou a ser) front matter é reclassificado
+            lo = 1
+            hi = max(hi, front or 0, old_front or 0)
+
+        # `old`: (tipo, parse) que o _classify sobrescreveu, linha a linha;
+        # com o que a edição tirou, é o trecho antigo [lo, stop - delta]
+        old: List[tuple] = []
+        stop = self._classify(lo, hi, old)
+        old[start - lo:start - lo + n_new] = removed
+        new = list(zip(self._kinds[lo - 1:stop], self._parsed[lo - 1:stop]))
+
+        self._update_headings(lo, stop - delta, lo, stop, old)
+        in_front = front is not None and start <= front
+        if moved or in_front or front != old_front or _structure(old) != _structure(new):
+            self._touch()
+        else:
+            # no máximo andaram de linha: as listas são refeitas, a versão fica
+            self._links = self._fences = None
+        return lo, stop
+
+    def _front_after_edit(self, start: int, end: int, n_new: int) -> Optional[int]:
+        # só relê a partir da 1ª linha se a edição tocou o front matter: um
+        # "---" aberto sem fechamento não custa o documento inteiro por tecla
+        lines, front = self._lines, self._front_end
+        old_count = len(lines) - n_new + (end - start + 1)
+        if start == 1 or min(len(lines), old_count) < 3:
+            return _front_matter_end(lines)
+        if front is not None:
+            return front if start > front else _front_matter_end(lines)
+        if lines[0].strip() != "---":
+            return None
+        # aberto: fora do trecho editado não havia nenhum --- de fechamento
+        for i in range(start - 1, start - 1 + n_new):
+            if lines[i].strip() == "---":
+                return i + 1
+        return None
+
+    def _classify(self, lo: int, hi: int, old: List[tuple]) -> int:
+        lines, kinds, after, parsed = self._lines, self._kinds, self._fence_after, self._parsed
+        front = self._front_end or 0
+        fence = (after[lo - 2] or "") if lo > 1 else ""
+        total = len(lines)
+        n = lo
+        while n <= total:
+            i = n - 1
+            line = lines[i]
+            old.append((kinds[i], parsed[i]))
+            if n <= front:
+                kind, fence = FRONT_MATTER, ""
+            elif fence:
+                if line.startswith(fence) and not line[len(fence):].strip(" "):
+                    kind, fence = FENCE, ""
+                else:
+                    kind = CODE
+            else:
+                m = _FENCE_OPEN_RE.match(line)
+                if m:
+                    kind, fence = FENCE, m.group(1)
+                else:
+                    heading = _parse_heading(line)
+                    kind = HEADING if heading else TEXT
+                    ids = tuple(_ATTR_ID_RE.findall(line)) if "{" in line else ()
+                    parsed[i] = (heading, _parse_links(line), ids)
+            if kind not in (TEXT, HEADING):
+                parsed[i] = None
+            kinds[i] = kind
+            changed = after[i] != fence
+            after[i] = fence
+            if n >= hi and not changed:
+                return n
+            n += 1
+        return total
+
+    def _update_headings(self, old_lo: int, old_hi: int, lo: int, hi: int, old: List[tuple]) -> None:
+        # troca os títulos de [old_lo, old_hi] (numeração antiga) pelos de
+        # [lo, hi] e refaz os slugs só das famílias (base sem _N) afetadas
+        lines, data, slugs = self._head_lines, self._head_data, self._head_slugs
+        i0 = bisect_left(lines, old_lo)
+        i1 = bisect_right(lines, old_hi)
+        delta = hi - old_hi
+        new_lines, new_data = [], []
+        added_ids: List[str] = []
+        for n in range(lo, hi + 1):
+            entry = self._parsed[n - 1]
+            if entry is None:
+                continue
+            heading, _links, ids = entry
+            added_ids += ids
+            if heading is not None:
+                level, title, explicit = heading
+                base = None if explicit else slugify(title)
+                new_lines.append(n)
+                new_data.append((level, title, explicit, base, None if explicit else _family(base)))
+        removed_ids = [i for _kind, entry in old if entry is not None for i in entry[2]]
+        removed_data = data[i0:i1]
+        shifted = delta and i1 < len(lines)
+
+        if delta:
+            lines[i1:] = [n + delta for n in lines[i1:]]
+        lines[i0:i1] = new_lines
+        data[i0:i1] = new_data
+        slugs[i0:i1] = [d[2] for d in new_data]
+
+        families = {d[4] for d in removed_data + new_data if d[4] is not None}
+        reserved = self._reserved
+        for i in removed_ids:
+            reserved[i] -= 1
+            if not reserved[i]:
+                del reserved[i]
+        for i in added_ids:
+            reserved[i] = reserved.get(i, 0) + 1
+        families.update(_family(i) for i in removed_ids + added_ids)
+        renamed = []
+        if families:
+            used = {i for i in reserved if _family(i) in families}
+            for k, d in enumerate(data):
+                if d[4] in families:
+                    slug = unique_slug(d[3], used)
+                    if slug != slugs[k]:
+                        slugs[k] = slug
+                        renamed.append(k)
+
+        # a lista pública: com linhas deslocadas é refeita na próxima leitura;
+        # senão troca só os itens que mudaram
+        if shifted:
+            self._headings = None
+        elif self._headings is not None and (removed_data or new_data or renamed):
+            # cópia: quem leu a lista antes continua com a versão antiga
+            headings = self._headings[:i0] + [None] * len(new_data) + self._headings[i1:]
+            for k in set(range(i0, i0 + len(new_data))).union(renamed):
+                headings[k] = Heading(lines[k], data[k][0], data[k][1], slugs[k])
+            self._headings = headings
+
+    def _touch(self) -> None:
+        self.version += 1
+        self._links: Optional[List[Link]] = None
+        self._fences: Optional[List[Tuple[int, int]]] = None
+
+    # ---------- consultas ----------
+    @property
+    def front_matter(self) -> Optional[Tuple[int, int]]:
+        """Linhas do front matter (com os ---), se houver."""
+        return (1, self._front_end) if self._front_end is not None else None
+
+    @property
+    def title(self) -> Optional[str]:
+        """`title:` do front matter (só chaves de topo, sem interpretar o YAML)."""
+        if self._front_end is None:
+            return None
+        for line in self._lines[1:self._front_end - 1]:
+            m = _FRONT_TITLE_RE.match(line)
+            if m:
+                value = m.group(1)
+                if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+                    value = value[1:-1]
+                return value or None
+        return None
+
+    @property
+    def headings(self) -> List[Heading]:
+        if self._headings is None:
+            self._headings = [
+                Heading(line, d[0], d[1], slug)
+                for line, d, slug in zip(self._head_lines, self._head_data, self._head_slugs)
+            ]
+        return self._headings
+
+    @property
+    def fences(self) -> List[Tuple[int, int]]:
+        """Blocos cercados como (linha de abertura, linha de fechamento/última linha)."""
+        if self._fences is None:
+            result = []
+            open_line = None
+            for i, kind in enumerate(self._kinds):
+                if kind != FENCE:
+                    continue
+                if open_line is None:
+                    open_line = i + 1
+                else:
+                    result.append((open_line, i + 1))
+                    open_line = None
+            if open_line is not None:
+                result.append((open_line, len(self._lines)))
+            self._fences = result
+        return self._fences
+
+    @property
+    def links(self) -> List[Link]:
+        if self._links is None:
+            self._links = [
+                Link(i + 1, text, target)
+                for i, entry in enumerate(self._parsed)
+                if entry is not None
+                for text, target in entry[1]
+            ]
+        return self._links
+
+    def heading_at(self, line: int) -> Optional[Heading]:
+        """Título da seção que contém `line`."""
+        current = None
+        for heading in self.headings:
+            if heading.line > line:
+                break
+            current = heading
+        return current
+
+    def toc_tokens(self) -> List[Dict[str, Any]]:
+        """Árvore de títulos no formato de `md.toc_tokens` (level, id, name, children)."""
+        root: List[Dict[str, Any]] = []
+        stack: List[Dict[str, Any]] = []
+        for heading in self.headings:
+            token = {"level": heading.level, "id": heading.slug, "name": heading.title, "children": []}
+            while stack and stack[-1]["level"] >= heading.level:
+                stack.pop()
+            (stack[-1]["children"] if stack else root).append(token)
+            stack.append(token)
+        return root
+
+
+def slugify(value: str, separator: str = "-") -> str:
+    """O mesmo `slugify` da extensão toc do Python-Markdown."""
+    value = unicodedata.normalize("NFKD", value)
+    value = value.encode("ascii", "ignore").decode("ascii")
+    value = re.sub(r"[^\w\s-]", "", value).strip().lower()
+    return re.sub(r"[{}\s]+".format(separator), separator, value)
+
+
+def unique_slug(slug: str, used: Set[str]) -> str:
+    """Como o `unique` do toc: acrescenta _1, _2... e registra em `used`."""
+    while slug in used or not slug:
+        m = _IDCOUNT_RE.match(slug)
+        if m:
+            slug = f"{m.group(1)}_{int(m.group(2)) + 1}"
+        else:
+            slug = f"{slug}_1"
+    used.add(slug)
+    return slug
+
+
+def _family(slug: str) -> str:
+    # unique_slug só gera slugs da mesma família (base sem o _N final), então
+    # duplicatas e ids reservados só se afetam dentro dela
+    m = _IDCOUNT_RE.match(slug)
+    return m.group(1) if m else slug
+
+
+def _structure(entries: List[tuple]) -> list:
+    # o que importa para versão: cercas, títulos, links e ids, na ordem
+    out = []
+    for kind, entry in entries:
+        if kind == FENCE:
+            out.append(FENCE)
+        elif entry is not None and (entry[0] or entry[1] or entry[2]):
+            out.append(entry)
+    return out
+
+
+def _front_matter_end(lines: List[str]) -> Optional[int]:
+    # mesma regra de parse_front_matter: --- na 1ª linha até o próximo ---
+    if len(lines) < 3 or lines[0].strip() != "---":
+        return None
+    for i in range(1, len(lines)):
+        if lines[i].strip() == "---":
+            return i + 1
+    return None
+
+
+def _parse_heading(line: str) -> Optional[Tuple[int, str, Optional[str]]]:
+    if not line.startswith("#"):
+        return None
+    m = _HEADING_RE.match(line)
+    if m is None:
+        return None
+    raw = m.group(2)
+    explicit = None
+    attrs = _HEADING_ATTR_RE.search(raw)
+    if attrs is not None:
+        raw = raw[:attrs.start()]
+        ids = re.findall(r"#([^\s}]+)", attrs.group(1))
+        explicit = ids[-1] if ids else None
+    return len(m.group(1)), _plain_text(raw.strip()), explicit
+
+
+def _plain_text(text: str) -> str:
+    parts = []
+    pos = 0
+    for m in _CODE_SPAN_RE.finditer(text):
+        parts.append(_strip_inline(text[pos:m.start()]))
+        parts.append(m.group(2).strip())
+        pos = m.end()
+    parts.append(_strip_inline(text[pos:]))
+    return html.unescape("".join(parts)).strip()
+
+
+def _strip_inline(text: str) -> str:
+    for regex, repl in _INLINE_STRIP:
+        text = regex.sub(repl, text)
+    return text
+
+
+def _parse_links(line: str) -> tuple:
+    if "[" not in line and "<" not in line:
+        return ()
+    links = [(m.group(1), m.group(2)) for m in _LINK_RE.finditer(line)]
+    m = _REF_DEF_RE.match(line)
+    if m:
+        links.append(("", m.group(1)))
+    links += [(m.group(1), m.group(1)) for m in _AUTOLINK_RE.finditer(line)]
+    return tuple(links)
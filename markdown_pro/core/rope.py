@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import random
+from typing import Iterator, List, Optional, Tuple
+
+
+# tamanho máximo do trecho guardado em cada nó
+CHUNK_SIZE = 1024
+
+_rand = random.Random(0x6D64)
+
+
+class _Node:
+    # nós são imutáveis depois de publicados: edições copiam só o caminho
+    # da raiz até o ponto editado (snapshots antigos continuam válidos)
+    __slots__ = ("text", "nl", "left", "right", "prio", "size", "lines")
+
+    def __init__(self, text: str, nl: int, left: Optional[_Node], right: Optional[_Node], prio: float) -> None:
+        self.text = text
+        self.nl = nl
+        self.left = left
+        self.right = right
+        self.prio = prio
+        self.size = len(text)
+        self.lines = nl
+        if left is not None:
+            self.size += left.size
+            self.lines += left.lines
+        if right is not None:
+            self.size += right.size
+            self.lines += right.lines
+
+
+def _with(node: _Node, left: Optional[_Node], right: Optional[_Node]) -> _Node:
+    return _Node(node.text, node.nl, left, right, node.prio)
+
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        return _with(a, a.left, _merge(a.right, b))
+    return _with(b, _merge(a, b.left), b.right)
+
+
+def _split(t: Optional[_Node], pos: int) -> Tuple[Optional[_Node], Optional[_Node]]:
+    if t is None:
+        return None, None
+    left_size = t.left.size if t.left is not None else 0
+    if pos <= left_size:
+        a, b = _split(t.left, pos)
+        return a, _with(t, b, t.right)
+    end = left_size + len(t.text)
+    if pos >= end:
+        a, b = _split(t.right, pos - end)
+        return _with(t, t.left, a), b
+    # corta o trecho do próprio nó; as duas metades herdam a prioridade
+    k = pos - left_size
+    head, tail = t.text[:k], t.text[k:]
+    nl = head.count("\n")
+    return _Node(head, nl, t.left, None, t.prio), _Node(tail, t.nl - nl, None, t.right, t.prio)
+
+
+def _append_small(t: Optional[_Node], s: str) -> Optional[_Node]:
+    """Junta `s` ao último trecho de `t` se couber (digitação não vira um nó por tecla)."""
+    if t is None:
+        return None
+    if t.right is not None:
+        right = _append_small(t.right, s)
+        return None if right is None else _with(t, t.left, right)
+    if len(t.text) + len(s) > CHUNK_SIZE:
+        return None
+    return _Node(t.text + s, t.nl + s.count("\n"), t.left, None, t.prio)
+
+
+def _build(text: str) -> Optional[_Node]:
+    # árvore cartesiana a partir de prioridades aleatórias, em O(n) com pilha
+    if not text:
+        return None
+    stack: List[_Node] = []
+    for i in range(0, len(text), CHUNK_SIZE):
+        chunk = text[i:i + CHUNK_SIZE]
+        node = _Node(chunk, chunk.count("\n"), None, None, _rand.random())
+        last = None
+        while stack and stack[-1].prio < node.prio:
+            last = stack.pop()
+        node.left = last
+        if stack:
+            stack[-1].right = node
+        stack.append(node)
+    root = stack[0]
+    _fix_sizes(root)
+    return root
+
+
+def _fix_sizes(node: Optional[_Node]) -> None:
+    # só durante o _build, antes de a árvore ser publicada
+    if node is None:
+        return
+    _fix_sizes(node.left)
+    _fix_sizes(node.right)
+    node.size = len(node.text)
+    node.lines = node.nl
+    for child in (node.left, node.right):
+        if child is not None:
+            node.size += child.size
+            node.lines += child.lines
+
+
+class Rope:
+    """
+    Texto imutável em árvore (treap implícito de trechos de até CHUNK_SIZE
+    caracteres). Inserir/remover custa O(log n) e devolve um novo Rope que
+    compartilha quase tudo com o anterior, então guardar uma versão para
+    uma thread de trabalho é de graça. Mantém a contagem de quebras de linha
+    em cada subárvore para converter offset <-> "linha.coluna".
+    """
+
+    __slots__ = ("_root", "_text")
+
+    def __init__(self, text: str = "") -> None:
+        self._root = _build(text)
+        self._text: Optional[str] = text
+
+    @classmethod
+    def _from_root(cls, root: Optional[_Node]) -> Rope:
+        rope = cls.__new__(cls)
+        rope._root = root
+        rope._text = None
+        return rope
+
+    def __len__(self) -> int:
+        return self._root.size if self._root is not None else 0
+
+    def __str__(self) -> str:
+        return self.text()
+
+    @property
+    def line_count(self) -> int:
+        return (self._root.lines if self._root is not None else 0) + 1
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "".join(self.chunks())
+        return self._text
+
+    def chunks(self) -> Iterator[str]:
+        """Trechos em ordem (para gravar/processar sem montar a string inteira)."""
+        if self._text is not None:
+            if self._text:
+                yield self._text
+            return
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.text
+            node = node.right
+
+    def slice(self, start: int, end: int) -> str:
+        start, end = self._clamp(start), self._clamp(end)
+        if self._text is not None:
+            return self._text[start:end]
+        parts: List[str] = []
+        _collect(self._root, start, end, 0, parts)
+        return "".join(parts)
+
+    # ---------- edição ----------
+    def insert(self, pos: int, text: str) -> Rope:
+        return self.replace(pos, pos, text)
+
+    def delete(self, start: int, end: int) -> Rope:
+        return self.replace(start, end, "")
+
+    def replace(self, start: int, end: int, text: str) -> Rope:
+        start = self._clamp(start)
+        end = max(start, self._clamp(end))
+        head, rest = _split(self._root, start)
+        _, tail = _split(rest, end - start)
+        if text:
+            joined = _append_small(head, text) if len(text) < CHUNK_SIZE else None
+            head = joined if joined is not None else _merge(head, _build(text))
+        return Rope._from_root(_merge(head, tail))
+
+    # ---------- linhas ----------
+    def line_start(self, line: int) -> int:
+        """Offset do início da linha `line` (1 = primeira); além do fim, len(self)."""
+        if line <= 1:
+            return 0
+        if line > self.line_count:
+            return len(self)
+        # posição logo depois da (line-1)-ésima quebra de linha
+        k = line - 1
+        node = self._root
+        base = 0
+        while node is not None:
+            left_lines = node.left.lines if node.left is not None else 0
+            left_size = node.left.size if node.left is not None else 0
+            if k <= left_lines:
+                node = node.left
+                continue
+            k -= left_lines
+            base += left_size
+            if k <= node.nl:
+                pos = -1
+                for _ in range(k):
+                    pos = node.text.index("\n", pos + 1)
+                return base + pos + 1
+            k -= node.nl
+            base += len(node.text)
+            node = node.right
+        return len(self)
+
+    def line_of(self, offset: int) -> int:
+        """Linha (1 = primeira) que contém `offset`."""
+        offset = self._clamp(offset)
+        line = 1
+        node = self._root
+        while node is not None:
+            left_size = node.left.size if node.left is not None else 0
+            if offset < left_size:
+                node = node.left
+                continue
+            if node.left is not None:
+                line += node.left.lines
+            offset -= left_size
+            if offset <= len(node.text):
+                return line + node.text.count("\n", 0, offset)
+            line += node.nl
+            offset -= len(node.text)
+            node = node.right
+        return line
+
+    def offset(self, line: int, col: int = 0) -> int:
+        """Offset de um índice "linha.coluna"; a coluna é limitada ao fim da linha, como no Tk."""
+        start = self.line_start(line)
+        if line > self.line_count:
+            return start
+        end = self.line_start(line + 1) - 1 if line < self.line_count else len(self)
+        return min(start + col, end)
+
+    def index(self, offset: int) -> str:
+        offset = self._clamp(offset)
+        line = self.line_of(offset)
+        return f"{line}.{offset - self.line_start(line)}"
+
+    def _clamp(self, pos: int) -> int:
+        return max(0, min(pos, len(self)))
+
+
+def _collect(node: Optional[_Node], start: int, end: int, base: int, out: List[str]) -> None:
+    while node is not None and start < end:
+        left_size = node.left.size if node.left is not None else 0
+        if start < base + left_size:
+            _collect(node.left, start, end, base, out)
+        mid = base + left_size
+        mid_end = mid + len(node.text)
+        if start < mid_end and end > mid:
+            out.append(node.text[max(0, start - mid):end - mid])
+        if end <= mid_end:
+            return
+        base = mid_end
+        node = node.right
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from markdown_pro.utils import trace
+
+
+class SearchError(ValueError):
+    """Padrão de busca inválido (ex.: expressão regular malformada)."""
+
+
+@dataclass(frozen=True)
+class SearchOptions:
+    pattern: str
+    regex: bool = False
+    case_sensitive: bool = False
+    whole_word: bool = False
+
+    def compile(self) -> re.Pattern:
+        source = self.pattern if self.regex else re.escape(self.pattern)
+        if self.whole_word:
+            source = rf"\b(?:{source})\b"
+        flags = re.MULTILINE
+        if not self.case_sensitive:
+            flags |= re.IGNORECASE
+        try:
+            return re.compile(source, flags)
+        except re.error as ex:
+            raise SearchError(str(ex)) from ex
+
+
+class SearchResult:
+    """
+    Todas as ocorrências de um padrão num snapshot do texto, calculadas de
+    uma vez. Offsets são posições de caractere no snapshot; `revision`
+    identifica a versão do buffer a que eles se referem.
+    """
+
+    def __init__(self, text: str, options: SearchOptions, revision: int = 0) -> None:
+        self.text = text
+        self.options = options
+        self.revision = revision
+        pattern = options.compile()
+        with trace.span("search", chars=len(text), regex=options.regex) as span:
+            # ocorrências vazias (ex.: "^" ou "a*") não contam, como no Tk
+            self._matches: List[re.Match] = [m for m in pattern.finditer(text) if m.end() > m.start()]
+            span.set(matches=len(self._matches))
+        self.starts: List[int] = [m.start() for m in self._matches]
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def span(self, i: int) -> Tuple[int, int]:
+        return self._matches[i].span()
+
+    def spans(self) -> List[Tuple[int, int]]:
+        return [m.span() for m in self._matches]
+
+    def next_from(self, offset: int) -> Optional[int]:
+        """Índice da primeira ocorrência que começa em `offset` ou depois (com volta ao início)."""
+        if not self._matches:
+            return None
+        i = bisect_left(self.starts, offset)
+        return i if i < len(self._matches) else 0
+
+    def prev_from(self, offset: int) -> Optional[int]:
+        """Índice da última ocorrência que começa antes de `offset` (com volta ao fim)."""
+        if not self._matches:
+            return None
+        i = bisect_left(self.starts, offset) - 1
+        return i if i >= 0 else len(self._matches) - 1
+
+    def expand(self, i: int, replacement: str) -> str:
+        # no modo regex o texto de substituição aceita \1, \g<nome>...
+        if self.options.regex:
+            try:
+                return self._matches[i].expand(replacement)
+            except (re.error, IndexError) as ex:
+                raise SearchError(str(ex)) from ex
+        return replacement
+
+    def replace_all(self, replacement: str) -> Optional[Tuple[int, int, str]]:
+        """
+        Substitui todas as ocorrências de uma vez. Devolve (início, fim, texto)
+        do trecho entre a primeira e a última ocorrência já substituído, para
+        ser aplicado como uma única edição; None se não há ocorrências.
+        """
+        if not self._matches:
+            return None
+        text = self.text
+        parts: List[str] = []
+        pos = self._matches[0].start()
+        for i, m in enumerate(self._matches):
+            parts.append(text[pos:m.start()])
+            parts.append(self.expand(i, replacement))
+            pos = m.end()
+        return self._matches[0].start(), pos, "".join(parts)
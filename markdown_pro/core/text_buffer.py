@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional
+
+from markdown_pro.core.rope import Rope
+
+
+# quantas edições o log guarda (workers atrasados além disso refazem do zero)
+MAX_LOG = 2000
+
+
+@dataclass(frozen=True)
+class BufferEdit:
+    """Edição em offsets: [start, end) da versão anterior virou `text`."""
+
+    revision: int
+    start: int
+    end: int
+    text: str
+
+
+class TextBuffer:
+    """
+    Buffer de um documento fora da GUI: um Rope (versões imutáveis, então
+    `snapshot()` é só uma referência) + revisão + log das últimas edições.
+    """
+
+    def __init__(self, text: str = "") -> None:
+        self._rope = Rope(text)
+        self.revision = 0
+        self._log: Deque[BufferEdit] = deque(maxlen=MAX_LOG)
+
+    @classmethod
+    def restore(cls, base: str, base_revision: int, edits: List[BufferEdit]) -> "TextBuffer":
+        """Refaz um buffer a partir de uma base e das edições seguintes (revisões e log preservados)."""
+        buffer = cls(base)
+        buffer.revision = base_revision
+        for edit in edits:
+            buffer._rope = buffer._rope.replace(edit.start, edit.end, edit.text)
+            buffer.revision = edit.revision
+            buffer._log.append(edit)
+        return buffer
+
+    def __len__(self) -> int:
+        return len(self._rope)
+
+    @property
+    def line_count(self) -> int:
+        return self._rope.line_count
+
+    def text(self) -> str:
+        return self._rope.text()
+
+    def snapshot(self) -> Rope:
+        return self._rope
+
+    def replace(self, start: int, end: int, text: str) -> BufferEdit:
+        self._rope = self._rope.replace(start, end, text)
+        self.revision += 1
+        edit = BufferEdit(self.revision, start, end, text)
+        self._log.append(edit)
+        return edit
+
+    def insert(self, pos: int, text: str) -> BufferEdit:
+        return self.replace(pos, pos, text)
+
+    def delete(self, start: int, end: int) -> BufferEdit:
+        return self.replace(start, end, "")
+
+    def replace_index(self, start: str, end: str, text: str) -> BufferEdit:
+        """Como `replace`, com índices "linha.coluna" do Tk."""
+        return self.replace(self.offset(start), self.offset(end), text)
+
+    def set_text(self, text: str) -> None:
+        # troca o conteúdo inteiro: quem acompanha o log precisa recomeçar
+        self._rope = Rope(text)
+        self.revision += 1
+        self._log.clear()
+
+    def extend(self, text: str) -> None:
+        """Acrescenta ao fim sem registrar no log (carga de arquivo, não edição)."""
+        end = len(self._rope)
+        self._rope = self._rope.replace(end, end, text)
+        self.revision += 1
+        self._log.clear()
+
+    def edits_since(self, revision: int) -> Optional[List[BufferEdit]]:
+        """Edições depois de `revision`, em ordem; None se o log não cobre mais esse ponto."""
+        if revision == self.revision:
+            return []
+        if not self._log or self._log[0].revision > revision + 1:
+            return None
+        return [e for e in self._log if e.revision > revision]
+
+    # ---------- índices ----------
+    def offset(self, index: str) -> int:
+        line, col = index.split(".")
+        return self._rope.offset(int(line), int(col))
+
+    def index(self, offset: int) -> str:
+        return self._rope.index(offset)
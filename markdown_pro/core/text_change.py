@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class TextChange:
+    """
+    Uma edição no buffer: o trecho [start, end) (índices "linha.coluna"
+    anteriores à edição) foi substituído por `inserted` caracteres.
+    `text` é o texto inserido; None quando a edição não pôde ser descrita
+    como uma faixa (quem espelha o buffer deve reler o conteúdo inteiro).
+    """
+
+    start: str
+    end: str
+    inserted: int
+    revision: int
+    text: Optional[str] = None
+
+    @property
+    def start_line(self) -> int:
+        return int(self.start.split(".")[0])
+
+    @property
+    def end_line(self) -> int:
+        return int(self.end.split(".")[0])
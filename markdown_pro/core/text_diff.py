@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import List, Tuple
+
+
+# (início, fim, texto novo) em índices "linha.coluna" da versão antiga
+LineEdit = Tuple[str, str, str]
+
+
+def line_edits(old: str, new: str) -> List[LineEdit]:
+    """
+    Diferença mínima por linhas entre `old` e `new`, como edições de faixa
+    em ordem decrescente (aplicar na ordem dada mantém os índices válidos).
+    Prefixo e sufixo comuns são descartados antes do difflib, então o caso
+    comum (um trecho mudou, ou algo foi acrescentado no fim) é linear.
+    """
+    if old == new:
+        return []
+    a = _lines(old)
+    b = _lines(new)
+
+    lo = 0
+    limit = min(len(a), len(b))
+    while lo < limit and a[lo] == b[lo]:
+        lo += 1
+    hi_a, hi_b = len(a), len(b)
+    while hi_a > lo and hi_b > lo and a[hi_a - 1] == b[hi_b - 1]:
+        hi_a -= 1
+        hi_b -= 1
+
+    edits: List[LineEdit] = []
+    matcher = SequenceMatcher(None, a[lo:hi_a], b[lo:hi_b], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        edits.append((f"{lo + i1 + 1}.0", f"{lo + i2 + 1}.0", "".join(b[lo + j1:lo + j2])))
+    edits.reverse()
+    return edits
+
+
+def _lines(text: str) -> List[str]:
+    # só "\n" quebra linha no Tk (splitlines também quebraria em \r, \f...)
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from markdown_pro.utils.paths import index_dir
+
+
+INDEX_PATTERNS = ("*.md", "*.markdown")
+MAX_RESULTS = 200
+
+_TOKEN_RE = re.compile(r"\w{2,}")
+# arquivos por tarefa enviada ao pool (menos pickling/IPC por arquivo)
+_POOL_CHUNK = 16
+_COMMIT_EVERY = 256
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token TEXT NOT NULL,
+    file_id INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    PRIMARY KEY (token, file_id, line)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_file ON postings(file_id);
+"""
+
+
+@dataclass
+class SearchHit:
+    path: Path
+    line: int
+    text: str
+
+
+@dataclass
+class IndexStats:
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+
+class WorkspaceIndex:
+    """
+    Índice invertido (token -> arquivo, linha) dos Markdown de uma pasta,
+    em SQLite sob ~/.markdown-pro/index. `update()` só reprocessa arquivos
+    cujo mtime/tamanho mudou (e, desses, só reescreve os que mudaram de
+    hash), tokenizando num pool de processos. `search()` cruza os tokens da
+    consulta (o último vale como prefixo) e devolve as linhas que têm todos.
+    """
+
+    def __init__(self, root: Path, db_path: Optional[Path] = None, workers: Optional[int] = None) -> None:
+        self.root = root.resolve()
+        key = hashlib.blake2b(str(self.root).encode("utf-8"), digest_size=8).hexdigest()
+        self.db_path = db_path or index_dir() / f"{key}.sqlite"
+        self.workers = workers or os.cpu_count() or 1
+
+    def _connect(self) -> sqlite3.Connection:
+        # uma conexão por chamada: update() roda numa thread, search() em outra
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    # ---------- indexação ----------
+    def update(self, progress: Optional[Callable[[int, int], None]] = None) -> IndexStats:
+        start = time.perf_counter()
+        stats = IndexStats()
+        conn = self._connect()
+        try:
+            known: Dict[str, Tuple[int, int, int, str]] = {
+                path: (file_id, mtime, size, digest)
+                for file_id, path, mtime, size, digest in conn.execute(
+                    "SELECT id, path, mtime_ns, size, digest FROM files"
+                )
+            }
+            todo: List[Tuple[str, Optional[str]]] = []
+            seen = set()
+            for path in _iter_markdown(self.root):
+                key = str(path)
+                seen.add(key)
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entry = known.get(key)
+                if entry is not None and entry[1:3] == (st.st_mtime_ns, st.st_size):
+                    stats.unchanged += 1
+                    continue
+                todo.append((key, entry[3] if entry else None))
+
+            gone = [known[p][0] for p in known if p not in seen]
+            with conn:
+                for file_id in gone:
+                    _delete_file(conn, file_id)
+            stats.removed = len(gone)
+
+            # uma transação a cada _COMMIT_EVERY arquivos: commit por arquivo
+            # custaria um fsync cada
+            done = 0
+            for result in self._tokenize_all(todo):
+                done += 1
+                path, mtime, size, digest, postings = result
+                if postings is None:
+                    # só o mtime mudou (mesmo hash): nada a reindexar
+                    conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", (mtime, size, path)
+                    )
+                    stats.unchanged += 1
+                else:
+                    entry = known.get(path)
+                    if entry is not None:
+                        _delete_file(conn, entry[0])
+                    cur = conn.execute(
+                        "INSERT INTO files(path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+                        (path, mtime, size, digest),
+                    )
+                    file_id = cur.lastrowid
+                    conn.executemany(
+                        "INSERT INTO postings(token, file_id, line) VALUES (?, ?, ?)",
+                        [(token, file_id, line) for token, line in postings],
+                    )
+                    stats.indexed += 1
+                if done % _COMMIT_EVERY == 0:
+                    conn.commit()
+                if progress is not None:
+                    progress(done, len(todo))
+            conn.commit()
+        finally:
+            conn.close()
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def _tokenize_all(self, todo: Sequence[Tuple[str, Optional[str]]]) -> Iterator[tuple]:
+        if not todo:
+            return
+        paths = [p for p, _ in todo]
+        digests = [d for _, d in todo]
+        if len(todo) <= _POOL_CHUNK or self.workers == 1:
+            # poucos arquivos: subir processos custa mais que tokenizar aqui
+            results = map(_tokenize_file, paths, digests)
+        else:
+            # spawn: a GUI indexa a partir de uma thread, e fork de um processo
+            # com Tk e threads rodando não é seguro
+            pool = ProcessPoolExecutor(
+                max_workers=min(self.workers, len(todo) // _POOL_CHUNK + 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            results = _map_then_shutdown(pool, paths, digests)
+        for result in results:
+            if result is not None:
+                yield result
+
+    # ---------- consulta ----------
+    def search(self, query: str, limit: int = MAX_RESULTS) -> List[SearchHit]:
+        tokens = _TOKEN_RE.findall(query.lower())
+        if not tokens:
+            return []
+        # a última palavra ainda pode estar sendo digitada: vale como prefixo
+        prefix = not query[-1:].isspace()
+
+        # a primeira palavra exata guia a varredura (já em ordem de arquivo/linha,
+        # então o LIMIT corta cedo); as outras entram como EXISTS na mesma linha
+        terms = [(t, prefix and i == len(tokens) - 1) for i, t in enumerate(tokens)]
+        terms.sort(key=lambda term: term[1])
+        (first, first_prefix), rest = terms[0], terms[1:]
+        where, params = _token_clause("p", first, first_prefix)
+        for token, is_prefix in rest:
+            clause, extra = _token_clause("q", token, is_prefix)
+            where += (
+                " AND EXISTS (SELECT 1 FROM postings q WHERE "
+                f"{clause} AND q.file_id = p.file_id AND q.line = p.line)"
+            )
+            params += extra
+        sql = (
+            "SELECT DISTINCT f.path, p.line FROM postings p JOIN files f ON f.id = p.file_id "
+            f"WHERE {where} LIMIT ?"
+        )
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        finally:
+            conn.close()
+        rows.sort()
+        return _with_line_text(rows)
+
+
+def _iter_markdown(root: Path) -> Iterator[Path]:
+    for pattern in INDEX_PATTERNS:
+        for path in root.rglob(pattern):
+            # pastas ocultas (.git, .venv...) ficam de fora
+            if not any(part.startswith(".") for part in path.relative_to(root).parts):
+                yield path
+
+
+def _token_clause(alias: str, token: str, is_prefix: bool) -> Tuple[str, list]:
+    if is_prefix:
+        return f"{alias}.token >= ? AND {alias}.token < ?", [token, token + "\U0010ffff"]
+    return f"{alias}.token = ?", [token]
+
+
+def _delete_file(conn: sqlite3.Connection, file_id: int) -> None:
+    conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+    conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+
+def _with_line_text(rows) -> List[SearchHit]:
+    hits: List[SearchHit] = []
+    lines_by_path: Dict[str, List[str]] = {}
+    for path, line in rows:
+        lines = lines_by_path.get(path)
+        if lines is None:
+            try:
+                lines = Path(path).read_text(encoding="utf-8", errors="replace").split("\n")
+            except OSError:
+                lines = []
+            lines_by_path[path] = lines
+        text = lines[line - 1].strip() if line <= len(lines) else ""
+        hits.append(SearchHit(Path(path), line, text))
+    return hits
+
+
+def _map_then_shutdown(pool: ProcessPoolExecutor, paths, digests):
+    with pool:
+        yield from pool.map(_tokenize_file, paths, digests, chunksize=_POOL_CHUNK)
+
+
+# ---------- worker (processo do pool) ----------
+def _tokenize_file(path: str, known_digest: Optional[str]):
+    try:
+        st = os.stat(path)
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    if digest == known_digest:
+        return path, st.st_mtime_ns, st.st_size, digest, None
+    postings = []
+    text = data.decode("utf-8", errors="replace")
+    for number, line in enumerate(text.split("\n"), 1):
+        for token in set(_TOKEN_RE.findall(line.lower())):
+            postings.append((token, number))
+    return path, st.st_mtime_ns, st.st_size, digest, postings
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from markdown_pro.core.markdown_processor import DEFAULT_CSS, MarkdownProcessor
+from markdown_pro.utils.config_store import read_json, write_json
+
+
+FORMATS = ("html", "pdf")
+MANIFEST_NAME = ".markdown-pro-export.json"
+
+
+@dataclass
+class ExportReport:
+    source: str
+    outputs: List[str] = field(default_factory=list)
+    skipped: bool = False
+    seconds: float = 0.0
+    # pico de memória residente do worker durante este arquivo (KiB)
+    peak_rss_kb: int = 0
+    error: Optional[str] = None
+
+
+class BatchExporter:
+    """
+    Converte uma árvore de .md em HTML/PDF com um pool de processos.
+
+    Cada worker mantém seu próprio MarkdownProcessor e uma única instância
+    do WeasyPrint. Arquivos cujo hash do fonte e do CSS não mudaram desde a
+    última execução (manifesto em `out_root`) são pulados.
+    """
+
+    def __init__(
+        self,
+        src_root: Path,
+        out_root: Path,
+        formats: Sequence[str] = FORMATS,
+        css: Optional[str] = None,
+        workers: Optional[int] = None,
+        force: bool = False,
+        code_css_classes: bool = False,
+    ) -> None:
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Formato(s) desconhecido(s): {', '.join(sorted(unknown))}")
+        self.src_root = src_root
+        self.out_root = out_root
+        self.formats = tuple(formats)
+        self.css = css or DEFAULT_CSS
+        self.workers = workers or os.cpu_count() or 1
+        self.force = force
+        self.code_css_classes = code_css_classes
+
+    def run(self) -> List[ExportReport]:
+        return list(self.iter_export())
+
+    def iter_export(self) -> Iterator[ExportReport]:
+        """Exporta e devolve os relatórios à medida que cada arquivo termina."""
+        manifest_path = self.out_root / MANIFEST_NAME
+        manifest = read_json(manifest_path, default={})
+        css_hash = _hash_bytes(
+            (self.css + "|" + ",".join(self.formats) + f"|classes={self.code_css_classes}").encode("utf-8")
+        )
+        if manifest.get("css_hash") != css_hash:
+            # CSS (ou formatos, ou modo do código) mudou: tudo precisa ser refeito
+            manifest = {}
+        files: Dict[str, Any] = manifest.get("files", {})
+
+        todo = []
+        for src in sorted(self.src_root.rglob("*.md")):
+            rel = src.relative_to(self.src_root).as_posix()
+            source_hash = _hash_bytes(src.read_bytes())
+            entry = files.get(rel)
+            if (
+                not self.force
+                and entry
+                and entry.get("source_hash") == source_hash
+                and all((self.out_root / out).exists() for out in entry.get("outputs", []))
+            ):
+                yield ExportReport(source=rel, outputs=entry.get("outputs", []), skipped=True)
+                continue
+            todo.append((src, rel, source_hash))
+
+        # só arquivos vivos ficam no manifesto
+        live = {src.relative_to(self.src_root).as_posix() for src in self.src_root.rglob("*.md")}
+        files = {rel: entry for rel, entry in files.items() if rel in live}
+
+        try:
+            if todo:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(todo)),
+                    initializer=_init_worker,
+                    initargs=(self.css, "pdf" in self.formats, self.code_css_classes),
+                ) as pool:
+                    futures = {
+                        pool.submit(_export_one, str(src), rel, str(self.out_root), self.formats): (rel, h)
+                        for src, rel, h in todo
+                    }
+                    for fut in as_completed(futures):
+                        rel, source_hash = futures[fut]
+                        try:
+                            report = fut.result()
+                        except Exception as ex:
+                            report = ExportReport(source=rel, error=str(ex))
+                        if report.error is None:
+                            files[rel] = {"source_hash": source_hash, "outputs": report.outputs}
+                        else:
+                            files.pop(rel, None)
+                        yield report
+        finally:
+            write_json(manifest_path, {"css_hash": css_hash, "files": files})
+
+
+def summarize(reports: Sequence[ExportReport]) -> Dict[str, Any]:
+    done = [r for r in reports if not r.skipped and r.error is None]
+    return {
+        "exported": len(done),
+        "skipped": sum(1 for r in reports if r.skipped),
+        "failed": sum(1 for r in reports if r.error is not None),
+        "seconds": round(sum(r.seconds for r in done), 3),
+        "peak_rss_kb": max((r.peak_rss_kb for r in done), default=0),
+        "files": [asdict(r) for r in reports],
+    }
+
+
+# ---------- worker (processo do pool) ----------
+_processor: Optional[MarkdownProcessor] = None
+_pdf_writer = None
+
+
+def _init_worker(css: str, with_pdf: bool, code_css_classes: bool = False) -> None:
+    global _processor
+    # o cache de blocos de código realçados vive no worker e vale entre arquivos
+    _processor = MarkdownProcessor(css=css, code_css_classes=code_css_classes)
+    if with_pdf:
+        # falha ao carregar o WeasyPrint vira erro por arquivo, não derruba o pool
+        try:
+            _get_pdf_writer()
+        except Exception:
+            pass
+
+
+def _get_pdf_writer():
+    global _pdf_writer
+    if _pdf_writer is None:
+        from markdown_pro.export.pdf import PdfWriter
+
+        _pdf_writer = PdfWriter()
+    return _pdf_writer
+
+
+def _export_one(src: str, rel: str, out_root: str, formats: Sequence[str]) -> ExportReport:
+    _reset_peak_rss()
+    start = time.perf_counter()
+    src_path = Path(src)
+    report = ExportReport(source=rel)
+    try:
+        text = src_path.read_text(encoding="utf-8")
+        result = _processor.render(text)
+        base = Path(out_root) / Path(rel).with_suffix("")
+        base.parent.mkdir(parents=True, exist_ok=True)
+
+        if "html" in formats:
+            out = base.with_suffix(".html")
+            out.write_text(result.html_full, encoding="utf-8")
+            report.outputs.append(out.relative_to(out_root).as_posix())
+        if "pdf" in formats:
+            out = base.with_suffix(".pdf")
+            # base_url: imagens relativas ao .md de origem
+            _get_pdf_writer().write(result.html_full, out, base_url=str(src_path.parent))
+            report.outputs.append(out.relative_to(out_root).as_posix())
+    except Exception as ex:
+        report.error = f"{type(ex).__name__}: {ex}"
+
+    report.seconds = round(time.perf_counter() - start, 4)
+    report.peak_rss_kb = _peak_rss_kb()
+    return report
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _reset_peak_rss() -> None:
+    # Linux: "5" em clear_refs zera o VmHWM, dando o pico por arquivo
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    except (ImportError, ValueError):
+        return 0
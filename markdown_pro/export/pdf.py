@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Union
+
+
+class PdfWriter:
+    """
+    WeasyPrint importado uma única vez por processo, com a configuração de
+    fontes reaproveitada entre documentos (montá-la é a parte cara).
+    """
+
+    def __init__(self) -> None:
+        # import tardio: WeasyPrint (e pango/cairo) só quando há PDF a gerar
+        from weasyprint import HTML
+        from weasyprint.text.fonts import FontConfiguration
+
+        self._html_cls = HTML
+        self._font_config = FontConfiguration()
+
+    def write(self, html: str, target: Union[str, Path], base_url: Optional[str] = None) -> None:
+        doc = self._html_cls(string=html, base_url=base_url)
+        doc.write_pdf(str(target), font_config=self._font_config)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import tkinter as tk
+import uuid
+from dataclasses import dataclass, field
+from tkinter import ttk
+from typing import Callable, List, Optional, Tuple
+
+from markdown_pro.core.buffer_store import BufferStore
+from markdown_pro.core.document_manager import DocumentManager
+from markdown_pro.core.rope import Rope
+from markdown_pro.core.text_buffer import BufferEdit, TextBuffer
+from markdown_pro.gui.editor_widget import EditorWidget
+from markdown_pro.gui.frame_scheduler import FrameTask
+from markdown_pro.gui.line_numbers import LineNumbers
+from markdown_pro.utils import trace
+
+
+# edições refeitas como passos de undo ao reativar uma aba (as mais antigas
+# entram direto na base)
+UNDO_REPLAY_LIMIT = 500
+
+
+@dataclass(eq=False)
+class DocumentTab:
+    """
+    Um documento aberto: o seu DocumentManager (buffer, journal, gravação) e,
+    enquanto a aba está viva, o editor e a numeração de linhas. Suspensa, o
+    texto fica só no BufferStore (comprimido) e a página do notebook vazia.
+    """
+
+    doc: DocumentManager
+    page: ttk.Frame
+    key: str = field(default_factory=lambda: uuid.uuid4().hex)
+    editor: Optional[EditorWidget] = None
+    linenos: Optional[LineNumbers] = None
+    title_task: Optional[FrameTask] = None
+    # conteúdo e revisão do buffer quando a pilha de undo do Tk foi zerada
+    undo_base: Optional[Rope] = None
+    undo_base_revision: int = 0
+    # mudou no disco enquanto estava suspensa (e sem alterações): relê ao ativar
+    reload_from_disk: bool = False
+
+    @property
+    def live(self) -> bool:
+        return self.editor is not None
+
+    @property
+    def label(self) -> str:
+        state = self.doc.state
+        name = state.path.name if state.path else "Sem título"
+        return f"{name} *" if state.dirty else name
+
+    @property
+    def pristine(self) -> bool:
+        """Documento novo, vazio e intocado: abrir um arquivo reaproveita a aba."""
+        state = self.doc.state
+        return self.live and state.path is None and not state.dirty and len(state.buffer) == 0
+
+    def mark_undo_base(self) -> None:
+        buffer = self.doc.state.buffer
+        self.undo_base = buffer.snapshot()
+        self.undo_base_revision = buffer.revision
+
+    def suspend(self, store: BufferStore) -> None:
+        """Guarda o documento no store e destrói o editor (a aba continua no notebook)."""
+        editor = self.editor
+        state = self.doc.state
+        buffer = state.buffer
+        with trace.span("tab_suspend", chars=len(buffer)) as span:
+            base, base_revision, edits = self._undo_history()
+            meta = {
+                "cursor": editor.index(tk.INSERT),
+                "top": editor.yview()[0],
+                "base_revision": base_revision,
+            }
+            entry = store.put(self.key, base, edits, meta)
+            span.set(bytes=entry.size, edits=len(edits))
+            self.linenos.destroy()
+            # o ScrolledText vive dentro de um frame (com a barra de rolagem)
+            editor.frame.destroy()
+            self.editor = self.linenos = self.title_task = None
+            # o texto fica só no store: o buffer vira um vazio com a mesma
+            # revisão (saved_revision e o journal continuam valendo)
+            placeholder = TextBuffer()
+            placeholder.revision = buffer.revision
+            state.buffer = placeholder
+            self.undo_base = None
+
+    def resume(self, store: BufferStore, create_editor: Callable[["DocumentTab"], None]) -> None:
+        """Recria o editor (via `create_editor`) com texto, cursor, rolagem e undo."""
+        with trace.span("tab_resume") as span:
+            base, edits, meta = store.take(self.key)
+            self.doc.state.buffer = TextBuffer.restore(base, meta["base_revision"], edits)
+            create_editor(self)
+            self.editor.restore_history(base, edits, meta["cursor"], meta["top"])
+            self.undo_base = Rope(base)
+            self.undo_base_revision = meta["base_revision"]
+            span.set(chars=len(self.doc.state.buffer), edits=len(edits))
+
+    def _undo_history(self) -> Tuple[str, int, List[BufferEdit]]:
+        # (base, revisão da base, edições desde a base) para refazer o undo
+        buffer = self.doc.state.buffer
+        edits = buffer.edits_since(self.undo_base_revision) if self.undo_base is not None else None
+        if edits is None:
+            # o log não cobre mais a base: volta sem undo
+            return buffer.text(), buffer.revision, []
+        base, base_revision = self.undo_base, self.undo_base_revision
+        if len(edits) > UNDO_REPLAY_LIMIT:
+            folded, edits = edits[:-UNDO_REPLAY_LIMIT], edits[-UNDO_REPLAY_LIMIT:]
+            for edit in folded:
+                base = base.replace(edit.start, edit.end, edit.text)
+            base_revision = folded[-1].revision
+        return base.text(), base_revision, edits
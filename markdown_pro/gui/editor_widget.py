@@ -1,7 +1,19 @@
 import re
+import time
 import tkinter as tk
 from tkinter import scrolledtext
 
+from markdown_pro.core.outline import Outline
+from markdown_pro.core.rope import Rope
+from markdown_pro.core.text_change import TextChange
+from markdown_pro.gui.frame_scheduler import (
+    PRIORITY_CURSOR,
+    PRIORITY_HIGHLIGHT,
+    PRIORITY_PANELS,
+    FrameScheduler,
+)
+from markdown_pro.gui.highlighter import HIGHLIGHT_TAGS, MarkdownHighlighter
+from markdown_pro.utils import trace
 from markdown_pro.utils.text_ops import wrap, make_link
 
 
@@ -16,10 +28,43 @@ class EditorWidget(scrolledtext.ScrolledText):
         )
 
         self._on_change_callback = None
-        self._highlight_after_id = None
+        self._yscroll_listeners = []
+        # estrutura do documento (títulos, cercas, links), mantida a cada edição
+        # e compartilhada com o realce e o painel de navegação
+        self.outline = Outline()
+        self._outline_listeners = []
+        self._outline_version = self.outline.version
+        self._highlighter = MarkdownHighlighter(self, self.outline)
+        self._pending_edit = None
+        self._notify_changes = True
+        # arquivo grande: sem realce de sintaxe (ver utils/settings.py)
+        self._large_file = False
+
+        # atualizações de tela num único passe ocioso, por prioridade e com
+        # orçamento por quadro; numeração de linhas, busca e janela registram
+        # as suas tarefas aqui também
+        self.scheduler = FrameScheduler(self)
+        self._active_line_task = self.scheduler.add_task(
+            "active_line", lambda _deadline: self._highlight_active_line(), PRIORITY_CURSOR
+        )
+        self._highlight_task = self.scheduler.add_task("highlight", self._highlight_step, PRIORITY_HIGHLIGHT)
+        self._outline_task = self.scheduler.add_task(
+            "outline", lambda _deadline: self._notify_outline(), PRIORITY_PANELS
+        )
+
+        # revisão do buffer: incrementa a cada edição; o texto completo só é
+        # materializado quando alguém pede, e fica em cache por revisão
+        self._revision = 0
+        self._content_cache = ""
+        self._content_revision = 0
 
-        # modified callback
-        self.bind("<<Modified>>", self._on_modified)
+        # intercepta insert/delete/replace no nível do Tcl para saber
+        # exatamente quais linhas mudaram (inclui teclado, colar e undo)
+        self._install_edit_proxy()
+
+        # o ScrolledText liga o yscrollcommand direto na scrollbar; repassamos
+        # também para quem acompanha a área visível (numeração de linhas etc.)
+        self.configure(yscrollcommand=self._on_yscroll)
 
         # indent / tab
         self.bind("<Tab>", self._indent)
@@ -36,32 +81,270 @@ class EditorWidget(scrolledtext.ScrolledText):
 
         # um único handler de KeyRelease (evita override de bind)
         self.bind("<KeyRelease>", self._on_key_release)
-        self.bind("<ButtonRelease-1>", lambda e: self._highlight_active_line())
+        self.bind("<ButtonRelease-1>", lambda e: self._active_line_task.mark_dirty())
+
+        # latência por tecla (só com o trace ligado: desligado, nem o bind existe)
+        self._key_start = None
+        if trace.enabled():
+            self.bind("<KeyPress>", self._on_key_press, add="+")
 
     def set_on_change(self, callback):
         self._on_change_callback = callback
 
+    def add_yscroll_listener(self, callback) -> None:
+        self._yscroll_listeners.append(callback)
+
+    def remove_yscroll_listener(self, callback) -> None:
+        if callback in self._yscroll_listeners:
+            self._yscroll_listeners.remove(callback)
+
+    def add_outline_listener(self, callback) -> None:
+        """`callback(outline)` quando títulos, links, cercas ou front matter mudaram (não a cada tecla)."""
+        self._outline_listeners.append(callback)
+
+    def remove_outline_listener(self, callback) -> None:
+        if callback in self._outline_listeners:
+            self._outline_listeners.remove(callback)
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
     def set_content(self, text: str) -> None:
-        self.delete("1.0", tk.END)
-        self.insert("1.0", text)
+        self.set_large_file(False)
+        # carregar conteúdo não é edição do usuário: sem notificação
+        self._notify_changes = False
+        try:
+            self.delete("1.0", tk.END)
+            self.insert("1.0", text)
+        finally:
+            self._notify_changes = True
         self.edit_reset()
         self.edit_modified(False)
         self._highlight_active_line()
+        self._highlighter.invalidate_all()
+        self._apply_markdown_highlight()
+
+    def restore_history(self, base: str, edits, cursor: str = "1.0", top: float = 0.0) -> None:
+        """
+        Conteúdo de uma aba que estava suspensa: `base` + as edições (BufferEdit,
+        em offsets) refeitas uma a uma, cada uma um passo de undo. O redo não volta.
+        """
+        self.set_large_file(False)
+        self._notify_changes = False
+        try:
+            self.delete("1.0", tk.END)
+            self.insert("1.0", base)
+            self.edit_reset()
+            rope = Rope(base)
+            for edit in edits:
+                self.edit_separator()
+                self.replace(rope.index(edit.start), rope.index(edit.end), edit.text)
+                rope = rope.replace(edit.start, edit.end, edit.text)
+            self.edit_separator()
+        finally:
+            self._notify_changes = True
+        self.edit_modified(False)
+        self.mark_set(tk.INSERT, cursor)
+        self.yview_moveto(top)
+        self._highlight_active_line()
+        self._highlighter.invalidate_all()
         self._apply_markdown_highlight()
 
+    @property
+    def large_file(self) -> bool:
+        return self._large_file
+
+    # ---------- carga em partes (arquivos grandes) ----------
+    def begin_load(self, large_file: bool) -> None:
+        """Esvazia o editor para receber o texto por append_loaded(); fica só leitura até end_load()."""
+        self.set_large_file(large_file)
+        self._notify_changes = False
+        # sem undo durante a carga: a pilha guardaria uma cópia do arquivo
+        self.configure(undo=False, state=tk.NORMAL)
+        self.delete("1.0", tk.END)
+        self.configure(state=tk.DISABLED)
+
+    def append_loaded(self, text: str) -> None:
+        self.configure(state=tk.NORMAL)
+        self.insert("end-1c", text)
+        self.configure(state=tk.DISABLED)
+
+    def end_load(self) -> None:
+        self.configure(state=tk.NORMAL, undo=True)
+        self._notify_changes = True
+        self.edit_reset()
+        self.edit_modified(False)
+        self.mark_set(tk.INSERT, "1.0")
+        self.see("1.0")
+        self._highlight_active_line()
+        if not self._large_file:
+            self._highlighter.invalidate_all()
+            self._apply_markdown_highlight()
+
+    def set_large_file(self, large_file: bool) -> None:
+        if large_file == self._large_file:
+            return
+        self._large_file = large_file
+        # ao sair do modo, quem carrega o novo conteúdo refaz o realce
+        if large_file:
+            for tag in HIGHLIGHT_TAGS:
+                self.tag_remove(tag, "1.0", tk.END)
+            # nem outline: o painel fica vazio
+            self.outline.set_text("")
+            self._notify_outline()
+
     def get_content(self) -> str:
-        return self.get("1.0", tk.END).rstrip("\n")
+        if self._content_revision != self._revision:
+            self._content_cache = self.get("1.0", tk.END).rstrip("\n")
+            self._content_revision = self._revision
+        return self._content_cache
+
+    def replace_range(self, start: str, end: str, text: str) -> None:
+        """Substitui [start, end) numa única edição: um passo de undo, sem pular a rolagem."""
+        self.apply_edits([(start, end, text)])
+
+    def apply_edits(self, edits) -> None:
+        """
+        Aplica edições (início, fim, texto), na ordem dada, como um único passo
+        de undo. Cursor e marcas andam junto com o texto; a rolagem é mantida.
+        """
+        top = self.yview()[0]
+        autoseparators = self.cget("autoseparators")
+        self.configure(autoseparators=False)
+        try:
+            self.edit_separator()
+            for start, end, text in edits:
+                self.replace(start, end, text)
+            self.edit_separator()
+        finally:
+            self.configure(autoseparators=autoseparators)
+        self.yview_moveto(top)
 
     # ---------- events ----------
-    def _on_modified(self, _event=None) -> None:
-        if self.edit_modified():
-            self.edit_modified(False)
-            if self._on_change_callback:
-                self._on_change_callback(self.get_content())
+    def _on_yscroll(self, first: str, last: str) -> None:
+        self.vbar.set(first, last)
+        for callback in self._yscroll_listeners:
+            callback(first, last)
 
     def _on_key_release(self, _event=None) -> None:
-        self._highlight_active_line()
-        self._debounced_highlight()
+        self._active_line_task.mark_dirty()
+
+    def _on_key_press(self, _event=None) -> None:
+        if self._key_start is not None:
+            return
+        self._key_start = time.perf_counter()
+        # dois ciclos ociosos: o segundo roda depois do redesenho que a tecla agendou
+        self.after_idle(lambda: self.after_idle(self._key_done))
+
+    def _key_done(self) -> None:
+        start, self._key_start = self._key_start, None
+        if start is not None:
+            trace.keystroke((time.perf_counter() - start) * 1000.0)
+
+    # ---------- edit proxy ----------
+    def _install_edit_proxy(self) -> None:
+        orig = self._w + "_orig"
+        self.tk.call("rename", self._w, orig)
+        before = self._register(self._before_edit)
+        after = self._register(self._after_edit)
+        # proc em Tcl: erros do comando original propagam normalmente
+        body = (
+            "switch -- [lindex $args 0] {\n"
+            "  insert - delete - replace {\n"
+            f"    {before} {{*}}$args\n"
+            f"    set result [{orig} {{*}}$args]\n"
+            f"    {after}\n"
+            "    return $result\n"
+            "  }\n"
+            "}\n"
+            f"return [{orig} {{*}}$args]\n"
+        )
+        self.tk.call("proc", self._w, "args", body)
+        self._orig_cmd = orig
+        self.bind("<Destroy>", self._on_destroy_proxy, add="+")
+
+    def _on_destroy_proxy(self, event) -> None:
+        if event.widget is self:
+            self.scheduler.cancel()
+            try:
+                self.tk.call("rename", self._w, "")
+            except tk.TclError:
+                pass
+
+    def _resolve(self, index: str) -> tuple:
+        # índices além do fim são ajustados pelo Tk para antes do "\n" final
+        orig = self._orig_cmd
+        if self.tk.call(orig, "compare", index, ">", "end-1c"):
+            index = "end-1c"
+        line, col = str(self.tk.call(orig, "index", index)).split(".")
+        return int(line), int(col)
+
+    def _before_edit(self, op: str, *args) -> None:
+        # chamado a partir do Tcl: nenhuma exceção pode escapar daqui
+        self._pending_edit = None
+        try:
+            if op == "insert":
+                pos = self._resolve(args[0])
+                text = "".join(args[1::2])
+                self._pending_edit = (pos, pos, text)
+            elif op == "delete":
+                if len(args) > 2:
+                    # várias faixas de uma vez: trata como edição total
+                    self._pending_edit = ((1, 0), self._resolve("end-1c"), None)
+                    return
+                start = self._resolve(args[0])
+                end = self._resolve(args[1]) if len(args) > 1 else self._resolve(f"{args[0]}+1c")
+                if end < start:
+                    return
+                self._pending_edit = (start, end, "")
+            elif op == "replace":
+                start = self._resolve(args[0])
+                end = self._resolve(args[1])
+                if end < start:
+                    return
+                self._pending_edit = (start, end, "".join(args[2::2]))
+        except tk.TclError:
+            # índice inválido: o comando original vai reportar o erro
+            self._pending_edit = None
+
+    def _after_edit(self) -> None:
+        edit, self._pending_edit = self._pending_edit, None
+        if edit is None:
+            return
+        # edição do buffer + Outline + callback da janela (o que seria o <<Modified>>)
+        with trace.span("edit"):
+            self._handle_edit(edit)
+
+    def _handle_edit(self, edit) -> None:
+        start, end, text = edit
+        self._revision += 1
+        if text is None:
+            inserted = len(self.get("1.0", "end-1c"))
+        else:
+            inserted = len(text)
+        if not self._large_file:
+            if text is None:
+                self.outline.set_text(self.get("1.0", "end-1c"))
+                self._highlighter.invalidate_all()
+            else:
+                # o Outline relê só as linhas que a edição tocou
+                first, newlines = start[0], text.count("\n")
+                new_lines = self.get(f"{first}.0", f"{first + newlines}.end").split("\n")
+                changed = self.outline.replace_lines(first, end[0], new_lines)
+                self._highlighter.on_edit(first, end[0], newlines, changed)
+            self._highlight_task.mark_dirty()
+
+        if self._notify_changes and self._on_change_callback:
+            self._on_change_callback(
+                TextChange(
+                    start=f"{start[0]}.{start[1]}",
+                    end=f"{end[0]}.{end[1]}",
+                    inserted=inserted,
+                    revision=self._revision,
+                    text=text,
+                )
+            )
 
     # ---------- indentation ----------
     def _indent(self, _event=None):
@@ -143,36 +426,34 @@ class EditorWidget(scrolledtext.ScrolledText):
 
     # ---------- highlights ----------
     def _highlight_active_line(self):
-        self.tag_remove("active_line", "1.0", tk.END)
+        # tira a tag só de onde ela está (a linha anterior), não de 1.0..end
+        ranges = self.tag_ranges("active_line")
+        if ranges:
+            self.tag_remove("active_line", *ranges)
         line = self.index("insert").split(".")[0]
         self.tag_add("active_line", f"{line}.0", f"{line}.end")
 
-    def _debounced_highlight(self):
-        if self._highlight_after_id:
-            self.after_cancel(self._highlight_after_id)
-        self._highlight_after_id = self.after(200, self._apply_markdown_highlight)
-
     def _apply_markdown_highlight(self):
-        for tag in ("md_header", "md_codefence", "md_bold", "md_italic"):
-            self.tag_remove(tag, "1.0", tk.END)
-
-        text = self.get("1.0", tk.END)
-
-        # headers
-        for m in re.finditer(r"(?m)^(#{1,6})\s+(.+)$", text):
-            self.tag_add("md_header", self._index_from_pos(m.start()), self._index_from_pos(m.end()))
-
-        # code fences
-        for m in re.finditer(r"(?m)^```.*$", text):
-            self.tag_add("md_codefence", self._index_from_pos(m.start()), self._index_from_pos(m.end()))
-
-        # bold **text**
-        for m in re.finditer(r"\*\*(.+?)\*\*", text):
-            self.tag_add("md_bold", self._index_from_pos(m.start()), self._index_from_pos(m.end()))
-
-        # italic *text* (bem simples)
-        for m in re.finditer(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)", text):
-            self.tag_add("md_italic", self._index_from_pos(m.start()), self._index_from_pos(m.end()))
-
-    def _index_from_pos(self, pos: int) -> str:
-        return f"1.0+{pos}c"
+        """Todo o realce pendente, agora (ao carregar conteúdo)."""
+        self._highlight_step(None)
+
+    def _highlight_step(self, deadline) -> bool:
+        if self._large_file:
+            return True
+        if self.outline.line_count != int(self.index("end-1c").split(".")[0]):
+            # outline dessincronizado (não deveria acontecer): refaz tudo
+            self.outline.set_text(self.get("1.0", "end-1c"))
+            self._highlighter.invalidate_all()
+        # só as linhas alteradas desde o último passe (e as que o Outline
+        # reclassificou); com prazo, o que sobrar vai para o próximo quadro
+        done = self._highlighter.highlight(deadline)
+        if self.outline.version != self._outline_version:
+            self._outline_task.mark_dirty()
+        return done
+
+    def _notify_outline(self) -> None:
+        if self.outline.version == self._outline_version:
+            return
+        self._outline_version = self.outline.version
+        for callback in list(self._outline_listeners):
+            callback(self.outline)
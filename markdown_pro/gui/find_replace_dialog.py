@@ -1,6 +1,20 @@
 from __future__ import annotations
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
+from typing import Optional
+
+from markdown_pro.core.search import SearchError, SearchOptions, SearchResult
+from markdown_pro.gui.frame_scheduler import PRIORITY_VIEW
+from markdown_pro.utils.line_index import LineIndex
+
+# espera depois de digitar antes de buscar de novo
+SEARCH_DEBOUNCE_MS = 150
+# linhas além da área visível que também recebem o realce das ocorrências
+VIEW_MARGIN_LINES = 100
+# índices por chamada de "tag add"
+_TAG_BATCH = 2000
 
 
 class FindReplaceDialog(tk.Toplevel):
@@ -13,9 +27,35 @@ class FindReplaceDialog(tk.Toplevel):
         self.find_var = tk.StringVar()
         self.replace_var = tk.StringVar()
         self.case_var = tk.BooleanVar(value=False)
+        self.regex_var = tk.BooleanVar(value=False)
+        self.word_var = tk.BooleanVar(value=False)
+        self.count_var = tk.StringVar()
+
+        # busca feita sobre um snapshot do buffer; vale enquanto a revisão
+        # do editor e as opções não mudarem
+        self._result: Optional[SearchResult] = None
+        self._lines: Optional[LineIndex] = None
+        self._lines_revision = -1
+        self._current: Optional[int] = None
+        self._search_after_id = None
+
+        # busca ao digitar: roda numa thread; só o resultado mais novo vale
+        self._generation = 0
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._searching = 0
+        self._poll_id = None
+        # realce das ocorrências visíveis: tarefa no passe ocioso do editor
+        self._view_task = text_widget.scheduler.add_task(
+            "find_view", lambda _deadline: self._refresh_view(), PRIORITY_VIEW
+        )
+
+        text_widget.tag_config("find_all", background="#fff2a8")
+        text_widget.tag_config("find_match", underline=True, background="#ffd54f")
+        text_widget.tag_raise("find_match", "find_all")
 
         self._build()
         self._bind()
+        text_widget.add_yscroll_listener(self._on_view_changed)
 
         self.transient(master)
         self.grab_set()
@@ -30,17 +70,26 @@ class FindReplaceDialog(tk.Toplevel):
         ttk.Label(frm, text="Buscar:").grid(row=0, column=0, sticky="w")
         self.find_entry = ttk.Entry(frm, textvariable=self.find_var, width=40)
         self.find_entry.grid(row=0, column=1, sticky="we")
+        ttk.Label(frm, textvariable=self.count_var, width=14, anchor="e")\
+            .grid(row=0, column=2, sticky="e", padx=(8, 0))
 
         ttk.Label(frm, text="Substituir:").grid(row=1, column=0, sticky="w")
         self.replace_entry = ttk.Entry(frm, textvariable=self.replace_var, width=40)
         self.replace_entry.grid(row=1, column=1, sticky="we")
 
-        ttk.Checkbutton(frm, text="Diferenciar maiúsculas", variable=self.case_var)\
-            .grid(row=2, column=1, sticky="w")
+        opts = ttk.Frame(frm)
+        opts.grid(row=2, column=1, sticky="w")
+        ttk.Checkbutton(opts, text="Diferenciar maiúsculas", variable=self.case_var)\
+            .pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Checkbutton(opts, text="Palavra inteira", variable=self.word_var)\
+            .pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Checkbutton(opts, text="Expressão regular", variable=self.regex_var)\
+            .pack(side=tk.LEFT)
 
         btns = ttk.Frame(frm)
-        btns.grid(row=3, column=0, columnspan=2, sticky="e", pady=(10, 0))
+        btns.grid(row=3, column=0, columnspan=3, sticky="e", pady=(10, 0))
 
+        ttk.Button(btns, text="Anterior", command=self.find_prev).pack(side=tk.LEFT, padx=(0, 8))
         ttk.Button(btns, text="Buscar próximo", command=self.find_next).pack(side=tk.LEFT, padx=(0, 8))
         ttk.Button(btns, text="Substituir", command=self.replace_one).pack(side=tk.LEFT, padx=(0, 8))
         ttk.Button(btns, text="Substituir tudo", command=self.replace_all).pack(side=tk.LEFT, padx=(0, 8))
@@ -51,74 +100,252 @@ class FindReplaceDialog(tk.Toplevel):
     def _bind(self) -> None:
         self.bind("<Escape>", lambda e: self.destroy())
         self.bind("<Return>", lambda e: self.find_next())
+        self.bind("<Shift-Return>", lambda e: self.find_prev())
+        self.bind("<Destroy>", self._on_destroy)
+        for var in (self.find_var, self.case_var, self.regex_var, self.word_var):
+            var.trace_add("write", lambda *_: self._schedule_search())
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is not self:
+            return
+        self._generation += 1
+        for after_id in (self._search_after_id, self._poll_id):
+            if after_id:
+                self.after_cancel(after_id)
+        self._view_task.remove()
+        self.text_widget.remove_yscroll_listener(self._on_view_changed)
+        self.text_widget.tag_remove("find_all", "1.0", tk.END)
+
+    # ---------- busca ----------
+    def _options(self) -> SearchOptions:
+        return SearchOptions(
+            self.find_var.get(),
+            regex=self.regex_var.get(),
+            case_sensitive=self.case_var.get(),
+            whole_word=self.word_var.get(),
+        )
+
+    def _search(self, quiet: bool = False) -> Optional[SearchResult]:
+        options = self._options()
+        if not options.pattern:
+            if not quiet:
+                messagebox.showinfo("Buscar", "Informe o texto para buscar.", parent=self)
+            return None
 
-    def _search_opts(self):
-        needle = self.find_var.get()
-        if not needle:
-            messagebox.showinfo("Buscar", "Informe o texto para buscar.")
-            return None, None
-        nocase = 0 if self.case_var.get() else 1
-        return needle, nocase
+        revision = self.text_widget.revision
+        result = self._result
+        if result is None or result.revision != revision or result.options != options:
+            text = self.text_widget.get_content()
+            try:
+                result = SearchResult(text, options, revision)
+            except SearchError as ex:
+                self._result = None
+                self.count_var.set("regex inválida")
+                if not quiet:
+                    messagebox.showerror("Buscar", f"Expressão regular inválida:\n{ex}", parent=self)
+                return None
+            lines = self._lines if self._lines_revision == revision else LineIndex(text)
+            self._set_result(result, lines)
+        return result
+
+    def _set_result(self, result: SearchResult, lines: LineIndex) -> None:
+        # buscas ainda em andamento ficam obsoletas
+        self._generation += 1
+        self._result = result
+        self._lines = lines
+        self._lines_revision = result.revision
+        self._current = None
+        self._show_count(result)
+        self._refresh_view()
+
+    # ---------- busca ao digitar (thread) ----------
+    def _schedule_search(self) -> None:
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._start_search)
+
+    def _start_search(self) -> None:
+        self._search_after_id = None
+        self._generation += 1
+        options = self._options()
+        if not options.pattern:
+            self._result = None
+            self._current = None
+            self.count_var.set("")
+            self.text_widget.tag_remove("find_all", "1.0", tk.END)
+            return
+
+        # o snapshot é tirado aqui (thread do Tk); a thread só vê a string
+        text = self.text_widget.get_content()
+        revision = self.text_widget.revision
+        lines = self._lines if self._lines_revision == revision else None
+        self._searching += 1
+        threading.Thread(
+            target=self._search_worker,
+            args=(self._generation, text, options, revision, lines),
+            name="find-worker",
+            daemon=True,
+        ).start()
+        self._ensure_polling()
+
+    def _search_worker(self, generation, text, options, revision, lines) -> None:
+        try:
+            result = SearchResult(text, options, revision)
+            outcome = (generation, result, lines or LineIndex(text), None)
+        except SearchError as ex:
+            outcome = (generation, None, None, ex)
+        self._results.put(outcome)
+
+    def _ensure_polling(self) -> None:
+        if self._poll_id is None:
+            self._poll_id = self.after(30, self._poll)
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        while True:
+            try:
+                generation, result, lines, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._searching -= 1
+            if generation != self._generation:
+                continue
+            if error is not None:
+                self._result = None
+                self.count_var.set("regex inválida")
+                self.text_widget.tag_remove("find_all", "1.0", tk.END)
+            elif result.revision == self.text_widget.revision:
+                self._set_result(result, lines)
+            else:
+                # o buffer mudou durante a busca
+                self._schedule_search()
+        if self._searching:
+            self._ensure_polling()
+
+    # ---------- realce das ocorrências visíveis ----------
+    def _on_view_changed(self, _first, _last) -> None:
+        self._view_task.mark_dirty()
+
+    def _refresh_view(self) -> None:
+        """Marca só as ocorrências na área visível (com margem); o resto fica sem tag."""
+        self._view_task.dirty = False
+        widget = self.text_widget
+        widget.tag_remove("find_all", "1.0", tk.END)
+        result = self._result
+        if not result or result.revision != widget.revision:
+            return
+
+        top = int(widget.index("@0,0").split(".")[0])
+        bottom = int(widget.index(f"@0,{widget.winfo_height()}").split(".")[0])
+        lines = self._lines
+        lo = lines.offset(max(1, top - VIEW_MARGIN_LINES))
+        hi = lines.line_end(bottom + VIEW_MARGIN_LINES)
+
+        flat = []
+        i = result.next_from(lo)
+        if i is not None and result.starts[i] >= lo:
+            n = len(result)
+            while i < n and result.starts[i] <= hi:
+                start, end = result.span(i)
+                flat += (lines.index(start), lines.index(end))
+                i += 1
+        for j in range(0, len(flat), _TAG_BATCH):
+            widget.tag_add("find_all", *flat[j:j + _TAG_BATCH])
+
+    def _show_count(self, result: SearchResult) -> None:
+        if not result:
+            self.count_var.set("0 resultados")
+        elif self._current is None:
+            self.count_var.set(f"{len(result)} resultados")
+        else:
+            self.count_var.set(f"{self._current + 1} de {len(result)}")
+
+    def _cursor_offset(self) -> int:
+        line, col = self.text_widget.index(tk.INSERT).split(".")
+        return self._lines.offset(int(line), int(col))
 
     def find_next(self) -> None:
-        needle, nocase = self._search_opts()
-        if needle is None:
+        self._go(forward=True)
+
+    def find_prev(self) -> None:
+        self._go(forward=False)
+
+    def _go(self, forward: bool) -> None:
+        result = self._search()
+        if result is None:
             return
 
-        self.text_widget.tag_remove("find_match", "1.0", tk.END)
+        cursor = self._cursor_offset()
+        if forward:
+            i = result.next_from(cursor)
+        else:
+            # o cursor fica no fim da ocorrência selecionada: pula ela
+            selected = self._current is not None and result.span(self._current)[1] == cursor
+            i = result.prev_from(result.span(self._current)[0] if selected else cursor)
+        if i is None:
+            self._show_count(result)
+            messagebox.showinfo("Buscar", "Nenhuma ocorrência encontrada.", parent=self)
+            return
+        self._select(i)
 
-        start = self.text_widget.index(tk.INSERT)
-        idx = self.text_widget.search(
-            needle, start, stopindex=tk.END, nocase=nocase
-        )
-        if not idx:
-            # volta ao início
-            idx = self.text_widget.search(
-                needle, "1.0", stopindex=start, nocase=nocase
-            )
-            if not idx:
-                messagebox.showinfo("Buscar", "Nenhuma ocorrência encontrada.")
-                return
+    def _select(self, i: int) -> None:
+        self._current = i
+        start, end = self._result.span(i)
+        idx = self._lines.index(start)
+        end_idx = self._lines.index(end)
 
-        end = f"{idx}+{len(needle)}c"
-        self.text_widget.tag_add("find_match", idx, end)
-        self.text_widget.tag_config("find_match", underline=True)
-        self.text_widget.mark_set(tk.INSERT, end)
+        self.text_widget.tag_remove("find_match", "1.0", tk.END)
+        self.text_widget.tag_add("find_match", idx, end_idx)
+        self.text_widget.mark_set(tk.INSERT, end_idx)
         self.text_widget.see(idx)
+        self._show_count(self._result)
 
+    # ---------- substituição ----------
     def replace_one(self) -> None:
-        needle, nocase = self._search_opts()
-        if needle is None:
+        result = self._search()
+        if result is None:
             return
-        # se já tem seleção de match, substitui; senão busca
-        ranges = self.text_widget.tag_ranges("find_match")
-        if not ranges:
+        # se a ocorrência atual ainda está selecionada, substitui; senão busca
+        if self._current is None or result.span(self._current)[1] != self._cursor_offset():
             self.find_next()
-            ranges = self.text_widget.tag_ranges("find_match")
-            if not ranges:
+            if self._current is None:
                 return
+            result = self._result
 
-        start, end = ranges[0], ranges[1]
-        self.text_widget.delete(start, end)
-        self.text_widget.insert(start, self.replace_var.get())
+        i = self._current
+        start, end = result.span(i)
+        try:
+            replacement = result.expand(i, self.replace_var.get())
+        except SearchError as ex:
+            messagebox.showerror("Substituir", f"Substituição inválida:\n{ex}", parent=self)
+            return
+        self.text_widget.replace_range(self._lines.index(start), self._lines.index(end), replacement)
         self.text_widget.tag_remove("find_match", "1.0", tk.END)
+        self.text_widget.mark_set(tk.INSERT, self._lines.index(start) + f"+{len(replacement)}c")
+
+        # o buffer mudou: nova busca e segue para a próxima ocorrência
+        result = self._search(quiet=True)
+        if result:
+            self.find_next()
+        elif result is not None:
+            self._show_count(result)
 
     def replace_all(self) -> None:
-        needle, nocase = self._search_opts()
-        if needle is None:
+        result = self._search()
+        if result is None:
             return
 
+        try:
+            edit = result.replace_all(self.replace_var.get())
+        except SearchError as ex:
+            messagebox.showerror("Substituir tudo", f"Substituição inválida:\n{ex}", parent=self)
+            return
+        count = len(result)
         self.text_widget.tag_remove("find_match", "1.0", tk.END)
-        count = 0
-        start = "1.0"
-        while True:
-            idx = self.text_widget.search(needle, start, stopindex=tk.END, nocase=nocase)
-            if not idx:
-                break
-            end = f"{idx}+{len(needle)}c"
-            self.text_widget.delete(idx, end)
-            self.text_widget.insert(idx, self.replace_var.get())
-            start = f"{idx}+1c"
-            count += 1
+        if edit is not None:
+            # uma única edição do primeiro ao último match: um passo de undo
+            start, end, text = edit
+            self.text_widget.replace_range(self._lines.index(start), self._lines.index(end), text)
+            self._search(quiet=True)
 
-        messagebox.showinfo("Substituir tudo", f"Substituições realizadas: {count}")
+        messagebox.showinfo("Substituir tudo", f"Substituições realizadas: {count}", parent=self)
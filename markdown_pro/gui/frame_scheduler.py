@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from typing import Callable, List, Optional
+
+from markdown_pro.utils import trace
+
+
+# tempo de cada passe ocioso; o que sobrar fica para o próximo (entre um e
+# outro o Tk atende teclado e mouse)
+FRAME_BUDGET_MS = 8.0
+
+# prioridades: menor roda antes
+PRIORITY_CURSOR = 0  # linha ativa
+PRIORITY_GUTTER = 10  # numeração de linhas
+PRIORITY_HIGHLIGHT = 20  # realce de sintaxe
+PRIORITY_VIEW = 30  # realces da área visível (ex.: ocorrências da busca)
+PRIORITY_PANELS = 40  # painéis e título da janela
+
+# callback(prazo em perf_counter) -> False se ainda sobrou trabalho
+FrameCallback = Callable[[float], Optional[bool]]
+
+
+class FrameTask:
+    __slots__ = ("name", "priority", "callback", "dirty", "_scheduler")
+
+    def __init__(self, scheduler: "FrameScheduler", name: str, callback: FrameCallback, priority: int) -> None:
+        self._scheduler = scheduler
+        self.name = name
+        self.callback = callback
+        self.priority = priority
+        self.dirty = False
+
+    def mark_dirty(self) -> None:
+        self._scheduler._mark(self)
+
+    def remove(self) -> None:
+        self._scheduler.remove_task(self)
+
+
+class FrameScheduler:
+    """
+    Um único passe `after_idle` para as atualizações da tela do editor.
+    Cada componente registra uma tarefa e só a marca como suja; o passe roda
+    as sujas em ordem de prioridade até estourar o orçamento do quadro, e o
+    resto (inclusive o que ficou pela metade) vai para o próximo ciclo ocioso.
+    Quem tem muito a fazer (ex.: realce) olha o prazo e para no meio.
+    """
+
+    def __init__(self, widget: tk.Misc, budget_ms: float = FRAME_BUDGET_MS) -> None:
+        self.widget = widget
+        self.budget_ms = budget_ms
+        self._tasks: List[FrameTask] = []
+        self._after_id: Optional[str] = None
+
+    def add_task(self, name: str, callback: FrameCallback, priority: int) -> FrameTask:
+        task = FrameTask(self, name, callback, priority)
+        self._tasks.append(task)
+        # estável: mesma prioridade roda na ordem de registro
+        self._tasks.sort(key=lambda t: t.priority)
+        return task
+
+    def remove_task(self, task: FrameTask) -> None:
+        if task in self._tasks:
+            self._tasks.remove(task)
+        task.dirty = False
+
+    @property
+    def pending(self) -> bool:
+        return any(task.dirty for task in self._tasks)
+
+    def flush(self) -> None:
+        """Roda agora tudo o que está pendente, sem orçamento."""
+        self._cancel()
+        while self.pending:
+            self._run_frame(deadline=float("inf"))
+
+    def cancel(self) -> None:
+        """Descarta o passe agendado (ex.: widget sendo destruído)."""
+        self._cancel()
+        for task in self._tasks:
+            task.dirty = False
+
+    # ---------- passe ----------
+    def _mark(self, task: FrameTask) -> None:
+        task.dirty = True
+        if self._after_id is None:
+            self._after_id = self.widget.after_idle(self._on_idle)
+
+    def _cancel(self) -> None:
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _on_idle(self) -> None:
+        self._after_id = None
+        try:
+            self._run_frame(time.perf_counter() + self.budget_ms / 1000.0)
+        finally:
+            # sobrou trabalho (ou uma tarefa falhou): próximo ciclo ocioso
+            if self.pending and self._after_id is None:
+                self._after_id = self.widget.after_idle(self._on_idle)
+
+    def _run_frame(self, deadline: float) -> None:
+        with trace.span("frame") as span:
+            ran = 0
+            for task in [t for t in self._tasks if t.dirty]:
+                # pelo menos uma tarefa por quadro, para sempre andar
+                if ran and time.perf_counter() >= deadline:
+                    break
+                if not task.dirty:
+                    continue
+                task.dirty = False
+                ran += 1
+                if task.callback(deadline) is False:
+                    task.dirty = True
+            span.set(tasks=ran)
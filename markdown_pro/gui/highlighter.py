@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import re
+import time
+import tkinter as tk
+from typing import List, Optional, Tuple
+
+from markdown_pro.core.outline import FENCE, HEADING, TEXT, Outline
+from markdown_pro.utils import trace
+from markdown_pro.utils.line_index import LineIndex
+
+
+HIGHLIGHT_TAGS = ("md_header", "md_codefence", "md_bold", "md_italic")
+
+# padrões inline: rodam sobre o trecho inteiro (não cruzam linhas)
+_INLINE_PATTERNS = (
+    ("md_bold", re.compile(r"\*\*(.+?)\*\*")),
+    ("md_italic", re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")),
+)
+# tipo de linha (Outline) -> tag da linha inteira
+_LINE_TAGS = {HEADING: "md_header", FENCE: "md_codefence"}
+
+# quantas linhas processar por vez
+_READ_CHUNK = 256
+# índices por chamada de "tag add" (cada par é um intervalo)
+_TAG_BATCH = 2000
+
+
+class MarkdownHighlighter:
+    """
+    Realce incremental: só re-tokeniza as linhas sujas. O tipo de cada
+    linha (título, cerca, código, front matter) vem do Outline do editor,
+    que já propaga as mudanças de ``` — quem chama passa o intervalo que
+    o Outline devolveu junto com a edição.
+    """
+
+    def __init__(self, text: tk.Text, outline: Outline) -> None:
+        self.text = text
+        self.outline = outline
+        # intervalos [lo, hi] de linhas sujas, ordenados e disjuntos
+        self._dirty: List[Tuple[int, int]] = []
+
+    # ---------- dirty tracking ----------
+    def invalidate_all(self) -> None:
+        self._dirty = [(1, self.outline.line_count)]
+
+    def on_edit(self, start_line: int, end_line: int, inserted_lines: int, changed: Tuple[int, int]) -> None:
+        """
+        Registra uma edição: o trecho [start_line, end_line] (antes da edição)
+        foi substituído por texto com `inserted_lines` quebras de linha;
+        `changed` é o intervalo (já na numeração nova) reclassificado pelo Outline.
+        """
+        delta = inserted_lines - (end_line - start_line)
+
+        def shift(line: int) -> int:
+            if line <= start_line:
+                return line
+            if line <= end_line:
+                return start_line
+            return line + delta
+
+        shifted = [(shift(lo), shift(hi)) for lo, hi in self._dirty]
+        shifted.append((start_line, start_line + inserted_lines))
+        shifted.append(changed)
+        self._dirty = _merge(shifted)
+
+    def has_pending(self) -> bool:
+        return bool(self._dirty)
+
+    # ---------- pass ----------
+    def highlight(self, deadline: Optional[float] = None) -> bool:
+        """
+        Realça as linhas sujas. Com `deadline` (time.perf_counter()), para
+        entre dois blocos quando o tempo acaba; o resto continua sujo e a
+        volta é False.
+        """
+        if not self._dirty:
+            return True
+        total = self.outline.line_count
+        dirty = self._dirty
+        with trace.span("highlight") as span:
+            lines = 0
+            while dirty:
+                lo, hi = dirty[0]
+                hi = min(hi, total)
+                if lo > hi:
+                    dirty.pop(0)
+                    continue
+                stop = min(hi, lo + _READ_CHUNK - 1)
+                self._highlight_lines(lo, stop)
+                lines += stop - lo + 1
+                if stop >= hi:
+                    dirty.pop(0)
+                else:
+                    dirty[0] = (stop + 1, dirty[0][1])
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+            span.set(lines=lines)
+        return not dirty
+
+    def _highlight_lines(self, lo: int, hi: int) -> None:
+        outline = self.outline
+        chunk = outline.text(lo, hi)
+        index = LineIndex(chunk, first_line=lo)
+        ranges: dict[str, List[str]] = {t: [] for t in HIGHLIGHT_TAGS}
+
+        # linhas de código/front matter não recebem realce inline
+        plain = bytearray(hi - lo + 1)
+        for n in range(lo, hi + 1):
+            kind = outline.kind(n)
+            tag = _LINE_TAGS.get(kind)
+            if tag is not None:
+                ranges[tag] += (f"{n}.0", f"{n}.end")
+            if kind == TEXT or kind == HEADING:
+                plain[n - lo] = 1
+
+        for tag, regex in _INLINE_PATTERNS:
+            out = ranges[tag]
+            for m in regex.finditer(chunk):
+                start = m.start()
+                if plain[index.line_of(start) - lo]:
+                    out += (index.index(start), index.index(m.end()))
+
+        widget = self.text
+        for tag in HIGHLIGHT_TAGS:
+            widget.tag_remove(tag, f"{lo}.0", f"{hi}.end")
+            flat = ranges[tag]
+            for i in range(0, len(flat), _TAG_BATCH):
+                widget.tag_add(tag, *flat[i:i + _TAG_BATCH])
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    ranges.sort()
+    merged: List[Tuple[int, int]] = []
+    for lo, hi in ranges:
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
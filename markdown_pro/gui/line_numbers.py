@@ -1,5 +1,9 @@
 from __future__ import annotations
 import tkinter as tk
+from typing import List, Optional, Tuple
+
+from markdown_pro.gui.frame_scheduler import PRIORITY_GUTTER
+from markdown_pro.utils import trace
 
 
 class LineNumbers(tk.Canvas):
@@ -7,24 +11,64 @@ class LineNumbers(tk.Canvas):
         super().__init__(master, width=48, highlightthickness=0, **kwargs)
         self.text_widget = text_widget
 
-        self.text_widget.bind("<KeyRelease>", lambda e: self.redraw())
-        self.text_widget.bind("<MouseWheel>", lambda e: self.redraw())
-        self.text_widget.bind("<ButtonRelease-1>", lambda e: self.redraw())
-        self.text_widget.bind("<Configure>", lambda e: self.redraw())
+        # itens de texto reaproveitados entre redraws (um por linha visível)
+        self._items: List[int] = []
+        self._last_key: Optional[Tuple] = None
+        # redesenho no passe ocioso do editor (ver gui/frame_scheduler.py)
+        self._task = text_widget.scheduler.add_task("gutter", lambda _deadline: self.redraw(), PRIORITY_GUTTER)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+        # segue o yscrollcommand do editor (scroll, roda, teclado, resize...)
+        self.text_widget.add_yscroll_listener(lambda first, last: self.schedule_redraw())
+        self.text_widget.bind("<Configure>", lambda e: self.schedule_redraw(), add="+")
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self:
+            self._task.remove()
 
-        # Linux scroll (algumas distros)
-        self.text_widget.bind("<Button-4>", lambda e: self.redraw())
-        self.text_widget.bind("<Button-5>", lambda e: self.redraw())
+    def schedule_redraw(self) -> None:
+        """Agrupa rajadas de eventos em um único redraw por ciclo ocioso."""
+        self._task.mark_dirty()
 
     def redraw(self) -> None:
-        self.delete("all")
+        self._task.dirty = False
+        with trace.span("gutter_redraw"):
+            self._redraw()
 
-        i = self.text_widget.index("@0,0")
-        while True:
-            dline = self.text_widget.dlineinfo(i)
+    def _redraw(self) -> None:
+        tw = self.text_widget
+        height = tw.winfo_height()
+        first = int(tw.index("@0,0").split(".")[0])
+        last = int(tw.index(f"@0,{height}").split(".")[0])
+        total = int(tw.index("end-1c").split(".")[0])
+        top = tw.dlineinfo(f"{first}.0")
+        bottom = tw.dlineinfo(f"{last}.0")
+        key = (
+            first,
+            last,
+            total,
+            height,
+            top[1] if top else None,
+            bottom[1] if bottom else None,
+        )
+        if key == self._last_key:
+            trace.count("gutter_redraw_unchanged")
+            return
+        self._last_key = key
+
+        used = 0
+        for n in range(first, last + 1):
+            dline = tw.dlineinfo(f"{n}.0")
             if dline is None:
-                break
-            y = dline[1]
-            line = str(i).split(".")[0]
-            self.create_text(40, y, anchor="ne", text=line)
-            i = self.text_widget.index(f"{i}+1line")
+                # início da linha fora da área visível (linha quebrada)
+                continue
+            if used < len(self._items):
+                item = self._items[used]
+                self.coords(item, 40, dline[1])
+                self.itemconfigure(item, text=str(n), state=tk.NORMAL)
+            else:
+                self._items.append(self.create_text(40, dline[1], anchor="ne", text=str(n)))
+            used += 1
+
+        for item in self._items[used:]:
+            self.itemconfigure(item, state=tk.HIDDEN)
@@ -1,13 +1,45 @@
 from __future__ import annotations
 
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Set
 
+from markdown_pro.core.buffer_store import BufferStore
 from markdown_pro.core.document_manager import DocumentManager
+from markdown_pro.core.file_watcher import FileWatcher
+from markdown_pro.core.file_writer import SaveResult
+from markdown_pro.core.journal import EditJournal, RecoveredDocument, recover
+from markdown_pro.core.journal import remove as remove_journal
+from markdown_pro.core.text_change import TextChange
+from markdown_pro.gui.document_tabs import DocumentTab
 from markdown_pro.gui.editor_widget import EditorWidget
+from markdown_pro.gui.frame_scheduler import PRIORITY_PANELS
 from markdown_pro.gui.line_numbers import LineNumbers
-from markdown_pro.gui.find_replace_dialog import FindReplaceDialog
+from markdown_pro.utils import trace
+from markdown_pro.utils.paths import preview_path, recent_files_path
+from markdown_pro.utils.settings import load_settings
+
+# render/preview, busca e export são importados sob demanda: abrir e editar
+# texto não paga markdown, yaml, Pygments nem WeasyPrint
+if TYPE_CHECKING:
+    from markdown_pro.gui.render_scheduler import RenderOutcome, RenderScheduler
+
+
+PREVIEW_DEBOUNCE_MS = 300
+# depois da primeira pintura, pré-carrega o caminho de render em segundo plano
+WARM_UP_DELAY_MS = 800
+# tempo máximo de cada passo da carga de um arquivo grande (o resto fica pro próximo idle)
+LOAD_STEP_BUDGET_S = 0.03
+# fila de callbacks das threads: consulta rápida com trabalho em andamento,
+# lenta quando só o watcher de arquivos pode mandar algo
+UI_POLL_BUSY_MS = 30
+UI_POLL_IDLE_MS = 250
+# atualização da latência por tecla na barra de status (trace_overlay)
+LATENCY_OVERLAY_MS = 1000
 
 
 class MainWindow:
@@ -16,18 +48,72 @@ class MainWindow:
         self.root.title("Markdown Pro Editor")
         self.root.geometry("1100x700")
 
-        self.doc = DocumentManager()
+        # callbacks de threads de trabalho (ex.: gravação) rodam no mainloop
+        self._ui_calls: "queue.Queue" = queue.Queue()
+        self._ui_poll_id = None
+        self._ui_poll_delay = 0
+        self._background_jobs = 0
+
+        # trace de desempenho: ligado antes do editor existir (ver utils/trace.py)
+        settings = load_settings()
+        trace.configure(settings)
+        self.latency_var: Optional[tk.StringVar] = None
+        self._latency_overlay = trace.overlay_enabled(settings)
+
+        # abas: cada uma com o seu DocumentManager (e journal); só a ativa e as
+        # usadas por último têm editor Tk, as outras ficam comprimidas no store
+        self._tabs: List[DocumentTab] = []
+        self._active: Optional[DocumentTab] = None
+        self._live_order: List[DocumentTab] = []
+        self._max_live_tabs = max(1, settings.live_tabs)
+        self._store = BufferStore(settings.tab_store_bytes)
+
+        # mudanças externas nos arquivos abertos e na lista de recentes
+        self._watcher = FileWatcher(self._on_file_changed, dispatch=self._ui_calls.put)
+        self._watched_paths: Set[Path] = set()
+
+        # preview ao vivo: conversão numa thread, resultado em ~/.markdown-pro
+        self.preview_var = tk.BooleanVar(value=False)
+        # painel de títulos (criado no primeiro uso)
+        self.outline_var = tk.BooleanVar(value=False)
+        self._outline_pane = None
+        self._preview_after_id = None
+        self._preview_opened = False
+        self._renderer: Optional[RenderScheduler] = None
+        self._find_dialog = None
+
+        # carga em partes de um arquivo grande (id do after_idle pendente e a aba)
+        self._load_job = None
+        self._load_tab: Optional[DocumentTab] = None
 
         self._setup_style()
         self._build_layout()
+        # a primeira aba antes do menu (os recentes vêm do DocumentManager)
+        self._new_tab()
+        self.status_var.set("Novo documento")
         self._build_menu()
         self._bind_shortcuts()
 
-        self._load_new_document()
-
         # fechar com confirmação se tiver alterações
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
+        self.root.after(WARM_UP_DELAY_MS, self._warm_up)
+        self.root.after(WARM_UP_DELAY_MS, self._start_watcher)
+        self.root.after_idle(self._check_recovery)
+
+    # o documento, o editor e a numeração da aba ativa
+    @property
+    def doc(self) -> DocumentManager:
+        return self._active.doc
+
+    @property
+    def editor(self) -> EditorWidget:
+        return self._active.editor
+
+    @property
+    def linenos(self) -> LineNumbers:
+        return self._active.linenos
+
     def _setup_style(self) -> None:
         style = ttk.Style()
         try:
@@ -49,19 +135,36 @@ class MainWindow:
             side=tk.LEFT
         )
         ttk.Label(header, textvariable=self.status_var).pack(side=tk.RIGHT)
+        if self._latency_overlay:
+            self.latency_var = tk.StringVar(value="tecla: -")
+            ttk.Label(header, textvariable=self.latency_var, foreground="#666").pack(side=tk.RIGHT, padx=12)
+            self.root.after(LATENCY_OVERLAY_MS, self._update_latency_overlay)
 
         ttk.Separator(container).pack(fill=tk.X, pady=8)
 
         workspace = ttk.Frame(container)
         workspace.pack(fill=tk.BOTH, expand=True)
 
-        self.editor = EditorWidget(workspace)
-        self.editor.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        self._notebook = ttk.Notebook(workspace)
+        self._notebook.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        self._notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._workspace = workspace
 
-        self.linenos = LineNumbers(workspace, self.editor)
-        self.linenos.pack(side=tk.LEFT, fill=tk.Y)
+    def _create_editor(self, tab: DocumentTab) -> None:
+        # editor + numeração na página da aba (ao abrir ou ao reativar uma suspensa)
+        editor = EditorWidget(tab.page)
+        editor.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
-        self.editor.set_on_change(self._on_editor_change)
+        linenos = LineNumbers(tab.page, editor)
+        linenos.pack(side=tk.LEFT, fill=tk.Y)
+
+        editor.set_on_change(lambda change: self._on_editor_change(tab, change))
+        # título da aba/janela ("*" de alterado) no passe ocioso do editor
+        tab.title_task = editor.scheduler.add_task(
+            "title", lambda _deadline: self._update_title(tab), PRIORITY_PANELS
+        )
+        self._bind_editor_shortcuts(editor)
+        tab.editor, tab.linenos = editor, linenos
 
     def _build_menu(self) -> None:
         menubar = tk.Menu(self.root)
@@ -70,6 +173,7 @@ class MainWindow:
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Novo", accelerator="Ctrl+N", command=self._new)
         file_menu.add_command(label="Abrir...", accelerator="Ctrl+O", command=self._open)
+        file_menu.add_command(label="Fechar aba", accelerator="Ctrl+W", command=self._close_tab)
         file_menu.add_separator()
         file_menu.add_command(label="Salvar", accelerator="Ctrl+S", command=self._save)
         file_menu.add_command(
@@ -92,8 +196,27 @@ class MainWindow:
             accelerator="Ctrl+F",
             command=self._open_find
         )
+        edit_menu.add_command(
+            label="Buscar no workspace...",
+            accelerator="Ctrl+Shift+F",
+            command=self._open_workspace_search,
+        )
         menubar.add_cascade(label="Editar", menu=edit_menu)
 
+        # ----- Visualizar -----
+        view_menu = tk.Menu(menubar, tearoff=0)
+        view_menu.add_checkbutton(
+            label="Pré-visualização no navegador",
+            variable=self.preview_var,
+            command=self._toggle_preview,
+        )
+        view_menu.add_checkbutton(
+            label="Estrutura do documento",
+            variable=self.outline_var,
+            command=self._toggle_outline,
+        )
+        menubar.add_cascade(label="Visualizar", menu=view_menu)
+
         self.root.config(menu=menubar)
         self._refresh_recents_menu()
 
@@ -104,13 +227,16 @@ class MainWindow:
         self.root.bind("<Control-s>", lambda e: self._save())
         self.root.bind("<Control-Shift-S>", lambda e: self._save_as())
         self.root.bind("<Control-f>", lambda e: self._open_find())
+        self.root.bind("<Control-Shift-F>", lambda e: self._open_workspace_search())
+        self.root.bind("<Control-w>", lambda e: self._close_tab())
 
-        # atalhos de formatação (no editor)
-        self.editor.bind("<Control-b>", lambda e: self._fmt_bold())
-        self.editor.bind("<Control-i>", lambda e: self._fmt_italic())
-        self.editor.bind("<Control-k>", lambda e: self._fmt_code())
-        self.editor.bind("<Control-l>", lambda e: self._fmt_link())
-        self.editor.bind("<Control-Shift-H>", lambda e: self._fmt_heading())
+    def _bind_editor_shortcuts(self, editor: EditorWidget) -> None:
+        # atalhos de formatação (no editor de cada aba)
+        editor.bind("<Control-b>", lambda e: self._fmt_bold())
+        editor.bind("<Control-i>", lambda e: self._fmt_italic())
+        editor.bind("<Control-k>", lambda e: self._fmt_code())
+        editor.bind("<Control-l>", lambda e: self._fmt_link())
+        editor.bind("<Control-Shift-H>", lambda e: self._fmt_heading())
 
     def _fmt_bold(self):
         self.editor.toggle_wrap_selection("**", "**")
@@ -132,23 +258,133 @@ class MainWindow:
         self.editor.insert_heading(2)
         return "break"
 
+    # ---------- Abas ----------
+    def _new_tab(self) -> DocumentTab:
+        page = ttk.Frame(self._notebook)
+        tab = DocumentTab(DocumentManager(dispatch=self._ui_calls.put, journal=EditJournal()), page)
+        self._tabs.append(tab)
+        self._notebook.add(page, text=tab.label)
+        self._create_editor(tab)
+        tab.editor.set_content("")
+        tab.mark_undo_base()
+        self._select(tab)
+        return tab
+
+    def _find_tab(self, path: Path) -> Optional[DocumentTab]:
+        path = path.resolve()
+        for tab in self._tabs:
+            if tab.doc.state.path is not None and tab.doc.state.path.resolve() == path:
+                return tab
+        return None
+
+    def _select(self, tab: DocumentTab) -> None:
+        # ativa já (o <<NotebookTabChanged>> chega depois, pela fila de eventos)
+        self._activate(tab)
+        self._notebook.select(tab.page)
+
+    def _on_tab_changed(self, _event=None) -> None:
+        selected = self._notebook.select()
+        for tab in self._tabs:
+            if str(tab.page) == selected:
+                self._activate(tab)
+                return
+
+    def _activate(self, tab: DocumentTab) -> None:
+        if tab is self._active:
+            return
+        # a busca está presa ao editor da aba anterior (que pode ser suspensa)
+        self._close_find()
+        self._active = tab
+        if not tab.live:
+            self._resume_tab(tab)
+        if tab in self._live_order:
+            self._live_order.remove(tab)
+        self._live_order.append(tab)
+        self._trim_live_tabs()
+        self._rebind_outline()
+        self._update_title(tab)
+        self.linenos.schedule_redraw()
+        self._schedule_preview()
+        self.editor.focus_set()
+
+    def _resume_tab(self, tab: DocumentTab) -> None:
+        if tab.reload_from_disk:
+            tab.reload_from_disk = False
+            path = tab.doc.state.path
+            try:
+                content = tab.doc.open_document(path)
+            except (OSError, ValueError):
+                content = None  # fica com o que estava no store
+            if content is not None:
+                meta = self._store.meta(tab.key)
+                self._store.discard(tab.key)
+                self._create_editor(tab)
+                tab.editor.set_content(content)
+                tab.editor.mark_set(tk.INSERT, meta["cursor"])
+                tab.editor.yview_moveto(meta["top"])
+                tab.mark_undo_base()
+                self._watcher.set_known(path, tab.doc.state.disk_digest)
+                self.status_var.set(f"Recarregado: {path.name} (alterado fora do editor)")
+                return
+        tab.resume(self._store, self._create_editor)
+
+    def _trim_live_tabs(self) -> None:
+        # editores Tk além do limite: suspende os usados há mais tempo (nunca
+        # a ativa, a que está carregando nem arquivo grande, que reabriria devagar)
+        live = [tab for tab in self._live_order if tab.live]
+        excess = len(live) - self._max_live_tabs
+        for tab in live:
+            if excess <= 0:
+                break
+            if tab is self._active or tab is self._load_tab or tab.editor.large_file:
+                continue
+            tab.suspend(self._store)
+            excess -= 1
+
+    def _close_tab(self, tab: Optional[DocumentTab] = None) -> None:
+        tab = tab or self._active
+        if tab.doc.state.dirty:
+            self._select(tab)
+            if not self._ensure_can_discard_or_save():
+                return
+        if tab is self._load_tab:
+            self._cancel_load()
+        tab.doc.writer.wait()
+        self._poll_ui_calls()
+        if tab is self._active:
+            i = self._tabs.index(tab)
+            others = self._tabs[:i] + self._tabs[i + 1:]
+            if others:
+                self._select(others[min(i, len(others) - 1)])
+            else:
+                self._new_tab()
+        self._tabs.remove(tab)
+        if tab in self._live_order:
+            self._live_order.remove(tab)
+        # fechou salvando ou descartando: nada a recuperar
+        tab.doc.journal.discard()
+        tab.doc.journal.close()
+        self._store.discard(tab.key)
+        self._notebook.forget(tab.page)
+        tab.page.destroy()
+        self._sync_watches()
+
     # ---------- Actions ----------
-    def _load_new_document(self) -> None:
-        self.doc.new_document()
-        self.editor.set_content("")
-        self._update_title()
+    def _load_new_document(self, tab: DocumentTab) -> None:
+        tab.doc.new_document()
+        tab.editor.set_content("")
+        tab.mark_undo_base()
+        self._sync_watches()
+        self._update_title(tab)
         self.status_var.set("Novo documento")
-        self.linenos.redraw()
+        tab.linenos.schedule_redraw()
+        self._schedule_preview()
 
     def _new(self) -> None:
-        if not self._ensure_can_discard_or_save():
-            return
-        self._load_new_document()
+        self._new_tab()
+        self.status_var.set("Novo documento")
 
     def _open(self) -> None:
-        if not self._ensure_can_discard_or_save():
-            return
-
         path_str = filedialog.askopenfilename(
             title="Abrir Markdown",
             filetypes=[("Markdown", "*.md"), ("Texto", "*.txt"), ("Todos", "*.*")],
@@ -156,31 +392,115 @@ class MainWindow:
         if not path_str:
             return
 
-        path = Path(path_str)
+        self._open_in_tab(Path(path_str))
+
+    def _open_in_tab(self, path: Path) -> bool:
+        """Abre `path` na aba que já o tem, na atual se estiver vazia ou numa nova."""
+        tab = self._find_tab(path)
+        if tab is not None:
+            self._select(tab)
+            return True
+        if self._load_job is not None:
+            # um arquivo grande por vez
+            self.status_var.set("Aguarde o fim da abertura do arquivo")
+            return False
+        reuse = self._active.pristine
+        tab = self._active if reuse else self._new_tab()
+        if self._open_path(path):
+            return True
+        if not reuse:
+            self._close_tab(tab)
+        return False
+
+    def _open_path(self, path: Path) -> bool:
         try:
+            settings = load_settings()
+            if path.stat().st_size >= settings.large_file_bytes:
+                self._open_large(path, settings.load_chunk_bytes)
+                return True
             content = self.doc.open_document(path)
             self.editor.set_content(content)
+            self._active.mark_undo_base()
+            self._sync_watches()
+            self._schedule_preview()
             self.status_var.set(f"Aberto: {path.name}")
             self._update_title()
             self._refresh_recents_menu()
-            self.linenos.redraw()
+            self.linenos.schedule_redraw()
+            return True
         except Exception as ex:
             messagebox.showerror("Erro ao abrir", str(ex))
+            return False
+
+    # ---------- Arquivo grande ----------
+    def _open_large(self, path: Path, chunk_bytes: int) -> None:
+        # mmap + decodificação em partes; o widget é preenchido em passos
+        # curtos no idle do Tk, então a janela continua respondendo (e dá
+        # para trocar de aba: a carga segue no editor desta)
+        tab = self._active
+        editor, linenos = tab.editor, tab.linenos
+        chunks = tab.doc.open_chunked(path, chunk_bytes)
+        editor.begin_load(large_file=True)
+        self._update_title(tab)
+        self._refresh_recents_menu()
+        self.status_var.set(f"Abrindo {path.name}...")
+
+        def step() -> None:
+            deadline = time.perf_counter() + LOAD_STEP_BUDGET_S
+            try:
+                while time.perf_counter() < deadline:
+                    text, done, total = next(chunks)
+                    editor.append_loaded(text)
+            except StopIteration:
+                self._load_job = self._load_tab = None
+                editor.end_load()
+                tab.mark_undo_base()
+                self._sync_watches()
+                linenos.schedule_redraw()
+                self.status_var.set(f"Aberto: {path.name} (arquivo grande: sem realce nem preview)")
+                return
+            except (OSError, ValueError) as ex:
+                # inclui UnicodeDecodeError: volta para um documento vazio
+                self._load_job = self._load_tab = None
+                editor.end_load()
+                self._load_new_document(tab)
+                messagebox.showerror("Erro ao abrir", str(ex))
+                return
+            self.status_var.set(f"Abrindo {path.name}: {done * 100 // total}%")
+            linenos.schedule_redraw()
+            self._load_job = self.root.after_idle(step)
+
+        self._load_tab = tab
+        self._load_job = self.root.after_idle(step)
+
+    def _cancel_load(self) -> None:
+        if self._load_job is not None:
+            self.root.after_cancel(self._load_job)
+            self._load_job = None
+            self._load_tab.editor.end_load()
+            self._load_tab = None
 
     def _save(self) -> None:
+        if self._active is self._load_tab:
+            self.status_var.set("Aguarde o fim da abertura do arquivo")
+            return
         try:
-            content = self.editor.get_content()
             if self.doc.state.path is None:
                 return self._save_as()
-            saved_path = self.doc.save(content)
-            self.status_var.set(f"Salvo: {saved_path.name}")
-            self._update_title()
-            self._refresh_recents_menu()
-            self.linenos.redraw()
+            # o DocumentManager já tem o texto (espelhado edição a edição);
+            # a gravação roda numa thread e termina em _on_saved
+            saved_path = self.doc.save(
+                on_done=lambda result, tab=self._active: self._on_saved(tab, result)
+            )
+            self.status_var.set(f"Salvando {saved_path.name}...")
+            self._poll_ui_calls_soon()
         except Exception as ex:
             messagebox.showerror("Erro ao salvar", str(ex))
 
     def _save_as(self) -> None:
+        if self._active is self._load_tab:
+            self.status_var.set("Aguarde o fim da abertura do arquivo")
+            return
         try:
             path_str = filedialog.asksaveasfilename(
                 title="Salvar como",
@@ -190,60 +510,307 @@ class MainWindow:
             if not path_str:
                 return
             path = Path(path_str)
-            content = self.editor.get_content()
-            saved_path = self.doc.save_as(path, content)
-            self.status_var.set(f"Salvo: {saved_path.name}")
-            self._update_title()
-            self._refresh_recents_menu()
-            self.linenos.redraw()
+            saved_path = self.doc.save_as(
+                path, on_done=lambda result, tab=self._active: self._on_saved(tab, result)
+            )
+            self.status_var.set(f"Salvando {saved_path.name}...")
+            self._poll_ui_calls_soon()
         except Exception as ex:
             messagebox.showerror("Erro ao salvar", str(ex))
 
-    def _open_recent(self, path_str: str) -> None:
-        if not self._ensure_can_discard_or_save():
+    def _on_saved(self, tab: DocumentTab, result: SaveResult) -> None:
+        if result.error is not None:
+            messagebox.showerror("Erro ao salvar", str(result.error))
+            return
+        if result.written:
+            self.status_var.set(f"Salvo: {result.path.name} ({result.elapsed_ms:.0f} ms)")
+        else:
+            self.status_var.set(f"Sem alterações no disco: {result.path.name}")
+        self._sync_watches()
+        self._watcher.set_known(result.path, result.digest)
+        self._update_title(tab)
+        self._refresh_recents_menu()
+
+    def _wait_for_saves(self) -> None:
+        # antes de descartar/fechar: as gravações em andamento precisam terminar
+        for tab in self._tabs:
+            tab.doc.writer.wait()
+        self._poll_ui_calls()
+
+    # ---------- Threads -> mainloop ----------
+    def _poll_ui_calls_soon(self, delay: int = UI_POLL_BUSY_MS) -> None:
+        if self._ui_poll_id is not None:
+            if delay >= self._ui_poll_delay:
+                return
+            self.root.after_cancel(self._ui_poll_id)
+        self._ui_poll_delay = delay
+        self._ui_poll_id = self.root.after(delay, self._poll_ui_calls)
+
+    def _poll_ui_calls(self) -> None:
+        if self._ui_poll_id is not None:
+            self.root.after_cancel(self._ui_poll_id)
+            self._ui_poll_id = None
+        while True:
+            try:
+                call = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            call()
+        if any(tab.doc.writer.busy for tab in self._tabs) or self._background_jobs or not self._ui_calls.empty():
+            self._poll_ui_calls_soon()
+        elif self._watcher.active:
+            self._poll_ui_calls_soon(UI_POLL_IDLE_MS)
+
+    def _run_in_background(self, work, on_done) -> None:
+        """Roda `work()` numa thread e entrega o resultado a `on_done` no mainloop."""
+        self._background_jobs += 1
+
+        def run() -> None:
+            try:
+                result = work()
+            except Exception:
+                self._ui_calls.put(lambda: self._finish_background(None, None))
+                raise
+            self._ui_calls.put(lambda: self._finish_background(on_done, result))
+
+        threading.Thread(target=run, daemon=True).start()
+        self._poll_ui_calls_soon()
+
+    def _finish_background(self, on_done, result) -> None:
+        self._background_jobs -= 1
+        if on_done is not None:
+            on_done(result)
+
+    # ---------- Mudanças externas (watchdog) ----------
+    def _start_watcher(self) -> None:
+        if not load_settings().watch_files or not self._watcher.start():
             return
+        self._watcher.watch(recent_files_path())
+        self._sync_watches()
+        self._poll_ui_calls_soon(UI_POLL_IDLE_MS)
+
+    def _sync_watches(self) -> None:
+        # observa os arquivos das abas abertas (e larga os que saíram)
+        paths = {
+            tab.doc.state.path: tab.doc.state.disk_digest
+            for tab in self._tabs
+            if tab.doc.state.path is not None
+        }
+        for path in self._watched_paths - paths.keys():
+            self._watcher.unwatch(path)
+        for path, digest in paths.items():
+            if path not in self._watched_paths:
+                self._watcher.watch(path, digest)
+        self._watched_paths = set(paths)
+
+    def _on_file_changed(self, path: Path, data: bytes, digest: str) -> None:
+        if path == recent_files_path().resolve():
+            # outra janela abriu/salvou algo
+            self._refresh_recents_menu()
+            return
+
+        tab = self._find_tab(path)
+        if tab is None or tab is self._load_tab:
+            return
+        state = tab.doc.state
+        if digest == state.disk_digest:
+            return
+        if state.dirty:
+            # não mistura com alterações não salvas; o usuário decide ao salvar
+            self.status_var.set(f"{path.name} foi alterado fora do editor")
+            return
+        if not tab.live:
+            # aba suspensa: relê do disco quando voltar a ela
+            tab.reload_from_disk = True
+            return
+
+        # diff por linhas numa thread (o snapshot do Rope é imutável)
+        from markdown_pro.core.large_file import decode_text
+        from markdown_pro.core.text_diff import line_edits
+
+        old = state.buffer.snapshot()
+        revision = state.buffer.revision
+
+        def work():
+            try:
+                return line_edits(old.text(), decode_text(data))
+            except ValueError:
+                return None
+
+        def apply(edits) -> None:
+            # o documento pode ter mudado (ou a aba sido suspensa) enquanto o diff era calculado
+            if tab.doc.state is not state or state.dirty:
+                return
+            if not tab.live:
+                tab.reload_from_disk = True
+                return
+            if state.buffer.revision != revision:
+                return
+            if edits is None:
+                self.status_var.set(f"{path.name} foi alterado fora do editor (UTF-8 inválido)")
+                return
+            # edições de faixa: cursor, rolagem e undo continuam valendo
+            tab.editor.apply_edits(edits)
+            tab.doc.mark_clean(digest)
+            self._update_title(tab)
+            tab.linenos.schedule_redraw()
+            self.status_var.set(f"Recarregado: {path.name} (alterado fora do editor)")
+
+        self._run_in_background(work, apply)
+
+    # ---------- Recuperação (journal) ----------
+    def _check_recovery(self) -> None:
+        self._run_in_background(recover, self._offer_recovery)
+
+    def _offer_recovery(self, found: "list[RecoveredDocument]") -> None:
+        # cada documento recuperado abre na sua aba. Se o usuário já começou
+        # a editar, não interrompe: ficam para a próxima vez.
+        if not found or self._load_job is not None or any(tab.doc.state.dirty for tab in self._tabs):
+            return
+        for rec in found:
+            name = rec.path.name if rec.path else "Sem título"
+            when = time.strftime("%d/%m %H:%M", time.localtime(rec.modified))
+            if not messagebox.askyesno(
+                "Recuperar alterações",
+                f"Há alterações não salvas de \"{name}\" ({when}).\nDeseja recuperá-las?",
+            ):
+                remove_journal(rec.journal_id)
+                continue
+            tab = self._active if self._active.pristine else self._new_tab()
+            content = tab.doc.recover_document(rec)
+            tab.editor.set_content(content)
+            tab.mark_undo_base()
+            self._sync_watches()
+            self._update_title(tab)
+            self.status_var.set(f"Recuperado: {name}")
+            tab.linenos.schedule_redraw()
+            self._schedule_preview()
+
+    def _open_recent(self, path_str: str) -> None:
         path = Path(path_str)
         if not path.exists():
             messagebox.showwarning("Arquivo não encontrado", f"Não existe:\n{path}")
             self._refresh_recents_menu()
             return
-        try:
-            content = self.doc.open_document(path)
-            self.editor.set_content(content)
-            self.status_var.set(f"Aberto: {path.name}")
-            self._update_title()
-            self._refresh_recents_menu()
-            self.linenos.redraw()
-        except Exception as ex:
-            messagebox.showerror("Erro ao abrir", str(ex))
+        self._open_in_tab(path)
 
     # ---------- State ----------
-    def _on_editor_change(self, _content: str) -> None:
+    def _on_editor_change(self, tab: DocumentTab, change: TextChange) -> None:
+        # a aba do editor que mudou (recarga externa pode mexer numa inativa)
+        doc = tab.doc
+        # sem faixa: o texto cru do widget (get_content tira os \n do fim e
+        # as próximas edições cairiam além do fim do buffer)
+        doc.apply_change(change, None if change.text is not None else tab.editor.get("1.0", "end-1c"))
+
         # marca dirty só uma vez, mas atualiza linenos sempre
-        if not self.doc.state.dirty:
-            self.doc.set_dirty(True)
-            self._update_title()
+        if not doc.state.dirty:
+            doc.set_dirty(True)
+            tab.title_task.mark_dirty()
+
+        tab.linenos.schedule_redraw()
+        if tab is self._active:
+            self._schedule_preview()
+
+    # ---------- Preview ----------
+    def _toggle_preview(self) -> None:
+        if self.preview_var.get() and self.editor.large_file:
+            self.status_var.set("Preview desativado para arquivos grandes")
+        elif self.preview_var.get():
+            self._preview_opened = False
+            self._request_preview()
+        elif self._renderer is not None:
+            self._renderer.cancel()
+
+    def _toggle_outline(self) -> None:
+        if not self.outline_var.get():
+            if self._outline_pane is not None:
+                self._outline_pane.pack_forget()
+            return
+        if self._outline_pane is None:
+            from markdown_pro.gui.outline_pane import OutlinePane
 
-        self.linenos.redraw()
+            self._outline_pane = OutlinePane(self._workspace, self.editor)
+        self._outline_pane.pack(side=tk.LEFT, fill=tk.Y, before=self._notebook, padx=(0, 8))
 
-    def _update_title(self) -> None:
-        name = self.doc.state.path.name if self.doc.state.path else "Sem título"
-        dirty = " *" if self.doc.state.dirty else ""
-        self.title_var.set(f"{name}{dirty}")
-        self.root.title(f"Markdown Pro Editor — {name}{dirty}")
+    def _rebind_outline(self) -> None:
+        # o painel acompanha o editor da aba ativa: recriado na troca
+        if self._outline_pane is None:
+            return
+        self._outline_pane.destroy()
+        self._outline_pane = None
+        if self.outline_var.get():
+            self._toggle_outline()
+
+    def _schedule_preview(self) -> None:
+        if not self.preview_var.get() or self.editor.large_file:
+            return
+        if self._preview_after_id:
+            self.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.root.after(PREVIEW_DEBOUNCE_MS, self._request_preview)
+
+    def _request_preview(self) -> None:
+        self._preview_after_id = None
+        text = self.editor.get_content()
+        # o sumário sai do Outline do editor, sem reanalisar o texto na thread
+        toc = self.editor.outline.toc_tokens() if "[TOC]" in text else None
+        self._get_renderer().request(self.editor.revision, text, toc)
+
+    def _get_renderer(self) -> "RenderScheduler":
+        if self._renderer is None:
+            from markdown_pro.gui.render_scheduler import RenderScheduler
+
+            self._renderer = RenderScheduler(
+                self.root, self._on_render_done, after_render=self._write_preview
+            )
+        return self._renderer
+
+    def _warm_up(self) -> None:
+        # a janela já está na tela: importa o parser (e extensões) numa thread
+        # para o primeiro preview/export não pagar esse custo
+        def load() -> None:
+            from markdown_pro.core.markdown_processor import MarkdownProcessor
+
+            MarkdownProcessor()._engine()
+
+        threading.Thread(target=load, name="warm-up", daemon=True).start()
+
+    def _write_preview(self, result) -> None:
+        # thread de trabalho: o disco não segura o mainloop
+        preview_path().write_text(result.html_full, encoding="utf-8")
+
+    def _on_render_done(self, outcome: "RenderOutcome") -> None:
+        if outcome.error is not None:
+            self.status_var.set(f"Erro no preview: {outcome.error}")
+            return
+        self.status_var.set(f"Preview: {outcome.elapsed_ms:.0f} ms")
+        if not self._preview_opened:
+            self._preview_opened = True
+            import webbrowser
+
+            webbrowser.open(preview_path().as_uri())
+
+    def _update_title(self, tab: Optional[DocumentTab] = None) -> None:
+        tab = tab or self._active
+        label = tab.label
+        self._notebook.tab(tab.page, text=label)
+        if tab is self._active:
+            self.title_var.set(label)
+            self.root.title(f"Markdown Pro Editor — {label}")
 
     def _ensure_can_discard_or_save(self) -> bool:
         if not self.doc.state.dirty:
             return True
 
+        name = self.doc.state.path.name if self.doc.state.path else "Sem título"
         choice = messagebox.askyesnocancel(
             "Alterações não salvas",
-            "Você tem alterações não salvas.\nDeseja salvar antes de continuar?",
+            f"\"{name}\" tem alterações não salvas.\nDeseja salvar antes de continuar?",
         )
         if choice is None:  # Cancel
             return False
         if choice is True:  # Yes
             self._save()
+            self._wait_for_saves()
             return not self.doc.state.dirty
         return True  # No
 
@@ -261,12 +828,58 @@ class MainWindow:
             )
 
     def _on_close(self) -> None:
-        if not self._ensure_can_discard_or_save():
-            return
+        for tab in list(self._tabs):
+            if tab.doc.state.dirty:
+                self._select(tab)
+                if not self._ensure_can_discard_or_save():
+                    return
+        self._cancel_load()
+        self._wait_for_saves()
+        # saiu salvando ou descartando: nada a recuperar na próxima vez
+        for tab in self._tabs:
+            tab.doc.journal.discard()
+            tab.doc.journal.close()
+        self._store.close()
+        self._watcher.stop()
+        if self._renderer is not None:
+            self._renderer.shutdown()
+        trace.shutdown()
         self.root.destroy()
 
+    def _update_latency_overlay(self) -> None:
+        tracer = trace.current()
+        stats = tracer.keystroke_percentiles() if tracer is not None else None
+        if stats is not None:
+            self.latency_var.set(
+                f"tecla p50 {stats['p50']:.0f} · p95 {stats['p95']:.0f} · p99 {stats['p99']:.0f} ms"
+            )
+        self.root.after(LATENCY_OVERLAY_MS, self._update_latency_overlay)
+
     def _open_find(self) -> None:
-        FindReplaceDialog(self.root, self.editor)
+        from markdown_pro.gui.find_replace_dialog import FindReplaceDialog
+
+        self._close_find()
+        self._find_dialog = FindReplaceDialog(self.root, self.editor)
+
+    def _close_find(self) -> None:
+        if self._find_dialog is not None and self._find_dialog.winfo_exists():
+            self._find_dialog.destroy()
+        self._find_dialog = None
+
+    def _open_workspace_search(self) -> None:
+        from markdown_pro.gui.workspace_search_dialog import WorkspaceSearchDialog
+
+        path = self.doc.state.path
+        root_dir = path.parent if path is not None else Path.cwd()
+        WorkspaceSearchDialog(self.root, root_dir, self._run_in_background, self._open_at_line)
+
+    def _open_at_line(self, path: Path, line: int) -> None:
+        if not self._open_in_tab(path) or self._active is self._load_tab:
+            return
+        index = f"{line}.0"
+        self.editor.mark_set(tk.INSERT, index)
+        self.editor.see(index)
+        self.editor.focus_set()
 
     def run(self) -> None:
         self.root.mainloop()
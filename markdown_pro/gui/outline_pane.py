@@ -0,0 +1,121 @@
+from __future__ import annotations
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import List, Optional, Tuple
+
+from markdown_pro.core.outline import Outline
+from markdown_pro.gui.frame_scheduler import PRIORITY_PANELS
+
+
+class OutlinePane(ttk.Frame):
+    """
+    Painel com os títulos do documento (vindos do Outline do editor).
+    Clicar num título leva o cursor até ele. O Outline só avisa quando a
+    sequência de títulos muda; aí o painel troca o texto dos itens que
+    mudaram ou, se os níveis mudaram, refaz a árvore a partir do primeiro
+    título diferente, dentro do orçamento de cada quadro do editor. As
+    linhas não ficam no painel: o clique pergunta ao Outline.
+    """
+
+    def __init__(self, master: tk.Widget, editor) -> None:
+        super().__init__(master, width=220)
+        self.editor = editor
+        # (nível, título) e item de cada título já na árvore, em ordem
+        self._shape: List[Tuple[int, str]] = []
+        self._items: List[str] = []
+        # reconstrução em andamento: títulos a inserir e pilha de pais
+        self._target: Optional[List[Tuple[int, str]]] = None
+        self._stack: List[Tuple[int, str]] = []
+
+        self.tree = ttk.Treeview(self, show="tree", selectmode="browse")
+        scroll = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        # clique (inclusive no item já selecionado) ou Enter
+        self.tree.bind("<ButtonRelease-1>", self._on_select)
+        self.tree.bind("<Return>", self._on_select)
+
+        self._task = editor.scheduler.add_task("outline_pane", self._refresh_step, PRIORITY_PANELS)
+        editor.add_outline_listener(self.refresh)
+        self.bind("<Destroy>", self._on_destroy)
+        self.refresh(editor.outline)
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self:
+            self.editor.remove_outline_listener(self.refresh)
+            self._task.remove()
+
+    def refresh(self, outline: Outline) -> None:
+        # recomeça a partir do que já está na árvore
+        self._target = None
+        self._task.mark_dirty()
+
+    def _refresh_step(self, deadline: float) -> bool:
+        if self._target is None:
+            shape = [(h.level, h.title) for h in self.editor.outline.headings]
+            if shape == self._shape:
+                return True
+            if not self._start(shape):
+                return True
+        return self._insert(deadline)
+
+    def _start(self, shape: List[Tuple[int, str]]) -> bool:
+        """Prepara a árvore para `shape`; False se bastou trocar textos."""
+        old = self._shape
+        if len(old) == len(shape) and all(a[0] == b[0] for a, b in zip(old, shape)):
+            for item, a, b in zip(self._items, old, shape):
+                if a != b:
+                    self.tree.item(item, text=b[1] or "(sem título)")
+            self._shape = shape
+            return False
+
+        keep = 0
+        for a, b in zip(old, shape):
+            if a != b:
+                break
+            keep += 1
+        if keep < len(self._items):
+            # de trás para frente: os descendentes vêm depois do pai
+            self.tree.delete(*reversed(self._items[keep:]))
+        del self._items[keep:]
+        del self._shape[keep:]
+        # pilha de (nível, item) para aninhar os títulos
+        self._stack = []
+        for (level, _title), item in zip(self._shape, self._items):
+            while self._stack and self._stack[-1][0] >= level:
+                self._stack.pop()
+            self._stack.append((level, item))
+        self._target = shape
+        return True
+
+    def _insert(self, deadline: float) -> bool:
+        target, stack = self._target, self._stack
+        while len(self._shape) < len(target):
+            level, title = target[len(self._shape)]
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            parent = stack[-1][1] if stack else ""
+            item = self.tree.insert(parent, tk.END, text=title or "(sem título)", open=True)
+            self._shape.append((level, title))
+            self._items.append(item)
+            stack.append((level, item))
+            # pelo menos um por quadro; o resto fica para o próximo
+            if len(self._shape) < len(target) and time.perf_counter() >= deadline:
+                return False
+        self._target = None
+        return True
+
+    def _on_select(self, _event=None) -> None:
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self._items:
+            return
+        k = self._items.index(selection[0])
+        headings = self.editor.outline.headings
+        if k >= len(headings):
+            return
+        index = f"{headings[k].line}.0"
+        self.editor.mark_set(tk.INSERT, index)
+        self.editor.see(index)
+        self.editor.focus_set()
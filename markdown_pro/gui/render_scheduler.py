@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import tkinter as tk
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from markdown_pro.utils import trace
+
+if TYPE_CHECKING:
+    from markdown_pro.core.markdown_processor import MarkdownProcessor, RenderResult
+
+
+@dataclass
+class RenderOutcome:
+    revision: int
+    result: Optional["RenderResult"]
+    elapsed_ms: float
+    error: Optional[BaseException] = None
+
+
+class RenderScheduler:
+    """
+    Converte Markdown numa thread de trabalho, fora do mainloop do Tk.
+
+    Pedidos são agrupados: só a revisão mais nova fica pendente, e um
+    resultado que chega depois de um pedido mais novo é descartado (a
+    conversão em andamento não pode ser interrompida, mas não vai à tela).
+    Os resultados voltam ao mainloop por uma fila consultada com `after`.
+    """
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        on_result: Callable[[RenderOutcome], None],
+        after_render: Optional[Callable[["RenderResult"], None]] = None,
+        poll_ms: int = 30,
+    ) -> None:
+        self.root = root
+        self.on_result = on_result
+        # roda na thread de trabalho (ex.: gravar o arquivo de preview)
+        self.after_render = after_render
+        self.poll_ms = poll_ms
+
+        self._cond = threading.Condition()
+        # (geração, revisão, texto, toc); a geração avança a cada pedido/cancelamento
+        self._pending: Optional[tuple[int, int, str, Optional[list]]] = None
+        self._generation = 0
+        self._working = False
+        self._closed = False
+        self._results: "queue.Queue[tuple[int, RenderOutcome]]" = queue.Queue()
+        self._poll_id: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._processor: Optional["MarkdownProcessor"] = None
+
+    def request(self, revision: int, text: str, toc: Optional[List[Dict[str, Any]]] = None) -> None:
+        """`toc`: sumário já pronto (Outline do editor) para um [TOC] no texto."""
+        with self._cond:
+            self._generation += 1
+            self._pending = (self._generation, revision, text, toc)
+            self._cond.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="render-worker", daemon=True)
+            self._thread.start()
+        self._ensure_polling()
+
+    def cancel(self) -> None:
+        """Descarta o pedido pendente e qualquer resultado em andamento."""
+        with self._cond:
+            self._pending = None
+            self._generation += 1
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._pending = None
+            self._cond.notify()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    # ---------- worker ----------
+    def _run(self) -> None:
+        # o processador (e o import pesado do markdown) vive só nesta thread
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                generation, revision, text, toc = self._pending
+                self._pending = None
+                self._working = True
+
+            start = time.perf_counter()
+            try:
+                if self._processor is None:
+                    from markdown_pro.core.markdown_processor import MarkdownProcessor
+
+                    # preview: classes CSS em vez de estilos inline (HTML menor a cada gravação)
+                    self._processor = MarkdownProcessor(code_css_classes=True)
+                with trace.span("render", chars=len(text)):
+                    result = self._processor.render_incremental(text, toc)
+                if self.after_render is not None and not self._is_stale(generation):
+                    self.after_render(result)
+                outcome = RenderOutcome(revision, result, _ms_since(start))
+            except Exception as ex:
+                outcome = RenderOutcome(revision, None, _ms_since(start), error=ex)
+
+            with self._cond:
+                if generation == self._generation:
+                    self._results.put((generation, outcome))
+                self._working = False
+
+    def _is_stale(self, generation: int) -> bool:
+        with self._cond:
+            return generation != self._generation
+
+    # ---------- mainloop ----------
+    def _ensure_polling(self) -> None:
+        if self._poll_id is None and not self._closed:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        while True:
+            try:
+                generation, outcome = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # pode ter ficado velho enquanto esperava na fila
+            if not self._is_stale(generation):
+                self.on_result(outcome)
+
+        # continua consultando enquanto houver conversão pendente/em andamento
+        with self._cond:
+            busy = self._working or self._pending is not None or not self._results.empty()
+        if busy:
+            self._ensure_polling()
+
+
+def _ms_since(start: float) -> float:
+    return (time.perf_counter() - start) * 1000.0
@@ -0,0 +1,206 @@
+from __future__ import annotations
+import sqlite3
+import time
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk, filedialog
+from typing import Callable, List, Optional
+
+from markdown_pro.core.workspace_index import SearchHit, WorkspaceIndex
+from markdown_pro.utils import trace
+
+# espera depois de digitar antes de consultar o índice
+SEARCH_DEBOUNCE_MS = 150
+
+
+class WorkspaceSearchDialog(tk.Toplevel):
+    """
+    Busca em todos os Markdown de uma pasta. O índice (SQLite em
+    ~/.markdown-pro/index) é atualizado em segundo plano ao abrir o diálogo;
+    as consultas vão direto ao índice, também numa thread, então respondem
+    enquanto se digita (resposta de uma consulta já substituída é descartada).
+    """
+
+    def __init__(
+        self,
+        master: tk.Widget,
+        root_dir: Path,
+        run_in_background: Callable,
+        on_open: Callable[[Path, int], None],
+    ) -> None:
+        super().__init__(master)
+        self.title("Buscar no workspace")
+        self.geometry("720x420")
+        self.run_in_background = run_in_background
+        self.on_open = on_open
+
+        self.dir_var = tk.StringVar(value=str(root_dir))
+        self.query_var = tk.StringVar()
+        self.status_var = tk.StringVar()
+
+        self._index: Optional[WorkspaceIndex] = None
+        self._hits: List[SearchHit] = []
+        self._search_after_id = None
+        # cada consulta ganha um número; só a mais recente é mostrada
+        self._search_generation = 0
+        self._indexing = False
+
+        self._build()
+        self._bind()
+        self.transient(master)
+        self.query_entry.focus_set()
+        self._reindex()
+
+    def _build(self) -> None:
+        frm = ttk.Frame(self)
+        frm.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
+
+        ttk.Label(frm, text="Pasta:").grid(row=0, column=0, sticky="w")
+        ttk.Entry(frm, textvariable=self.dir_var, state="readonly")\
+            .grid(row=0, column=1, sticky="we")
+        ttk.Button(frm, text="Escolher...", command=self._choose_dir)\
+            .grid(row=0, column=2, padx=(8, 0))
+
+        ttk.Label(frm, text="Buscar:").grid(row=1, column=0, sticky="w", pady=(6, 0))
+        self.query_entry = ttk.Entry(frm, textvariable=self.query_var)
+        self.query_entry.grid(row=1, column=1, sticky="we", pady=(6, 0))
+        ttk.Button(frm, text="Reindexar", command=self._reindex)\
+            .grid(row=1, column=2, padx=(8, 0), pady=(6, 0))
+
+        lst = ttk.Frame(frm)
+        lst.grid(row=2, column=0, columnspan=3, sticky="nsew", pady=(8, 0))
+        self.results = tk.Listbox(lst, activestyle="none", font=("DejaVu Sans Mono", 10))
+        scroll = ttk.Scrollbar(lst, orient=tk.VERTICAL, command=self.results.yview)
+        self.results.configure(yscrollcommand=scroll.set)
+        self.results.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        ttk.Label(frm, textvariable=self.status_var, anchor="w")\
+            .grid(row=3, column=0, columnspan=3, sticky="we", pady=(6, 0))
+
+        frm.columnconfigure(1, weight=1)
+        frm.rowconfigure(2, weight=1)
+
+    def _bind(self) -> None:
+        self.bind("<Escape>", lambda e: self.destroy())
+        self.bind("<Destroy>", self._on_destroy)
+        self.query_entry.bind("<Return>", lambda e: self._open_selected(0))
+        self.query_entry.bind("<Down>", lambda e: self._focus_results())
+        self.results.bind("<Return>", lambda e: self._open_selected())
+        self.results.bind("<Double-Button-1>", lambda e: self._open_selected())
+        self.query_var.trace_add("write", lambda *_: self._schedule_search())
+
+    def _on_destroy(self, event) -> None:
+        if event.widget is self and self._search_after_id:
+            self.after_cancel(self._search_after_id)
+
+    # ---------- índice ----------
+    def _choose_dir(self) -> None:
+        path = filedialog.askdirectory(parent=self, initialdir=self.dir_var.get(), mustexist=True)
+        if path:
+            self.dir_var.set(path)
+            self._reindex()
+
+    def _reindex(self) -> None:
+        if self._indexing:
+            return
+        index = self._index = WorkspaceIndex(Path(self.dir_var.get()))
+        self._indexing = True
+        self.status_var.set("Indexando...")
+
+        def work():
+            try:
+                with trace.span("workspace_index") as span:
+                    stats = index.update()
+                    span.set(indexed=stats.indexed, unchanged=stats.unchanged)
+                return stats
+            except (OSError, sqlite3.Error):
+                return None
+
+        self.run_in_background(work, lambda stats: self._on_indexed(index, stats))
+
+    def _on_indexed(self, index: WorkspaceIndex, stats) -> None:
+        self._indexing = False
+        if not self.winfo_exists():
+            return
+        if index is not self._index:
+            # trocaram de pasta no meio: indexa a nova
+            self._reindex()
+            return
+        if stats is None:
+            self.status_var.set("Erro ao indexar a pasta.")
+            return
+        self.status_var.set(
+            f"{stats.indexed + stats.unchanged} arquivos indexados "
+            f"({stats.indexed} atualizados em {stats.seconds:.1f} s)"
+        )
+        self._search()
+
+    # ---------- consulta ----------
+    def _schedule_search(self) -> None:
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._search)
+
+    def _search(self) -> None:
+        self._search_after_id = None
+        self._search_generation += 1
+        generation = self._search_generation
+        query = self.query_var.get()
+        index = self._index
+        if index is None or not query.strip():
+            self._show([])
+            return
+
+        def work():
+            # SQLite + leitura das linhas dos acertos: fora da thread do Tk
+            start = time.perf_counter()
+            try:
+                hits = index.search(query)
+            except (OSError, sqlite3.Error):
+                hits = None
+            return hits, (time.perf_counter() - start) * 1000
+
+        self.run_in_background(work, lambda result: self._on_searched(generation, index, result))
+
+    def _on_searched(self, generation: int, index: WorkspaceIndex, result) -> None:
+        if not self.winfo_exists():
+            return
+        if generation != self._search_generation or index is not self._index:
+            # já digitaram outra coisa (ou trocaram de pasta)
+            return
+        hits, elapsed = result
+        if hits is None:
+            self._show([])
+            self.status_var.set("Erro ao consultar o índice.")
+            return
+        trace.record("workspace_search", elapsed, hits=len(hits))
+        self._show(hits)
+        suffix = " (indexando...)" if self._indexing else ""
+        self.status_var.set(f"{len(hits)} resultados em {elapsed:.0f} ms{suffix}")
+
+    def _show(self, hits: List[SearchHit]) -> None:
+        self._hits = hits
+        self.results.delete(0, tk.END)
+        for hit in hits:
+            try:
+                name = hit.path.relative_to(self._index.root)
+            except ValueError:
+                name = hit.path
+            self.results.insert(tk.END, f"{name}:{hit.line}  {hit.text}")
+
+    def _focus_results(self):
+        if self._hits:
+            self.results.focus_set()
+            self.results.selection_clear(0, tk.END)
+            self.results.selection_set(0)
+            self.results.activate(0)
+        return "break"
+
+    def _open_selected(self, default: Optional[int] = None) -> None:
+        selection = self.results.curselection()
+        i = selection[0] if selection else default
+        if i is None or i >= len(self._hits):
+            return
+        hit = self._hits[i]
+        self.on_open(hit.path, hit.line)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from markdown_pro.tests.corpus import format_size, parse_size
+
+
+# configuração por variável de ambiente (vale para o pytest e para o CLI)
+ENV_SIZES = "MARKDOWN_PRO_BENCH_SIZES"
+ENV_OUT = "MARKDOWN_PRO_BENCH_OUT"
+ENV_BASELINE = "MARKDOWN_PRO_BENCH_BASELINE"
+ENV_THRESHOLD = "MARKDOWN_PRO_BENCH_THRESHOLD"
+
+DEFAULT_SIZES = "1K,64K,1M"
+# regressão: mediana mais de 25% acima da baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...e pelo menos 2 ms de diferença (abaixo disso é ruído)
+MIN_REGRESSION_MS = 2.0
+# cada medição repete até REPEAT vezes ou até gastar TIME_BUDGET_S
+REPEAT = 5
+TIME_BUDGET_S = 2.0
+
+
+@dataclass
+class BenchResult:
+    name: str
+    size: str
+    runs: int
+    median_ms: float
+    best_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+@dataclass
+class Regression:
+    key: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ms / self.baseline_ms if self.baseline_ms else float("inf")
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.baseline_ms:.1f} ms -> {self.current_ms:.1f} ms ({self.ratio:.2f}x)"
+
+
+@dataclass
+class BenchRun:
+    results: Dict[str, BenchResult] = field(default_factory=dict)
+
+    def measure(
+        self,
+        name: str,
+        size: int,
+        fn: Callable[[], object],
+        setup: Optional[Callable[[], object]] = None,
+        repeat: int = REPEAT,
+    ) -> BenchResult:
+        """
+        Mede `fn` (sem argumentos); `setup` roda antes de cada repetição,
+        fora do tempo medido. A primeira chamada é aquecimento e não conta.
+        """
+        if setup is not None:
+            setup()
+        fn()
+        timings: List[float] = []
+        deadline = time.perf_counter() + TIME_BUDGET_S
+        while len(timings) < repeat and (not timings or time.perf_counter() < deadline):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000.0)
+        result = BenchResult(name, format_size(size), len(timings), statistics.median(timings), min(timings))
+        self.results[result.key] = result
+        return result
+
+    def to_json(self) -> dict:
+        return {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": {key: asdict(r) for key, r in sorted(self.results.items())},
+        }
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_json(), indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def load_results(path: Path) -> Dict[str, float]:
+    """Medianas (ms) por chave de um JSON gravado por BenchRun.write()."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {key: float(r["median_ms"]) for key, r in data.get("results", {}).items()}
+
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Regression]:
+    """Caminhos medidos nos dois lados que ficaram mais lentos além do limite."""
+    out = []
+    for key, now in sorted(current.items()):
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if now > before * (1.0 + threshold) and now - before >= MIN_REGRESSION_MS:
+            out.append(Regression(key, before, now))
+    return out
+
+
+def configured_sizes() -> List[int]:
+    raw = os.environ.get(ENV_SIZES) or DEFAULT_SIZES
+    return [parse_size(part) for part in raw.split(",") if part.strip()]
+
+
+def configured_threshold() -> float:
+    raw = os.environ.get(ENV_THRESHOLD)
+    return float(raw) if raw else DEFAULT_THRESHOLD
+
+
+def configured_baseline() -> Optional[Path]:
+    raw = os.environ.get(ENV_BASELINE)
+    return Path(raw).expanduser() if raw else None
+
+
+def configured_output() -> Path:
+    raw = os.environ.get(ENV_OUT)
+    if raw:
+        return Path(raw).expanduser()
+    from markdown_pro.utils.paths import bench_dir
+
+    return bench_dir() / "latest.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Compara dois JSONs de resultados: python -m markdown_pro.tests.bench ATUAL BASELINE"""
+    p = argparse.ArgumentParser(prog="markdown_pro.tests.bench", description="Compara resultados de benchmark.")
+    p.add_argument("current", type=Path)
+    p.add_argument("baseline", type=Path)
+    p.add_argument("--threshold", type=float, default=configured_threshold())
+    args = p.parse_args(argv)
+
+    current, baseline = load_results(args.current), load_results(args.baseline)
+    for key in sorted(current):
+        before = baseline.get(key)
+        delta = f"{current[key] / before:6.2f}x" if before else "   novo"
+        print(f"{key:45} {current[key]:10.1f} ms {delta}")
+    regressions = compare(current, baseline, args.threshold)
+    for r in regressions:
+        print(f"REGRESSÃO {r}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import pytest
+
+from markdown_pro.tests.bench import (
+    REPEAT,
+    BenchRun,
+    compare,
+    configured_baseline,
+    configured_output,
+    configured_sizes,
+    configured_threshold,
+    load_results,
+)
+from markdown_pro.tests.corpus import format_size, generate_markdown
+
+
+def pytest_generate_tests(metafunc) -> None:
+    # todo teste com argumento `size` roda uma vez por tamanho configurado
+    if "size" in metafunc.fixturenames:
+        sizes = configured_sizes()
+        metafunc.parametrize("size", sizes, ids=[format_size(s) for s in sizes])
+
+
+@pytest.fixture(scope="session")
+def bench_run():
+    run = BenchRun()
+    yield run
+    if run.results:
+        run.write(configured_output())
+
+
+@pytest.fixture(scope="session")
+def baseline() -> Dict[str, float]:
+    path = configured_baseline()
+    return load_results(path) if path is not None else {}
+
+
+@pytest.fixture
+def bench(bench_run: BenchRun, baseline: Dict[str, float]) -> Callable:
+    """Mede, grava no JSON da sessão e falha se regrediu em relação à baseline."""
+
+    def measure(name: str, size: int, fn, setup=None, repeat: int = REPEAT):
+        result = bench_run.measure(name, size, fn, setup, repeat)
+        regressions = compare({result.key: result.median_ms}, baseline, configured_threshold())
+        if regressions:
+            pytest.fail(f"Regressão de desempenho: {regressions[0]}")
+        return result
+
+    return measure
+
+
+@pytest.fixture(scope="session")
+def corpus() -> Callable[[int], str]:
+    docs: Dict[int, str] = {}
+
+    def get(size: int) -> str:
+        if size not in docs:
+            docs[size] = generate_markdown(size)
+        return docs[size]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def corpus_file(corpus, tmp_path_factory) -> Callable[[int], Path]:
+    folder = tmp_path_factory.mktemp("corpus")
+
+    def get(size: int) -> Path:
+        path = folder / f"doc-{format_size(size)}.md"
+        if not path.exists():
+            path.write_text(corpus(size), encoding="utf-8")
+        return path
+
+    return get
+
+
+# ---------- Tk (benchmarks do editor) ----------
+@pytest.fixture(scope="session")
+def tk_root():
+    """Raiz Tk oculta; sem DISPLAY, sobe um Xvfb se ele estiver instalado."""
+    tk = pytest.importorskip("tkinter")
+    xvfb = None
+    if not os.environ.get("DISPLAY"):
+        xvfb = _start_xvfb()
+        if xvfb is None:
+            pytest.skip("sem display: defina DISPLAY ou instale o Xvfb")
+    try:
+        root = tk.Tk()
+    except tk.TclError as ex:
+        _stop_xvfb(xvfb)
+        pytest.skip(f"Tk indisponível: {ex}")
+    root.withdraw()
+    yield root
+    root.destroy()
+    _stop_xvfb(xvfb)
+
+
+def _start_xvfb() -> Optional[subprocess.Popen]:
+    binary = shutil.which("Xvfb")
+    if binary is None:
+        return None
+    for number in range(99, 120):
+        if Path(f"/tmp/.X11-unix/X{number}").exists():
+            continue
+        proc = subprocess.Popen(
+            [binary, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # espera o socket aparecer (ou o processo morrer: display ocupado)
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline and proc.poll() is None:
+            if Path(f"/tmp/.X11-unix/X{number}").exists():
+                os.environ["DISPLAY"] = f":{number}"
+                return proc
+            time.sleep(0.05)
+        _stop_xvfb(proc)
+    return None
+
+
+def _stop_xvfb(proc: Optional[subprocess.Popen]) -> None:
+    if proc is None:
+        return
+    os.environ.pop("DISPLAY", None)
+    proc.terminate()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
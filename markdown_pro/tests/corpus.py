@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import random
+import re
+from typing import List
+
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*$", re.I)
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+_WORDS = (
+    "markdown editor texto arquivo documento linha bloco código tabela lista "
+    "título seção exemplo conteúdo função valor busca índice cache render "
+    "prévia exportação configuração usuário página nota referência atalho "
+    "janela cursor parágrafo estrutura desempenho memória leitura gravação"
+).split()
+_LANGS = ("python", "javascript", "bash", "json", "yaml", "sql", "text")
+_CODE = {
+    "python": ["def {w}(x):", "    return x * {n}", "class {W}:", "    pass", "for i in range({n}):", "    print(i, '{w}')"],
+    "javascript": ["function {w}(x) {{", "  return x + {n};", "}}", "const {w} = [{n}, {n}];", "console.log({w});"],
+    "bash": ["echo \"{w}\"", "ls -la /tmp/{w}", "for f in *.md; do wc -l \"$f\"; done", "export {W}={n}"],
+    "json": ["{{", "  \"{w}\": {n},", "  \"lista\": [{n}, {n}]", "}}"],
+    "yaml": ["{w}: {n}", "itens:", "  - {w}", "  - {n}"],
+    "sql": ["SELECT {w}, COUNT(*) FROM t", "WHERE id > {n}", "GROUP BY {w};"],
+    "text": ["{w} {w} {n}", "linha simples de {w}"],
+}
+
+
+def parse_size(value: str) -> int:
+    """"1K", "64KB", "1.5M", "100M" -> bytes."""
+    m = _SIZE_RE.match(value)
+    if not m:
+        raise ValueError(f"Tamanho inválido: {value!r}")
+    return int(float(m.group(1)) * _UNITS[m.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    for unit in ("G", "M", "K"):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return str(size)
+
+
+def generate_markdown(size: int, seed: int = 0) -> str:
+    """
+    Documento Markdown sintético com ~`size` bytes (UTF-8): front matter,
+    títulos de todos os níveis, parágrafos com ênfase/links/notas, blocos
+    de código, tabelas, listas e citações. Mesmo `size` e `seed`, mesmo texto.
+    """
+    rnd = random.Random(f"{seed}:{size}")
+    out: List[str] = [_front_matter(rnd)]
+    used = len(out[0].encode("utf-8"))
+    footnotes = 0
+    section = 0
+    while used < size:
+        section += 1
+        block = _section(rnd, section, footnotes)
+        footnotes += block.count("[^")
+        out.append(block)
+        used += len(block.encode("utf-8"))
+    # definições das notas no fim, como num documento de verdade
+    if footnotes:
+        out.append("\n".join(f"[^n{i}]: Nota {i} sobre {rnd.choice(_WORDS)}." for i in range(footnotes)) + "\n")
+    return "".join(out)
+
+
+def _front_matter(rnd: random.Random) -> str:
+    tags = ", ".join(rnd.sample(_WORDS, 3))
+    return (
+        "---\n"
+        f"title: Documento de {rnd.choice(_WORDS)}\n"
+        "author: Equipe Markdown Pro\n"
+        f"tags: [{tags}]\n"
+        "draft: false\n"
+        "---\n\n"
+    )
+
+
+def _section(rnd: random.Random, number: int, footnotes: int) -> str:
+    parts = [f"{'#' * (1 + number % 6)} Seção {number}: {_sentence(rnd, 3, 6).rstrip('.')}\n"]
+    for _ in range(rnd.randint(2, 6)):
+        kind = rnd.random()
+        if kind < 0.45:
+            parts.append(_paragraph(rnd, footnotes))
+            footnotes += parts[-1].count("[^")
+        elif kind < 0.6:
+            parts.append(_code(rnd))
+        elif kind < 0.72:
+            parts.append(_table(rnd))
+        elif kind < 0.88:
+            parts.append(_list(rnd))
+        else:
+            parts.append("> " + _sentence(rnd, 8, 20) + "\n")
+    return "\n".join(parts) + "\n"
+
+
+def _sentence(rnd: random.Random, lo: int, hi: int) -> str:
+    words = [rnd.choice(_WORDS) for _ in range(rnd.randint(lo, hi))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rnd: random.Random, footnotes: int) -> str:
+    sentences = []
+    for _ in range(rnd.randint(2, 5)):
+        s = _sentence(rnd, 6, 18)
+        r = rnd.random()
+        if r < 0.2:
+            w = rnd.choice(_WORDS)
+            s = s.replace(w, f"**{w}**", 1)
+        elif r < 0.35:
+            w = rnd.choice(_WORDS)
+            s = s.replace(w, f"*{w}*", 1)
+        elif r < 0.45:
+            s += f" Veja [{rnd.choice(_WORDS)}](https://example.com/{rnd.randrange(1000)})."
+        elif r < 0.5:
+            s += f" Use `{rnd.choice(_WORDS)}()`."
+        elif r < 0.55:
+            s += f"[^n{footnotes}]"
+            footnotes += 1
+        sentences.append(s)
+    return " ".join(sentences) + "\n"
+
+
+def _code(rnd: random.Random) -> str:
+    lang = rnd.choice(_LANGS)
+    lines = []
+    for _ in range(rnd.randint(3, 12)):
+        w = rnd.choice(_WORDS)
+        lines.append(rnd.choice(_CODE[lang]).format(w=w, W=w.capitalize(), n=rnd.randrange(100)))
+    return f"```{lang}\n" + "\n".join(lines) + "\n```\n"
+
+
+def _table(rnd: random.Random) -> str:
+    cols = rnd.randint(2, 5)
+    header = "| " + " | ".join(rnd.choice(_WORDS).capitalize() for _ in range(cols)) + " |"
+    rule = "|" + "|".join("---" for _ in range(cols)) + "|"
+    rows = [
+        "| " + " | ".join(str(rnd.randrange(1000)) if rnd.random() < 0.5 else rnd.choice(_WORDS) for _ in range(cols)) + " |"
+        for _ in range(rnd.randint(2, 8))
+    ]
+    return "\n".join([header, rule, *rows]) + "\n"
+
+
+def _list(rnd: random.Random) -> str:
+    lines = []
+    for _ in range(rnd.randint(2, 6)):
+        indent = "  " * rnd.choice((0, 0, 1))
+        marker = "-" if rnd.random() < 0.7 else "1."
+        lines.append(f"{indent}{marker} {_sentence(rnd, 3, 10)}")
+    return "\n".join(lines) + "\n"
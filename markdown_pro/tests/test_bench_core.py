@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+from markdown_pro.core import code_highlight
+from markdown_pro.core.document_manager import DocumentManager
+from markdown_pro.core.front_matter import parse_front_matter
+from markdown_pro.core.markdown_processor import MarkdownProcessor
+from markdown_pro.tests.corpus import generate_markdown, parse_size
+
+# PDF de documentos maiores leva minutos: fica fora mesmo se o tamanho for pedido
+PDF_MAX_SIZE = parse_size("256K")
+
+
+def test_corpus_is_deterministic():
+    size = parse_size("64K")
+    text = generate_markdown(size)
+    assert text == generate_markdown(size)
+    assert text != generate_markdown(size, seed=1)
+    assert size <= len(text.encode("utf-8")) < size * 1.2
+    for marker in ("---\ntitle:", "```python", "|---|", "[^n0]:", "###### "):
+        assert marker in text
+
+
+def test_render(bench, corpus, size):
+    text = corpus(size)
+    # sem cache de resultado; o cache de código é limpo a cada repetição
+    processor = MarkdownProcessor(cache_bytes=0)
+    bench("render", size, lambda: processor.render(text), setup=code_highlight.clear_cache)
+
+
+def test_parse_front_matter(bench, corpus, size):
+    text = corpus(size)
+    bench("parse_front_matter", size, lambda: parse_front_matter(text).content)
+
+
+def test_document_open(bench, corpus_file, size, tmp_path, monkeypatch):
+    # arquivos recentes vão para um HOME descartável
+    monkeypatch.setenv("HOME", str(tmp_path))
+    path = corpus_file(size)
+    manager = DocumentManager()
+    bench("document_open", size, lambda: manager.open_document(path))
+
+
+def test_document_save(bench, corpus_file, size, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    manager = DocumentManager()
+    manager.open_document(corpus_file(size))
+    targets = iter(range(1_000_000))
+
+    def save():
+        # arquivo novo a cada vez: a gravação não é pulada por hash igual
+        manager.save_as(tmp_path / f"save-{next(targets)}.md")
+        manager.writer.wait()
+
+    bench("document_save", size, save)
+
+
+def test_pdf_export(bench, corpus, size, tmp_path):
+    if size > PDF_MAX_SIZE:
+        pytest.skip("documento grande demais para o benchmark de PDF")
+    from markdown_pro.export.pdf import PdfWriter
+
+    try:
+        writer = PdfWriter()
+    except (ImportError, OSError) as ex:
+        pytest.skip(f"WeasyPrint indisponível: {ex}")
+    html = MarkdownProcessor().render(corpus(size)).html_full
+    target = tmp_path / "out.pdf"
+    bench("pdf_export", size, lambda: writer.write(html, target), repeat=3)
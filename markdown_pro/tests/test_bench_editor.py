@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from markdown_pro.gui import find_replace_dialog
+from markdown_pro.gui.editor_widget import EditorWidget
+from markdown_pro.gui.find_replace_dialog import FindReplaceDialog
+from markdown_pro.gui.line_numbers import LineNumbers
+
+
+@pytest.fixture
+def editor(tk_root):
+    # o editor precisa estar mapeado (dlineinfo, geometria); só a raiz fica oculta
+    host = tk.Toplevel(tk_root)
+    host.geometry("900x700+0+0")
+    widget = EditorWidget(host)
+    numbers = LineNumbers(host, widget)
+    numbers.pack(side=tk.LEFT, fill=tk.Y)
+    widget.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+    host.update()
+    yield widget, numbers
+    host.destroy()
+
+
+def test_markdown_highlight(bench, corpus, size, editor):
+    widget, _ = editor
+    widget.set_content(corpus(size))
+    widget.update_idletasks()
+    bench(
+        "editor_highlight",
+        size,
+        widget._apply_markdown_highlight,
+        setup=widget._highlighter.invalidate_all,
+    )
+
+
+def test_line_numbers_redraw(bench, corpus, size, editor):
+    widget, numbers = editor
+    widget.set_content(corpus(size))
+    widget.update_idletasks()
+    positions = iter([0.0, 0.5, 0.25, 0.75, 1.0] * 100)
+
+    def scroll():
+        # outra posição a cada repetição; o redraw agendado pelo scroll roda aqui
+        widget.yview_moveto(next(positions))
+        widget.update_idletasks()
+        numbers._last_key = None
+
+    bench("line_numbers_redraw", size, numbers.redraw, setup=scroll)
+
+
+def test_replace_all(bench, corpus, size, editor, monkeypatch):
+    widget, _ = editor
+    text = corpus(size)
+    monkeypatch.setattr(find_replace_dialog.messagebox, "showinfo", lambda *a, **k: None)
+    dialog = FindReplaceDialog(widget.master, widget)
+    dialog.find_var.set("texto")
+    dialog.replace_var.set("TEXTO")
+    try:
+        bench("replace_all", size, dialog.replace_all, setup=lambda: widget.set_content(text))
+    finally:
+        dialog.destroy()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import stat
+
+import pytest
+
+from markdown_pro.core import file_writer
+from markdown_pro.core.file_writer import FileWriter, atomic_write
+from markdown_pro.core.rope import Rope
+
+
+def _save(writer: FileWriter, path, content):
+    results = []
+    writer.submit(path, content, results.append)
+    assert writer.wait(10)
+    (result,) = results
+    assert result.error is None
+    return result
+
+
+def _mode(path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_unchanged_content_is_not_written(tmp_path):
+    path = tmp_path / "doc.md"
+    writer = FileWriter()
+    first = _save(writer, path, Rope("olá\n" * 1000))
+    assert first.written
+    mtime = path.stat().st_mtime_ns
+
+    # mesmo conteúdo (de um Rope ou de str): só o hash, nada gravado
+    again = _save(writer, path, "olá\n" * 1000)
+    assert not again.written
+    assert again.digest == first.digest
+    assert path.stat().st_mtime_ns == mtime
+
+    changed = _save(writer, path, "outro\n")
+    assert changed.written
+    assert path.read_text(encoding="utf-8") == "outro\n"
+
+
+def test_external_change_same_size_is_detected(tmp_path):
+    path = tmp_path / "doc.md"
+    writer = FileWriter()
+    _save(writer, path, "aaaa")
+    path.write_text("bbbb", encoding="utf-8")
+    assert _save(writer, path, "aaaa").written
+    assert path.read_text(encoding="utf-8") == "aaaa"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="permissões POSIX")
+def test_new_file_follows_umask(tmp_path, monkeypatch):
+    # a umask é lida no import: simula a do processo
+    monkeypatch.setattr(file_writer, "_UMASK", 0o027)
+    path = tmp_path / "novo.md"
+    atomic_write(path, [b"x"])
+    assert _mode(path) == 0o640
+
+
+@pytest.mark.skipif(os.name != "posix", reason="permissões POSIX")
+def test_existing_file_keeps_mode(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("a", encoding="utf-8")
+    path.chmod(0o600)
+    _save(FileWriter(), path, "b")
+    assert _mode(path) == 0o600
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from markdown_pro.core import journal
+from markdown_pro.core.file_writer import content_digest
+from markdown_pro.core.journal import EditJournal, recover
+from markdown_pro.core.text_buffer import TextBuffer
+
+
+@pytest.fixture(autouse=True)
+def fast_flush(monkeypatch):
+    monkeypatch.setattr(journal, "FLUSH_INTERVAL_S", 0)
+
+
+def _edit(j: EditJournal, buffer: TextBuffer, start: int, end: int, text: str) -> None:
+    j.record(buffer.replace(start, end, text), buffer.snapshot())
+
+
+def test_crash_replay_inline_base(tmp_path):
+    buffer = TextBuffer("olá mundo")
+    j = EditJournal(tmp_path)
+    j.start(buffer.snapshot(), None, None)
+    _edit(j, buffer, 4, 9, "journal")
+    _edit(j, buffer, 0, 0, "# ")
+    # "queda": o processo some sem discard (close só grava o pendente)
+    j.close()
+
+    found = recover(tmp_path)
+    assert len(found) == 1
+    assert found[0].text == buffer.text() == "# olá journal"
+    assert found[0].path is None
+    assert found[0].journal_id == j.journal_id
+
+
+def test_crash_replay_file_base_and_truncated_line(tmp_path):
+    doc = tmp_path / "doc.md"
+    data = "linha 1\nlinha 2\n".encode("utf-8")
+    doc.write_bytes(data)
+    directory = tmp_path / "journal"
+    directory.mkdir()
+    buffer = TextBuffer(data.decode("utf-8"))
+    j = EditJournal(directory)
+    j.start(buffer.snapshot(), doc, content_digest([data]))
+    _edit(j, buffer, 7, 7, " editada")
+    j.close()
+    # última linha cortada no meio da gravação: ignorada
+    with open(directory / f"{j.journal_id}.journal", "a", encoding="utf-8") as f:
+        f.write('{"r": 9, "s": 0')
+
+    (found,) = recover(directory)
+    assert found.path == doc
+    assert found.text == "linha 1 editada\nlinha 2\n"
+
+    # o arquivo mudou no disco: a base não confere e o journal é apagado
+    doc.write_text("outro conteúdo", encoding="utf-8")
+    assert recover(directory) == []
+    assert not list(directory.glob("*.journal"))
+
+
+def test_compaction_rewrites_as_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(journal, "COMPACT_MIN_BYTES", 200)
+    buffer = TextBuffer("x" * 100)
+    j = EditJournal(tmp_path)
+    j.start(buffer.snapshot(), None, None)
+    for i in range(40):
+        _edit(j, buffer, i, i + 1, "yy")
+    j.close()
+
+    lines = (tmp_path / f"{j.journal_id}.journal").read_text(encoding="utf-8").splitlines()
+    # base + snapshot compactado + só as edições depois dele
+    assert json.loads(lines[0])["base"] == "inline"
+    assert len(lines) - 2 < 40
+    (found,) = recover(tmp_path)
+    assert found.text == buffer.text()
+
+
+def test_discard_removes_journal(tmp_path):
+    buffer = TextBuffer("a")
+    j = EditJournal(tmp_path)
+    j.start(buffer.snapshot(), None, None)
+    _edit(j, buffer, 1, 1, "b")
+    j.discard()
+    j.close()
+    assert not j.active
+    assert recover(tmp_path) == []
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from markdown_pro.core.outline import CODE, FENCE, FRONT_MATTER, HEADING, TEXT, Outline
+
+POOL = [
+    "---", "title: Outro", "# Título", "## Seção", "```", "~~~", "texto [link](a.md)", "", "```python",
+    "# Seção", "## Seção_1", "# Outra {#secao}", "texto {#secao_2}", "# ",
+]
+
+
+def _assert_same(outline: Outline, lines):
+    reference = Outline("\n".join(lines))
+    n = len(lines)
+    assert outline.line_count == n
+    assert [outline.kind(i) for i in range(1, n + 1)] == [reference.kind(i) for i in range(1, n + 1)]
+    assert outline.front_matter == reference.front_matter
+    assert outline.title == reference.title
+    assert outline.headings == reference.headings
+    assert outline.fences == reference.fences
+    assert outline.links == reference.links
+
+
+def test_kinds():
+    text = "---\ntitle: Doc\n---\n# A\n```\n# não é título\n```\ntexto"
+    outline = Outline(text)
+    assert [outline.kind(i) for i in range(1, 9)] == [
+        FRONT_MATTER, FRONT_MATTER, FRONT_MATTER, HEADING, FENCE, CODE, FENCE, TEXT
+    ]
+    assert outline.title == "Doc"
+    assert [h.title for h in outline.headings] == ["A"]
+
+
+def test_replace_lines_fence_propagation():
+    outline = Outline("# A\ntexto\n# B")
+    # abrir uma cerca engole o resto do documento
+    lo, hi = outline.replace_lines(2, 2, ["```"])
+    assert (lo, hi) == (2, 3)
+    assert outline.kind(3) == CODE
+    assert [h.title for h in outline.headings] == ["A"]
+    outline.replace_lines(2, 2, ["texto"])
+    assert [h.title for h in outline.headings] == ["A", "B"]
+
+
+def test_replace_lines_front_matter():
+    outline = Outline("---\ntitle: X\ntexto\n# A")
+    assert outline.front_matter is None
+    # fechar o front matter reclassifica do início
+    lo, _ = outline.replace_lines(3, 3, ["---"])
+    assert lo == 1
+    assert outline.front_matter == (1, 3)
+    assert outline.title == "X"
+    # edição depois dele não mexe no front matter
+    outline.replace_lines(4, 4, ["# B"])
+    assert outline.front_matter == (1, 3)
+    assert [h.title for h in outline.headings] == ["B"]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_replace_lines_matches_rebuild(seed):
+    rnd = random.Random(seed)
+    lines = [rnd.choice(POOL) for _ in range(30)]
+    lines[0] = "---"
+    outline = Outline("\n".join(lines))
+    for _ in range(300):
+        start = rnd.randint(1, len(lines))
+        end = rnd.randint(start, min(len(lines), start + 3))
+        new = [rnd.choice(POOL) for _ in range(rnd.randint(1, 4))]
+        lines[start - 1:end] = new
+        outline.replace_lines(start, end, new)
+        _assert_same(outline, lines)
+
+
+def test_duplicate_slugs_are_renumbered_locally():
+    outline = Outline("# A\n# A\ntexto\n# A")
+    assert [h.slug for h in outline.headings] == ["a", "a_1", "a_2"]
+    outline.replace_lines(1, 1, ["# B"])
+    assert [h.slug for h in outline.headings] == ["b", "a", "a_1"]
+    # id explícito em qualquer ponto reserva o slug
+    outline.replace_lines(3, 3, ["texto {#a}"])
+    assert [h.slug for h in outline.headings] == ["b", "a_1", "a_2"]
+
+
+def test_version_changes_only_with_structure():
+    outline = Outline("# A\ntexto\n\n# B [x](y)")
+    version = outline.version
+    outline.replace_lines(2, 2, ["texto maior"])
+    outline.replace_lines(3, 3, ["", ""])
+    assert outline.version == version
+    # as linhas andaram, mas a lista acompanha
+    assert [h.line for h in outline.headings] == [1, 5]
+    assert [link.line for link in outline.links] == [5]
+    outline.replace_lines(1, 1, ["# A2"])
+    assert outline.version != version
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from markdown_pro.core.markdown_processor import MarkdownProcessor
+from markdown_pro.core.outline import Outline
+from markdown_pro.tests.corpus import generate_markdown
+
+DOC = """---
+title: Documento
+---
+
+[TOC]
+
+# Introdução
+
+Texto com nota[^a] e `código`.
+
+## Repetido
+
+### Repetido
+
+## Título com id {#custom}
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+```python
+def f():
+    return 1
+```
+
+!!! note "Nota"
+    Conteúdo da admonition.
+
+- item 1
+- item 2
+
+> citação
+
+[^a]: A nota de rodapé.
+"""
+
+
+def _both(text: str, toc=None):
+    full = MarkdownProcessor(cache_bytes=0).render(text)
+    incremental = MarkdownProcessor(cache_bytes=0).render_incremental(text, toc)
+    return full, incremental
+
+
+@pytest.mark.parametrize("text", [DOC, DOC.replace("[^a]", ""), DOC.replace("[TOC]\n", "")])
+def test_incremental_matches_full(text):
+    full, incremental = _both(text)
+    assert incremental.html_body == full.html_body
+    assert incremental.metadata == full.metadata
+
+
+def test_incremental_heading_ids_and_toc():
+    full, incremental = _both(DOC, Outline(DOC).toc_tokens())
+    assert incremental.html_body == full.html_body
+    for anchor in ('id="introducao"', 'id="repetido"', 'id="repetido_1"', 'id="custom"', 'href="#custom"'):
+        assert anchor in incremental.html_body
+    assert 'id="fn:a"' in incremental.html_body
+
+
+HTML_DOCS = [
+    "<div>\n<div>\na\n</div>\n\nb\n</div>\n\npara\n",
+    "<!-- x\n\ny -->\n\npara\n",
+    "<details>\n<summary>Resumo</summary>\n\nTexto\n\n</details>\n\n# Depois\n",
+    # casos que o split não isola: conversão inteira
+    "<div>\nsem fechamento\n\npara\n",
+    "<div>\na\n</div> resto\n\npara\n",
+    "para\n<div>\n\nb\n</div>\n",
+    "<!-- sem fim\n\npara\n",
+]
+
+
+@pytest.mark.parametrize("text", HTML_DOCS)
+def test_incremental_raw_html(text):
+    full, incremental = _both(text)
+    assert incremental.html_body == full.html_body
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_incremental_matches_full_on_corpus(seed):
+    text = generate_markdown(20_000, seed=seed)
+    full, incremental = _both(text)
+    assert incremental.html_full == full.html_full
+
+
+def test_incremental_after_edits():
+    # o mesmo processador ao longo das edições: blocos em cache não podem vazar
+    rnd = random.Random(3)
+    processor = MarkdownProcessor(cache_bytes=0)
+    lines = DOC.split("\n")
+    for _ in range(15):
+        i = rnd.randrange(4, len(lines))
+        lines.insert(i, rnd.choice(["", "## Novo", "Parágrafo novo.", "Mais nota[^a].", "- outro item"]))
+        text = "\n".join(lines)
+        expected = MarkdownProcessor(cache_bytes=0).render(text).html_body
+        assert processor.render_incremental(text).html_body == expected
+
+
+def test_incremental_results_do_not_leak_into_render():
+    processor = MarkdownProcessor()
+    incremental = processor.render_incremental(DOC)
+    # o que sai por blocos nunca volta como resultado de render()
+    reference = MarkdownProcessor(cache_bytes=0).render(DOC)
+    full = processor.render(DOC)
+    assert full is not incremental
+    assert full.html_full == reference.html_full
+    assert processor.render_incremental(DOC) is incremental
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from markdown_pro.core.search import SearchError, SearchOptions, SearchResult
+
+TEXT = "Foo bar foo\nfood FOO\n"
+
+
+def _apply(text: str, edit) -> str:
+    start, end, replacement = edit
+    return text[:start] + replacement + text[end:]
+
+
+def test_literal_search_options():
+    assert len(SearchResult(TEXT, SearchOptions("foo"))) == 4
+    assert len(SearchResult(TEXT, SearchOptions("foo", case_sensitive=True))) == 2
+    assert SearchResult(TEXT, SearchOptions("foo", whole_word=True)).spans() == [(0, 3), (8, 11), (17, 20)]
+    # literal: metacaracteres não valem
+    assert len(SearchResult("a.b axb", SearchOptions("a.b"))) == 1
+
+
+def test_empty_matches_are_skipped():
+    assert len(SearchResult("abc\ndef", SearchOptions("^", regex=True))) == 0
+    assert SearchResult("baab", SearchOptions("a*", regex=True)).spans() == [(1, 3)]
+
+
+def test_next_and_prev_wrap_around():
+    result = SearchResult(TEXT, SearchOptions("foo"))
+    assert result.next_from(0) == 0
+    assert result.next_from(1) == 1
+    assert result.next_from(len(TEXT)) == 0
+    assert result.prev_from(0) == len(result) - 1
+    assert result.prev_from(9) == 1
+    assert SearchResult(TEXT, SearchOptions("zzz")).next_from(0) is None
+
+
+def test_replace_all_literal():
+    result = SearchResult(TEXT, SearchOptions("foo", whole_word=True))
+    edit = result.replace_all("x")
+    assert _apply(TEXT, edit) == "x bar x\nfood x\n"
+    # um único trecho, da primeira à última ocorrência
+    assert edit[:2] == (0, 20)
+    assert SearchResult(TEXT, SearchOptions("zzz")).replace_all("x") is None
+
+
+def test_replace_all_regex_groups():
+    text = "a=1, b=22, c=333"
+    options = SearchOptions(r"(\w)=(\d+)", regex=True)
+    edit = SearchResult(text, options).replace_all(r"\2:\1")
+    assert _apply(text, edit) == re.sub(options.pattern, r"\2:\1", text)
+    with pytest.raises(SearchError):
+        SearchResult(text, options).replace_all(r"\3")
+
+
+def test_invalid_regex():
+    with pytest.raises(SearchError):
+        SearchResult(TEXT, SearchOptions("(", regex=True))
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import random
+
+from markdown_pro.core.rope import Rope
+from markdown_pro.core.text_buffer import TextBuffer
+
+ALPHABET = "ab \n#çé😀"
+
+
+def _random_edit(rnd: random.Random, length: int):
+    start = rnd.randint(0, length)
+    end = rnd.randint(start, min(length, start + 8))
+    text = "".join(rnd.choice(ALPHABET) for _ in range(rnd.randint(0, 6)))
+    return start, end, text
+
+
+def _line_col(text: str, offset: int) -> str:
+    before = text[:offset]
+    return f"{before.count(chr(10)) + 1}.{offset - (before.rfind(chr(10)) + 1)}"
+
+
+def test_rope_matches_str():
+    rnd = random.Random(0)
+    text = "".join(rnd.choice(ALPHABET) for _ in range(5000))
+    rope = Rope(text)
+    versions = []
+    for _ in range(2000):
+        start, end, new = _random_edit(rnd, len(text))
+        versions.append((rope, text))
+        rope = rope.replace(start, end, new)
+        text = text[:start] + new + text[end:]
+    assert rope.text() == text
+    assert len(rope) == len(text)
+    assert rope.line_count == text.count("\n") + 1
+    # versões anteriores continuam intactas (persistente)
+    for old_rope, old_text in versions[::100]:
+        assert old_rope.text() == old_text
+    for _ in range(200):
+        a = rnd.randint(0, len(text))
+        b = rnd.randint(a, len(text))
+        assert rope.slice(a, b) == text[a:b]
+
+
+def test_rope_index_offset_roundtrip():
+    rnd = random.Random(1)
+    text = "".join(rnd.choice(ALPHABET) for _ in range(3000))
+    rope = Rope(text)
+    for offset in range(0, len(text) + 1, 7):
+        index = rope.index(offset)
+        assert index == _line_col(text, offset)
+        line, col = map(int, index.split("."))
+        assert rope.offset(line, col) == offset
+
+
+def test_text_buffer_edits_and_log():
+    rnd = random.Random(2)
+    text = "título\n\ncorpo"
+    buffer = TextBuffer(text)
+    for _ in range(300):
+        start, end, new = _random_edit(rnd, len(text))
+        if rnd.random() < 0.5:
+            buffer.replace_index(_line_col(text, start), _line_col(text, end), new)
+        else:
+            buffer.replace(start, end, new)
+        text = text[:start] + new + text[end:]
+    assert buffer.text() == text
+    assert buffer.revision == 300
+
+    # o log refaz o texto a partir de qualquer revisão que ainda cobre
+    edits = buffer.edits_since(100)
+    assert [e.revision for e in edits] == list(range(101, 301))
+    assert buffer.edits_since(buffer.revision) == []
+
+
+def test_text_buffer_log_reset_and_restore():
+    buffer = TextBuffer("abc")
+    base = buffer.snapshot()
+    buffer.insert(3, "def")
+    buffer.delete(0, 1)
+    edits = buffer.edits_since(0)
+    restored = TextBuffer.restore(base.text(), 0, edits)
+    assert restored.text() == buffer.text() == "bcdef"
+    assert restored.revision == buffer.revision
+    assert restored.edits_since(0) == edits
+
+    # set_text/extend trocam o conteúdo sem log: quem acompanha recomeça
+    buffer.set_text("novo")
+    assert buffer.edits_since(0) is None
+    buffer.extend(" fim")
+    assert buffer.text() == "novo fim"
+    assert buffer.edits_since(buffer.revision - 1) is None
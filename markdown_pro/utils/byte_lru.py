@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ByteLRU:
+    """
+    Cache LRU limitado pela soma do "tamanho" dos valores (em bytes
+    aproximados), e não pelo número de entradas. `sizeof` calcula o tamanho
+    de cada valor; valores maiores que o limite nem entram.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int]) -> None:
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        if key in self._data:
+            self.used -= self._sizes[key]
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._sizes[key] = size
+        self.used += size
+        while self.used > self.max_bytes:
+            old_key, _ = self._data.popitem(last=False)
+            self.used -= self._sizes.pop(old_key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._sizes.clear()
+        self.used = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "entries": len(self._data),
+            "bytes": self.used,
+        }
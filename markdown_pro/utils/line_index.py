@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import List, Tuple
+
+
+_NEWLINE_RE = re.compile("\n")
+
+
+class LineIndex:
+    """
+    Tabela de inícios de linha de um texto, para converter offsets absolutos
+    em índices "linha.coluna" do Tk (e vice-versa) sem que o Tk precise
+    caminhar caractere a caractere a partir de "1.0".
+
+    `first_line` permite indexar só um trecho do buffer (ex.: as linhas
+    lo..hi de um passe de realce) mantendo a numeração do widget.
+    """
+
+    def __init__(self, text: str, first_line: int = 1) -> None:
+        self.first_line = first_line
+        self.length = len(text)
+        self.starts: List[int] = [0]
+        self.starts.extend(m.end() for m in _NEWLINE_RE.finditer(text))
+
+    @property
+    def line_count(self) -> int:
+        return len(self.starts)
+
+    def line_of(self, pos: int) -> int:
+        return bisect_right(self.starts, pos) - 1 + self.first_line
+
+    def line_col(self, pos: int) -> Tuple[int, int]:
+        i = bisect_right(self.starts, pos) - 1
+        return i + self.first_line, pos - self.starts[i]
+
+    def index(self, pos: int) -> str:
+        i = bisect_right(self.starts, pos) - 1
+        return f"{i + self.first_line}.{pos - self.starts[i]}"
+
+    def offset(self, line: int, col: int = 0) -> int:
+        i = line - self.first_line
+        if i >= len(self.starts):
+            return self.length
+        return self.starts[i] + col
+
+    def line_end(self, line: int) -> int:
+        """Offset do fim da linha (posição do "\\n" ou fim do texto)."""
+        i = line - self.first_line + 1
+        if i >= len(self.starts):
+            return self.length
+        return self.starts[i] - 1
@@ -15,3 +15,41 @@ def get_app_home() -> Path:
 
 def recent_files_path() -> Path:
     return get_app_home() / "recent-files.json"
+
+
+def preview_path() -> Path:
+    return get_app_home() / "preview.html"
+
+
+def settings_path() -> Path:
+    return get_app_home() / "settings.json"
+
+
+def journal_dir() -> Path:
+    path = get_app_home() / "journal"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def index_dir() -> Path:
+    path = get_app_home() / "index"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def bench_dir() -> Path:
+    path = get_app_home() / "bench"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def trace_dir() -> Path:
+    path = get_app_home() / "trace"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def buffers_dir() -> Path:
+    path = get_app_home() / "buffers"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
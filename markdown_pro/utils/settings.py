@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+
+from markdown_pro.utils.config_store import read_json
+from markdown_pro.utils.paths import settings_path
+
+
+@dataclass
+class Settings:
+    # a partir deste tamanho o arquivo abre em modo "arquivo grande":
+    # leitura em partes, sem realce de sintaxe nem preview automático
+    large_file_bytes: int = 10 * 1024 * 1024
+    # bytes lidos/decodificados por passo ao abrir um arquivo grande
+    load_chunk_bytes: int = 1024 * 1024
+    # recarrega arquivos alterados por fora (precisa do watchdog)
+    watch_files: bool = True
+    # trace de desempenho em ~/.markdown-pro/trace (ver utils/trace.py);
+    # MARKDOWN_PRO_TRACE=1 / overlay / 0 tem precedência
+    trace: bool = False
+    # fração dos spans rápidos que vai para o arquivo (os lentos vão sempre)
+    trace_sample_rate: float = 0.1
+    # latência por tecla (p50/p95/p99) na barra de status; liga o trace
+    trace_overlay: bool = False
+    # abas com editor Tk vivo (a ativa + as usadas por último); as demais
+    # ficam comprimidas no BufferStore
+    live_tabs: int = 3
+    # memória das abas comprimidas; o excedente vai para ~/.markdown-pro/buffers
+    tab_store_bytes: int = 64 * 1024 * 1024
+
+
+def load_settings() -> Settings:
+    """Lê ~/.markdown-pro/settings.json; chaves desconhecidas ou de tipo errado são ignoradas."""
+    data = read_json(settings_path(), default={})
+    settings = Settings()
+    if not isinstance(data, dict):
+        return settings
+    for f in fields(Settings):
+        value = data.get(f.name)
+        # tipo exato: True não vale como int, nem 1 como bool
+        if type(value) is type(getattr(settings, f.name)):
+            setattr(settings, f.name, value)
+    return settings
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import builtins
+import sys
+import time
+from typing import Dict, List, Optional, TextIO, Tuple
+
+
+# orçamento para "janela pronta para editar" (a partir de main())
+STARTUP_BUDGET_MS = 500.0
+
+# módulos que não deveriam carregar antes da primeira pintura
+HEAVY_MODULES = ("markdown", "yaml", "pygments", "weasyprint", "PIL", "watchdog")
+
+
+class StartupProfile:
+    """
+    Mede o caminho de partida da GUI: tempo de import por módulo (via um
+    wrapper em __import__), marcos do main() e a primeira pintura da janela.
+    """
+
+    def __init__(self) -> None:
+        self.t0 = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        # módulo -> (tempo cumulativo, tempo próprio) em segundos
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self.heavy_at_paint: List[str] = []
+        self._orig_import = None
+        self._stack: List[float] = []
+
+    # ---------- imports ----------
+    def start(self) -> None:
+        self._orig_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop(self) -> None:
+        if self._orig_import is not None:
+            builtins.__import__ = self._orig_import
+            self._orig_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._orig_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.imports.setdefault(name, (elapsed, elapsed - children))
+
+    # ---------- marcos ----------
+    def mark(self, label: str) -> None:
+        self.marks.append((label, time.perf_counter()))
+
+    def watch_first_paint(self, root, on_done=None) -> None:
+        """Marca a primeira pintura: janela mapeada e o ciclo ocioso seguinte."""
+
+        def painted() -> None:
+            self.mark("primeira pintura")
+            self.heavy_at_paint = [m for m in HEAVY_MODULES if m in sys.modules]
+            self.stop()
+            self.report()
+            if on_done is not None:
+                on_done()
+
+        def mapped(_event=None) -> None:
+            root.unbind("<Map>", bind_id)
+            root.after_idle(painted)
+
+        bind_id = root.bind("<Map>", mapped, add="+")
+
+    # ---------- relatório ----------
+    def report(self, out: Optional[TextIO] = None, top: int = 15) -> None:
+        out = out or sys.stderr
+        print("== startup profile ==", file=out)
+        before = _interpreter_startup_ms()
+        if before is not None:
+            print(f"  {'interpretador até main()':<28} {before:8.1f} ms", file=out)
+        prev = self.t0
+        for label, t in self.marks:
+            print(f"  {label:<28} {(t - prev) * 1000:8.1f} ms", file=out)
+            prev = t
+        total = (prev - self.t0) * 1000
+        flag = "  ACIMA DO ORÇAMENTO" if total > STARTUP_BUDGET_MS else ""
+        print(f"  {'total (main -> pintura)':<28} {total:8.1f} ms (orçamento {STARTUP_BUDGET_MS:.0f} ms){flag}", file=out)
+
+        print(f"  imports mais caros (cumulativo / próprio), top {top}:", file=out)
+        ranked = sorted(self.imports.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+        for name, (cum, own) in ranked:
+            print(f"    {name:<40} {cum * 1000:8.1f} {own * 1000:8.1f} ms", file=out)
+        if self.heavy_at_paint:
+            print(f"  carregados antes da pintura: {', '.join(self.heavy_at_paint)}", file=out)
+
+
+def _interpreter_startup_ms() -> Optional[float]:
+    # Linux: início do processo (/proc/self/stat) comparado com o uptime
+    try:
+        import os
+
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        hz = os.sysconf("SC_CLK_TCK")
+        return max(0.0, (uptime - start_ticks / hz) * 1000 - (time.perf_counter() - _IMPORTED_AT) * 1000)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+_IMPORTED_AT = time.perf_counter()
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from markdown_pro.utils.paths import trace_dir
+
+if TYPE_CHECKING:
+    from markdown_pro.utils.settings import Settings
+
+
+# "1" liga, "overlay" liga com a sobreposição na barra de status, "0" desliga
+# (vale mais que o settings.json)
+ENV_VAR = "MARKDOWN_PRO_TRACE"
+# spans a partir deste tempo sempre vão para o arquivo; os demais são amostrados
+SLOW_SPAN_MS = 50.0
+# rotação do trace.jsonl: tamanho máximo e quantos arquivos antigos guardar
+MAX_FILE_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+# a cada intervalo a thread de gravação também grava o resumo (contadores e totais)
+FLUSH_INTERVAL_S = 2.0
+# últimas teclas usadas nos percentis de latência
+KEYSTROKE_WINDOW = 500
+
+_STOP = object()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("_tracer", "name", "attrs", "_start")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self._start = 0.0
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self._tracer.record(self.name, (time.perf_counter() - self._start) * 1000.0, self.attrs)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        """Acrescenta atributos conhecidos só no meio do trabalho (ex.: linhas realçadas)."""
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    Spans e contadores do editor. Cada span entra nos totais (contagem,
+    soma, máximo); no arquivo vão os lentos e uma amostra dos demais. A
+    gravação (JSON por linha, com rotação) fica numa thread própria: quem
+    mede só enfileira.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sample_rate: float = 0.1,
+        max_bytes: int = MAX_FILE_BYTES,
+        backups: int = BACKUP_COUNT,
+    ) -> None:
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        # nome -> [contagem, soma ms, máximo ms]
+        self._spans: Dict[str, list] = {}
+        self._changed = False
+        self._random = random.Random()
+        self._keys: "deque[float]" = deque(maxlen=KEYSTROKE_WINDOW)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    # ---------- medição (qualquer thread) ----------
+    def record(self, name: str, ms: float, attrs: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += ms
+            if ms > stats[2]:
+                stats[2] = ms
+            self._changed = True
+            keep = ms >= SLOW_SPAN_MS or self._random.random() < self.sample_rate
+        if keep:
+            entry = {
+                "t": round(time.time(), 3),
+                "span": name,
+                "ms": round(ms, 3),
+                "thread": threading.current_thread().name,
+            }
+            if attrs:
+                entry.update(attrs)
+            self._queue.put(entry)
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+            self._changed = True
+
+    def keystroke(self, ms: float) -> None:
+        self._keys.append(ms)
+        self.record("keystroke", ms)
+
+    def keystroke_percentiles(self) -> Optional[Dict[str, float]]:
+        """p50/p95/p99 (ms) das últimas teclas, ou None se nenhuma foi medida."""
+        values = sorted(self._keys)
+        if not values:
+            return None
+        last = len(values) - 1
+        return {
+            "n": len(values),
+            "p50": values[min(last, int(len(values) * 0.50))],
+            "p95": values[min(last, int(len(values) * 0.95))],
+            "p99": values[min(last, int(len(values) * 0.99))],
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "spans": {
+                    name: {"count": c, "total_ms": round(total, 3), "max_ms": round(peak, 3)}
+                    for name, (c, total, peak) in self._spans.items()
+                },
+            }
+
+    def close(self, timeout: float = 2.0) -> None:
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # ---------- thread de gravação ----------
+    def _run(self) -> None:
+        out = None
+        last_summary = time.monotonic()
+        while True:
+            try:
+                batch = [self._queue.get(timeout=FLUSH_INTERVAL_S)]
+            except queue.Empty:
+                batch = []
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(entry is _STOP for entry in batch)
+            entries = [entry for entry in batch if entry is not _STOP]
+
+            now = time.monotonic()
+            if stop or now - last_summary >= FLUSH_INTERVAL_S:
+                last_summary = now
+                with self._lock:
+                    changed, self._changed = self._changed, False
+                if changed:
+                    entries.append({"t": round(time.time(), 3), "summary": self.summary()})
+
+            if entries:
+                try:
+                    out = self._write(out, entries)
+                except OSError:
+                    # sem onde gravar: o trace nunca pode atrapalhar o editor
+                    out = None
+            if stop:
+                if out is not None:
+                    out.close()
+                return
+
+    def _write(self, out, entries):
+        if out is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            out = open(self.path, "a", encoding="utf-8")
+        for entry in entries:
+            out.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            if out.tell() >= self.max_bytes:
+                out.close()
+                self._rotate()
+                out = open(self.path, "a", encoding="utf-8")
+        out.flush()
+        return out
+
+    def _rotate(self) -> None:
+        # trace.jsonl -> trace.1.jsonl -> trace.2.jsonl ...; o mais antigo sai
+        def backup(i: int) -> Path:
+            return self.path.with_name(f"{self.path.stem}.{i}{self.path.suffix}")
+
+        for i in range(self.backups - 1, 0, -1):
+            if backup(i).exists():
+                os.replace(backup(i), backup(i + 1))
+        if self.backups > 0:
+            os.replace(self.path, backup(1))
+        else:
+            self.path.unlink()
+
+
+# ---------- API do módulo (no-op enquanto desligado) ----------
+_tracer: Optional[Tracer] = None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def current() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **attrs: Any):
+    """`with trace.span("render", chars=n):` — desligado, devolve um span vazio compartilhado."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return Span(tracer, name, attrs)
+
+
+def record(name: str, ms: float, **attrs: Any) -> None:
+    """Span medido por quem chama (ex.: trabalho espalhado por vários ciclos ociosos)."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.record(name, ms, attrs)
+
+
+def count(name: str, n: int = 1) -> None:
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, n)
+
+
+def keystroke(ms: float) -> None:
+    tracer = _tracer
+    if tracer is not None:
+        tracer.keystroke(ms)
+
+
+def configure(settings: "Settings") -> Optional[Tracer]:
+    """Liga (ou não) o trace conforme o settings.json e MARKDOWN_PRO_TRACE."""
+    if _wanted(settings) is None:
+        shutdown()
+        return None
+    if _tracer is None:
+        start(trace_dir() / "trace.jsonl", settings.trace_sample_rate)
+    return _tracer
+
+
+def overlay_enabled(settings: "Settings") -> bool:
+    return _wanted(settings) == "overlay"
+
+
+def start(path: Path, sample_rate: float = 0.1) -> Tracer:
+    global _tracer
+    shutdown()
+    _tracer = Tracer(path, sample_rate)
+    atexit.register(shutdown)
+    return _tracer
+
+
+def shutdown() -> None:
+    """Desliga e grava o que faltava (resumo final incluído)."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        atexit.unregister(shutdown)
+        tracer.close()
+
+
+def _wanted(settings: "Settings") -> Optional[str]:
+    # None: desligado; "on": spans no arquivo; "overlay": também na barra de status
+    env = os.environ.get(ENV_VAR, "").strip().lower()
+    if env in ("0", "false", "off", "no"):
+        return None
+    if env == "overlay" or settings.trace_overlay:
+        return "overlay"
+    if env or settings.trace:
+        return "on"
+    return None